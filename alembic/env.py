@@ -11,6 +11,12 @@ from app.db.base import Base
 # Importar todos os modelos aqui
 from app.models.user import User  # noqa
 from app.models.client import Client  # noqa
+from app.models.token import Token  # noqa
+from app.models.product import Product  # noqa
+from app.models.order import Order, OrderItem  # noqa
+from app.models.order_stats import OrderDailyStats, OrderStatusStats, ProductSalesStats  # noqa
+from app.models.idempotency import IdempotencyKey  # noqa
+from app.models.whatsapp import WhatsAppMessageStatus  # noqa
 
 config = context.config
 
@@ -0,0 +1,59 @@
+"""store money as integer cents
+
+Revision ID: 0c8e5f3a7b21
+Revises: 6f1c2a9d4e57
+Create Date: 2026-10-19 16:41:09.227315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c8e5f3a7b21'
+down_revision: Union[str, None] = '6f1c2a9d4e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas monetárias convertidas de Float (reais) para BigInteger (centavos)
+MONEY_COLUMNS = [
+    ('products', 'price'),
+    ('orders', 'total_amount'),
+    ('order_items', 'unit_price'),
+    ('order_items', 'total_price'),
+    ('order_daily_stats', 'revenue'),
+    ('order_status_stats', 'revenue'),
+    ('product_sales_stats', 'revenue'),
+]
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, column in MONEY_COLUMNS:
+        if not postgresql:
+            op.execute(f'UPDATE {table} SET {column} = ROUND({column} * 100)')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.Float(),
+                type_=sa.BigInteger(),
+                existing_nullable=False,
+                postgresql_using=f'round({column} * 100)::bigint'
+            )
+
+
+def downgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, column in MONEY_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.BigInteger(),
+                type_=sa.Float(),
+                existing_nullable=False,
+                postgresql_using=f'{column} / 100.0'
+            )
+        if not postgresql:
+            op.execute(f'UPDATE {table} SET {column} = {column} / 100.0')
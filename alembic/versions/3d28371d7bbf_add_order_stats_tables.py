@@ -0,0 +1,48 @@
+"""add order stats tables
+
+Revision ID: 3d28371d7bbf
+Revises: 935c371e7ed1, add_timestamps_to_clients
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d28371d7bbf'
+down_revision: Union[str, None] = ('935c371e7ed1', 'add_timestamps_to_clients')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table(
+        'order_status_stats',
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('status')
+    )
+    op.create_table(
+        'product_sales_stats',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('product_sales_stats')
+    op.drop_table('order_status_stats')
+    op.drop_table('order_daily_stats')
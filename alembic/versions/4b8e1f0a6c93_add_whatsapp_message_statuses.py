@@ -0,0 +1,42 @@
+"""add whatsapp message statuses
+
+Revision ID: 4b8e1f0a6c93
+Revises: 9a4d7e2c1f68
+Create Date: 2026-10-19 20:12:05.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e1f0a6c93'
+down_revision: Union[str, None] = '9a4d7e2c1f68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'whatsapp_message_statuses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('message_id', sa.String(length=128), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('recipient_id', sa.String(length=32), nullable=True),
+        sa.Column('conversation_id', sa.String(length=128), nullable=True),
+        sa.Column('error_code', sa.Integer(), nullable=True),
+        sa.Column('error_title', sa.String(length=255), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('received_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'message_id', 'status',
+            name='uq_whatsapp_message_statuses_message_status'
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('whatsapp_message_statuses')
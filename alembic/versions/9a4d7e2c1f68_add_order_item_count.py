@@ -0,0 +1,49 @@
+"""add order item count
+
+Revision ID: 9a4d7e2c1f68
+Revises: 0c8e5f3a7b21
+Create Date: 2026-10-19 17:58:44.902137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d7e2c1f68'
+down_revision: Union[str, None] = '0c8e5f3a7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_user_status_index(include):
+    op.drop_index('ix_orders_user_id_status', table_name='orders')
+    op.create_index(
+        'ix_orders_user_id_status',
+        'orders',
+        ['user_id', 'status'],
+        unique=False,
+        postgresql_include=include
+    )
+
+
+def upgrade() -> None:
+    op.add_column(
+        'orders',
+        sa.Column('item_count', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.execute(
+        'UPDATE orders SET item_count = ('
+        'SELECT COUNT(*) FROM order_items WHERE order_items.order_id = orders.id'
+        ')'
+    )
+    # A listagem resumida passa a ler item_count direto do índice
+    _recreate_user_status_index(['total_amount', 'item_count', 'created_at'])
+
+
+def downgrade() -> None:
+    _recreate_user_status_index(['total_amount', 'created_at'])
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('item_count')
@@ -0,0 +1,41 @@
+"""order listing index by created_at
+
+Revision ID: c3f9e1a7d205
+Revises: e7c2a5d91b04
+Create Date: 2026-10-19 23:12:05.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9e1a7d205'
+down_revision: Union[str, None] = 'e7c2a5d91b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_user_status_index(columns, include):
+    op.drop_index('ix_orders_user_id_status', table_name='orders')
+    op.create_index(
+        'ix_orders_user_id_status',
+        'orders',
+        columns,
+        unique=False,
+        postgresql_include=include
+    )
+
+
+def upgrade() -> None:
+    # As listagens paginadas ordenam por created_at dentro de usuário e status
+    _recreate_user_status_index(
+        ['user_id', 'status', 'created_at'], ['total_amount', 'item_count']
+    )
+
+
+def downgrade() -> None:
+    _recreate_user_status_index(
+        ['user_id', 'status'], ['total_amount', 'item_count', 'created_at']
+    )
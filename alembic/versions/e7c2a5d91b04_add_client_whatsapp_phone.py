@@ -0,0 +1,62 @@
+"""add client whatsapp phone
+
+Revision ID: e7c2a5d91b04
+Revises: 4b8e1f0a6c93
+Create Date: 2026-10-19 21:04:47.120593
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.phone import normalize_phone
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a5d91b04'
+down_revision: Union[str, None] = '4b8e1f0a6c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('clients', sa.Column('whatsapp_phone', sa.String(length=20), nullable=True))
+    # Mesma regra de Client._fill_whatsapp_phone, em lotes, em qualquer dialeto
+    bind = op.get_bind()
+    clients = sa.table(
+        'clients',
+        sa.column('id', sa.Integer),
+        sa.column('phone', sa.String),
+        sa.column('whatsapp_phone', sa.String)
+    )
+    update = (
+        clients.update()
+        .where(clients.c.id == sa.bindparam('client_id'))
+        .values(whatsapp_phone=sa.bindparam('normalized'))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(clients.c.id, clients.c.phone)
+            .where(clients.c.phone.isnot(None), clients.c.id > last_id)
+            .order_by(clients.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        values = [
+            {'client_id': row.id, 'normalized': normalize_phone(row.phone)}
+            for row in rows
+        ]
+        values = [value for value in values if value['normalized'] is not None]
+        if values:
+            bind.execute(update, values)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('clients') as batch_op:
+        batch_op.drop_column('whatsapp_phone')
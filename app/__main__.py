@@ -0,0 +1,4 @@
+from app.server import run
+
+if __name__ == "__main__":
+    run()
@@ -1,38 +1,40 @@
 from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.base import get_db
+from app.core.read_after import READ_AFTER_COOKIE
+from app.db.base import SessionLocal, get_db, get_read_router
 from app.models.user import User
 from app.schemas.token import TokenPayload
-from app.services import auth as auth_service
+from app.services.principal import Principal, get_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/login")
 
 
 def get_current_user(
     db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+    token: str = Depends(oauth2_scheme),
+    request: Request = None
+) -> Principal:
+    """
+    Autentica a requisição e retorna um ``Principal`` (id, email e
+    permissões), sem carregar a linha ``User`` na sessão. O token ativo e o
+    usuário vêm de uma única consulta de colunas, mantida em cache por alguns
+    segundos.
+    """
     try:
-        # Verifica se o token está ativo no banco de dados
-        db_token = auth_service.get_active_token(db, token)
-        if not db_token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido ou expirado",
-                headers={"WWW-Authenticate": "Bearer"},
+        # Reaproveita o token já verificado pelo limitador de requisições
+        payload = getattr(request.state, "token_payload", None) if request else None
+        if payload is None:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
-        
-        # Decodifica o token
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
         token_data = TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
@@ -40,24 +42,102 @@ def get_current_user(
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if not user:
+
+    # Verifica se o token está ativo no banco de dados
+    principal = get_principal(db, token)
+    if principal is None or str(principal.id) != str(token_data.sub):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário não encontrado"
+            detail="Token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuário inativo"
         )
+    # Escritas desta sessão abrem a janela de leitura após escrita do usuário
+    db.info["user_id"] = principal.id
+    return principal
+
+
+def get_current_user_model(
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_user)
+) -> User:
+    """
+    Carrega a linha ``User`` do usuário autenticado, para os poucos
+    endpoints que precisam dela (como ``/auth/me``).
+    """
+    user = db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário não encontrado"
+        )
     return user
 
 
+def _read_after(request: Request) -> Optional[float]:
+    try:
+        return float(request.cookies[READ_AFTER_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+def _db_error(error: BaseException) -> Optional[DBAPIError]:
+    """
+    Erro do driver que originou ``error``, mesmo quando o serviço já o
+    traduziu (ex.: ``HTTPException(500)`` levantada dentro do ``except``).
+    """
+    while error is not None:
+        if isinstance(error, DBAPIError):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def get_read_db(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Generator:
+    """
+    Sessão para endpoints somente leitura. Usa uma réplica saudável, exceto
+    logo após uma escrita do usuário (ou do cliente, pelo cookie
+    ``read_after``), quando a sessão do primário é reaproveitada.
+
+    ``info["coalesce_reads"]`` indica se a sessão pode compartilhar o
+    resultado de leituras idênticas em andamento.
+    """
+    read_router = get_read_router()
+    read_after = _read_after(request)
+    engine = read_router.choose(user_id=current_user.id, read_after=read_after)
+    # Quem acabou de escrever não aproveita leituras já em andamento, que
+    # podem ter começado antes da escrita
+    coalesce = not read_router.requires_primary(current_user.id, read_after)
+    if engine is read_router.primary:
+        db.info["coalesce_reads"] = coalesce
+        yield db
+        return
+
+    replica_db = SessionLocal(bind=engine)
+    replica_db.info["coalesce_reads"] = coalesce
+    try:
+        yield replica_db
+    except Exception as e:
+        db_error = _db_error(e)
+        if db_error is not None:
+            # Próximas leituras vão para o primário até a réplica se recuperar
+            read_router.report_failure(engine, db_error)
+        raise
+    finally:
+        replica_db.close()
+
+
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
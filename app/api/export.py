@@ -0,0 +1,96 @@
+import csv
+import io
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.orm import Session
+
+from app.api.fields import RELATIONSHIP_FIELDS
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Linhas agrupadas em cada bloco enviado ao cliente
+CHUNK_ROWS = 200
+
+
+def _iter_ndjson(rows: Iterable[Any], schema: Type[BaseModel]) -> Iterator[str]:
+    chunk: List[str] = []
+    for row in rows:
+        chunk.append(schema.model_validate(row).model_dump_json())
+        if len(chunk) >= CHUNK_ROWS:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+@lru_cache()
+def _column_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Versão de ``schema`` sem os relacionamentos. Validar a linha com ela lê
+    apenas as colunas, sem disparar o carregamento tardio (ex: ``items``).
+    """
+    return create_model(
+        f"{schema.__name__}Columns",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name not in RELATIONSHIP_FIELDS
+        }
+    )
+
+
+def _iter_csv(rows: Iterable[Any], schema: Type[BaseModel]) -> Iterator[str]:
+    schema = _column_schema(schema)
+    columns = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        data = schema.model_validate(row).model_dump(mode="json")
+        writer.writerow([data[c] for c in columns])
+        count += 1
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_response(
+    db: Session,
+    rows: Callable[[], Iterable[Any]],
+    schema: Type[BaseModel],
+    fmt: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Exporta os registros em NDJSON ou CSV com uma resposta em streaming.
+
+    ``rows`` é chamado apenas quando o envio começa, e a sessão é fechada ao
+    final do envio, já que a resposta é produzida depois que o endpoint
+    retorna. No CSV os relacionamentos (ex: itens do pedido) são omitidos.
+    """
+    serialize = _iter_csv if fmt == "csv" else _iter_ndjson
+
+    def generate() -> Iterator[str]:
+        try:
+            yield from serialize(rows(), schema)
+        finally:
+            db.close()
+
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{extension}"'
+        }
+    )
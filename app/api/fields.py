@@ -0,0 +1,98 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.schemas.pagination import PaginationMetadata
+
+# Campos que são relacionamentos e só podem ser solicitados via ``include``
+RELATIONSHIP_FIELDS = {"items"}
+
+
+def parse_fields(
+    fields: Optional[str],
+    schema: Type[BaseModel]
+) -> Optional[List[str]]:
+    """
+    Converte o parâmetro ``fields`` (lista separada por vírgulas) em uma lista
+    de colunas válidas para o schema informado. O ``id`` é sempre incluído.
+
+    Retorna ``None`` quando nenhum campo foi solicitado (payload completo).
+    """
+    if fields is None:
+        return None
+
+    allowed = set(schema.model_fields) - RELATIONSHIP_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    invalid = [f for f in requested if f not in allowed]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalid)}"
+        )
+
+    selected = ["id"]
+    for field in requested:
+        if field not in selected:
+            selected.append(field)
+    return selected
+
+
+def parse_include(include: Optional[str], allowed: Set[str]) -> Optional[Set[str]]:
+    """
+    Converte o parâmetro ``include`` em um conjunto de relacionamentos.
+
+    Retorna ``None`` quando o parâmetro não foi informado.
+    """
+    if include is None:
+        return None
+
+    requested = {i.strip() for i in include.split(",") if i.strip()}
+    invalid = requested - allowed
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Relacionamentos inválidos: {', '.join(sorted(invalid))}"
+        )
+    return requested
+
+
+def serialize_fields(
+    obj: Any,
+    fields: Iterable[str],
+    nested: Optional[Dict[str, Type[BaseModel]]] = None
+) -> Dict[str, Any]:
+    """
+    Serializa apenas os atributos solicitados de um objeto ORM.
+
+    ``nested`` mapeia relacionamentos a incluir para o schema de seus itens.
+    """
+    data = {field: getattr(obj, field) for field in fields}
+    for relation, schema in (nested or {}).items():
+        data[relation] = [
+            schema.model_validate(item).model_dump()
+            for item in getattr(obj, relation)
+        ]
+    return data
+
+
+def sparse_response(
+    items: Any,
+    fields: Iterable[str],
+    metadata: Optional[PaginationMetadata] = None,
+    nested: Optional[Dict[str, Type[BaseModel]]] = None
+) -> JSONResponse:
+    """
+    Monta a resposta parcial para um objeto ou para uma página de objetos.
+    """
+    fields = list(fields)
+    if metadata is None:
+        content = serialize_fields(items, fields, nested)
+    else:
+        content = {
+            "items": [serialize_fields(obj, fields, nested) for obj in items],
+            "metadata": metadata.model_dump()
+        }
+    return JSONResponse(content=jsonable_encoder(content))
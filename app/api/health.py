@@ -0,0 +1,48 @@
+from typing import Any
+
+from fastapi import APIRouter, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from app.db.base import get_database_probe, get_pool_status, get_read_router
+from app.services.whatsapp import get_whatsapp_service
+
+# As rotas deste módulo não usam autenticação nem a dependência de sessão do
+# banco, para que respondam rapidamente mesmo com o pool esgotado.
+router = APIRouter()
+
+
+@router.get("/live")
+async def liveness() -> Any:
+    """
+    Indica que o processo está respondendo.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness(request: Request, response: Response) -> Any:
+    """
+    Indica se o worker concluiu a inicialização e consegue falar com o banco,
+    junto com a latência da última verificação, as estatísticas do pool, o
+    estado das réplicas de leitura e do disjuntor do WhatsApp (que não afetam
+    a prontidão).
+
+    A verificação do banco fica em cache por ``HEALTH_PROBE_TTL`` segundos.
+    """
+    state = getattr(request.app.state, "resources", None)
+    database_probe = get_database_probe()
+    if database_probe.is_stale():
+        probe = await run_in_threadpool(database_probe.check)
+    else:
+        probe = database_probe.result
+
+    ready = state is not None and state.ready and probe.ok
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ok" if ready else "unavailable",
+        "database": probe.as_dict(),
+        "pool": get_pool_status(),
+        "replicas": get_read_router().status(),
+        "whatsapp": get_whatsapp_service().status(),
+    }
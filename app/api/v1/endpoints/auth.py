@@ -4,6 +4,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from jose import JWTError, jwt
 
 from app.core.config import settings
@@ -12,20 +13,25 @@ from app.db.base import get_db
 from app.schemas.token import Token, TokenPayload
 from app.schemas.user import UserCreate, User
 from app.services import auth as auth_service
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_model
+from app.models.user import User as UserModel
+from app.services.principal import Principal
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     Obtém um token de acesso para autenticação.
+
+    A verificação da senha roda no pool de criptografia; com a fila cheia a
+    resposta é ``503`` com ``Retry-After``.
     """
-    user = auth_service.authenticate(
+    user = await auth_service.authenticate_async(
         db, email=form_data.username, password=form_data.password
     )
     
@@ -57,7 +63,8 @@ def login(
     )
     
     # Persiste o token no banco de dados
-    db_token = auth_service.create_user_token(
+    db_token = await run_in_threadpool(
+        auth_service.create_user_token,
         db=db,
         user=user,
         expires_delta=access_token_expires
@@ -120,7 +127,7 @@ def refresh_token(
 
 
 @router.post("/register", response_model=User)
-def register(
+async def register(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
@@ -128,20 +135,23 @@ def register(
     """
     Criar novo usuário.
     """
-    user = auth_service.get_user_by_email(db, email=user_in.email)
+    user = await run_in_threadpool(auth_service.get_user_by_email, db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="Email já registrado",
         )
-    user = auth_service.create_user(db, obj_in=user_in)
+    hashed_password = await auth_service.hash_password_async(user_in.password)
+    user = await run_in_threadpool(
+        auth_service.create_user, db, obj_in=user_in, hashed_password=hashed_password
+    )
     return user
 
 
 @router.post("/logout")
 def logout(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Desativa o token atual do usuário.
@@ -151,7 +161,7 @@ def logout(
 
 
 @router.get("/me", response_model=User)
-def read_me(current_user: User = Depends(get_current_user)):
+def read_me(current_user: UserModel = Depends(get_current_user_model)):
     """
     Retorna os dados do usuário autenticado.
     """
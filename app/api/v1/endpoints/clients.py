@@ -1,25 +1,34 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
+from app.api.export import export_response
+from app.api.fields import parse_fields, sparse_response
 from app.db.base import get_db
-from app.models.user import User
-from app.schemas.client import Client, ClientCreate, ClientUpdate
+from app.schemas.client import (
+    Client,
+    ClientCreate,
+    ClientImportResult,
+    ClientUpdate
+)
 from app.schemas.pagination import PaginatedResponse, PaginationMetadata
 from app.services import client as client_service
+from app.services import client_import
+from app.services.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=PaginatedResponse[Client])
 def read_clients(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(10, ge=1, le=100, description="Quantidade de itens por página"),
-    search: str = Query(None, min_length=1, description="Termo de busca (nome ou email)")
+    search: str = Query(None, min_length=1, description="Termo de busca (nome ou email)"),
+    fields: str = Query(None, description="Campos a retornar, separados por vírgula (ex: name,email)")
 ) -> Any:
     """
     Listar clientes com suporte a paginação e busca por nome/email.
@@ -27,12 +36,15 @@ def read_clients(
     - **page**: Número da página (começa em 1)
     - **size**: Quantidade de itens por página (máximo 100)
     - **search**: Termo de busca para filtrar por nome ou email
+    - **fields**: Campos a retornar (o id é sempre incluído)
     """
+    selected_fields = parse_fields(fields, Client)
     clients, total = client_service.get_clients(
         db=db,
         page=page,
         size=size,
-        search=search
+        search=search,
+        fields=selected_fields
     )
     
     # Calcula o total de páginas
@@ -58,17 +70,40 @@ def read_clients(
         prev_page=prev_page
     )
     
+    if selected_fields:
+        return sparse_response(clients, selected_fields, metadata=metadata)
+    
     return PaginatedResponse(
         items=clients,
         metadata=metadata
     )
 
 
+@router.get("/export")
+def export_clients(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    search: str = Query(None, min_length=1, description="Termo de busca (nome ou email)"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato: ndjson ou csv")
+) -> Any:
+    """
+    Exportar todos os clientes (com os mesmos filtros da listagem) em NDJSON
+    ou CSV, em streaming.
+    """
+    return export_response(
+        db,
+        lambda: client_service.iter_clients(db, search=search),
+        Client,
+        format,
+        "clientes"
+    )
+
+
 @router.post("/", response_model=Client)
 def create_client(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     client_in: ClientCreate
 ) -> Any:
     """
@@ -94,22 +129,59 @@ def create_client(
     return client
 
 
+@router.post("/import", response_model=ClientImportResult)
+async def import_clients(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    format: str = Query(
+        None,
+        pattern="^(csv|jsonl)$",
+        description="Formato do arquivo (padrão: deduzido do Content-Type)"
+    )
+) -> Any:
+    """
+    Importar clientes em lote a partir de um corpo CSV ou JSONL.
+    
+    O corpo é processado em streaming e inserido em lotes; linhas inválidas ou
+    já cadastradas são reportadas individualmente sem interromper a importação.
+    O CSV deve ter cabeçalho com as colunas `name`, `email`, `cpf` e,
+    opcionalmente, `phone` e `address`.
+    """
+    fmt = format
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = "csv" if "csv" in content_type else "jsonl"
+    
+    return await client_import.import_clients(
+        db=db,
+        chunks=request.stream(),
+        fmt=fmt
+    )
+
+
 @router.get("/{client_id}", response_model=Client)
 def read_client(
     *,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    client_id: int
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    client_id: int,
+    fields: str = Query(None, description="Campos a retornar, separados por vírgula")
 ) -> Any:
     """
     Obter informações de um cliente específico.
     """
-    client = client_service.get_client(db, client_id=client_id)
+    selected_fields = parse_fields(fields, Client)
+    client = client_service.get_client(
+        db, client_id=client_id, fields=selected_fields
+    )
     if not client:
         raise HTTPException(
             status_code=404,
             detail="Cliente não encontrado."
         )
+    if selected_fields:
+        return sparse_response(client, selected_fields)
     return client
 
 
@@ -117,7 +189,7 @@ def read_client(
 def update_client(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     client_id: int,
     client_in: ClientUpdate
 ) -> Any:
@@ -161,7 +233,7 @@ def update_client(
 def delete_client(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     client_id: int
 ) -> Any:
     """
@@ -1,25 +1,83 @@
-from typing import Any
+from typing import Any, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
+from app.api.export import export_response
+from app.api.fields import (
+    RELATIONSHIP_FIELDS,
+    parse_fields,
+    parse_include,
+    sparse_response
+)
 from app.db.base import get_db
-from app.models.user import User
 from app.models.order import OrderStatus
-from app.schemas.order import Order, OrderCreate, OrderUpdate
+from app.schemas.order import (
+    Order,
+    OrderCreate,
+    OrderItem,
+    OrderStats,
+    OrderStatusBulkResult,
+    OrderStatusTransition,
+    OrderSummary,
+    OrderUpdate
+)
 from app.schemas.pagination import PaginatedResponse, PaginationMetadata
 from app.services import order as order_service
+from app.services import order_notifications, order_stats, order_status
+from app.services.idempotency import idempotency_store
+from app.services.principal import Principal
 
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse[Order])
+
+def _resolve_view(
+    fields: Optional[str],
+    include: Optional[str]
+) -> Tuple[Optional[List[str]], bool]:
+    """
+    Define as colunas e se os itens do pedido devem ser carregados.
+
+    Sem ``fields`` nem ``include`` a resposta é completa, com itens. Quando
+    ``fields`` é informado, os itens só são retornados com ``include=items``.
+    """
+    selected_fields = parse_fields(fields, Order)
+    includes = parse_include(include, RELATIONSHIP_FIELDS)
+    if includes is None:
+        include_items = selected_fields is None
+    else:
+        include_items = "items" in includes
+    
+    if selected_fields is None and not include_items:
+        selected_fields = [
+            f for f in Order.model_fields if f not in RELATIONSHIP_FIELDS
+        ]
+    return selected_fields, include_items
+
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[Order],
+    responses={
+        200: {
+            # view=summary responde com OrderSummary, sem passar pelo response_model
+            "model": Union[PaginatedResponse[Order], PaginatedResponse[OrderSummary]],
+            "description": "Pedidos completos ou, com `view=summary`, resumidos"
+        }
+    }
+)
 def read_orders(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(10, ge=1, le=100, description="Quantidade de itens por página"),
-    status: OrderStatus = Query(None, description="Filtrar por status do pedido")
+    status: OrderStatus = Query(None, description="Filtrar por status do pedido"),
+    fields: str = Query(None, description="Campos a retornar, separados por vírgula (ex: status,total_amount)"),
+    include: str = Query(None, description="Relacionamentos a incluir (ex: items)"),
+    view: str = Query("full", pattern="^(full|summary)$", description="full ou summary (sem itens)")
 ) -> Any:
     """
     Listar pedidos com suporte a paginação e filtro por status.
@@ -27,14 +85,36 @@ def read_orders(
     - **page**: Número da página (começa em 1)
     - **size**: Quantidade de itens por página (máximo 100)
     - **status**: Status do pedido para filtrar
+    - **fields**: Campos a retornar (o id é sempre incluído)
+    - **include**: Use `items` para incluir os itens; vazio para omiti-los
+    - **view**: `summary` retorna apenas id, status, total_amount, item_count
+      e created_at, em uma única consulta
     """
-    orders, total = order_service.get_orders(
-        db=db,
-        user_id=current_user.id,
-        page=page,
-        size=size,
-        status=status
-    )
+    summary = view == "summary"
+    if summary:
+        if fields is not None or include is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="Os parâmetros fields e include não podem ser usados com view=summary"
+            )
+        orders, total = order_service.get_order_summaries(
+            db=db,
+            user_id=current_user.id,
+            page=page,
+            size=size,
+            status=status
+        )
+    else:
+        selected_fields, include_items = _resolve_view(fields, include)
+        orders, total = order_service.get_orders(
+            db=db,
+            user_id=current_user.id,
+            page=page,
+            size=size,
+            status=status,
+            fields=selected_fields,
+            include_items=include_items
+        )
     
     # Calcula o total de páginas
     total_pages = (total + size - 1) // size
@@ -59,45 +139,144 @@ def read_orders(
         prev_page=prev_page
     )
     
+    if summary:
+        return JSONResponse(content=jsonable_encoder(
+            PaginatedResponse[OrderSummary](
+                items=[OrderSummary.model_validate(row) for row in orders],
+                metadata=metadata
+            )
+        ))
+    
+    if selected_fields:
+        return sparse_response(
+            orders,
+            selected_fields,
+            metadata=metadata,
+            nested={"items": OrderItem} if include_items else None
+        )
+    
     return PaginatedResponse(
         items=orders,
         metadata=metadata
     )
 
+@router.get("/export")
+def export_orders(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    status: OrderStatus = Query(None, description="Filtrar por status do pedido"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato: ndjson ou csv")
+) -> Any:
+    """
+    Exportar todos os pedidos do usuário em NDJSON (com itens) ou CSV (sem
+    itens), em streaming.
+    """
+    user_id = current_user.id
+    return export_response(
+        db,
+        lambda: order_service.iter_orders(
+            db,
+            user_id=user_id,
+            status=status,
+            include_items=format == "ndjson"
+        ),
+        Order,
+        format,
+        "pedidos"
+    )
+
+@router.get("/stats", response_model=OrderStats)
+def read_order_stats(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    days: int = Query(30, ge=1, le=366, description="Quantidade de dias do faturamento diário"),
+    top: int = Query(10, ge=1, le=100, description="Quantidade de produtos mais vendidos")
+) -> Any:
+    """
+    Estatísticas de pedidos: faturamento diário, pedidos por status e
+    produtos mais vendidos. Lidas de agregados mantidos a cada alteração de
+    pedido, sem varrer a tabela de pedidos.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403,
+            detail="Permissão negada"
+        )
+    return order_stats.get_stats(db, days=days, top=top)
+
 @router.post("/", response_model=Order)
 def create_order(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    order_in: OrderCreate
+    current_user: Principal = Depends(get_current_user),
+    order_in: OrderCreate,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        description="Chave única da operação; repetições retornam a resposta original"
+    )
 ) -> Any:
     """
     Criar novo pedido.
+
+    Com o header ``Idempotency-Key``, repetições da mesma requisição
+    retornam o pedido criado na primeira chamada, sem criar outro pedido nem
+    baixar o estoque novamente.
     """
-    try:
-        order = order_service.create_order(
+    def create(commit: bool = True) -> Any:
+        return order_service.create_order(
             db=db,
             user_id=current_user.id,
-            obj_in=order_in
+            obj_in=order_in,
+            commit=commit
+        )
+
+    try:
+        if idempotency_key is None:
+            return create()
+
+        status_code, body, replayed = idempotency_store.execute(
+            db,
+            user_id=current_user.id,
+            key=idempotency_key,
+            payload=order_in.model_dump_json(),
+            # O pedido e a resposta são confirmados na mesma transação
+            operation=lambda: (
+                200, jsonable_encoder(Order.model_validate(create(commit=False)))
+            )
         )
-        return order
     except ValueError as e:
         raise HTTPException(
             status_code=400,
             detail=str(e)
         )
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(content=body, status_code=status_code, headers=headers)
 
 @router.get("/{order_id}", response_model=Order)
 def read_order(
     *,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    order_id: int
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    order_id: int,
+    fields: str = Query(None, description="Campos a retornar, separados por vírgula"),
+    include: str = Query(None, description="Relacionamentos a incluir (ex: items)")
 ) -> Any:
     """
     Obter informações de um pedido específico.
     """
-    order = order_service.get_order(db, order_id=order_id)
+    selected_fields, include_items = _resolve_view(fields, include)
+    if selected_fields and "user_id" not in selected_fields:
+        # Necessário para a verificação de permissão
+        query_fields = selected_fields + ["user_id"]
+    else:
+        query_fields = selected_fields
+    order = order_service.get_order(
+        db,
+        order_id=order_id,
+        fields=query_fields,
+        include_items=include_items
+    )
     if not order:
         raise HTTPException(
             status_code=404,
@@ -108,15 +287,55 @@ def read_order(
             status_code=403,
             detail="Você não tem permissão para acessar este pedido."
         )
+    if selected_fields:
+        return sparse_response(
+            order,
+            selected_fields,
+            nested={"items": OrderItem} if include_items else None
+        )
     return order
 
+@router.post("/status", response_model=OrderStatusBulkResult)
+def bulk_update_order_status(
+    *,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    transitions: List[OrderStatusTransition],
+    background_tasks: BackgroundTasks
+) -> Any:
+    """
+    Alterar o status de vários pedidos (ex: marcar centenas de pedidos como
+    prontos ou entregues).
+    
+    Cada transição é validada pela máquina de estados; pedidos inexistentes
+    ou com transição inválida são reportados em `errors` sem impedir os
+    demais. Os clientes dos pedidos alterados são notificados pelo WhatsApp
+    após a resposta.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403,
+            detail="Permissão negada"
+        )
+    
+    result, changed = order_status.transition_orders(
+        db,
+        [(t.order_id, t.status) for t in transitions]
+    )
+    for status, order_ids in changed.items():
+        notifications = order_notifications.resolve_notifications(db, order_ids, status)
+        if notifications:
+            background_tasks.add_task(order_notifications.send_notifications, notifications)
+    return result
+
 @router.put("/{order_id}", response_model=Order)
 def update_order(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     order_id: int,
-    order_in: OrderUpdate
+    order_in: OrderUpdate,
+    background_tasks: BackgroundTasks
 ) -> Any:
     """
     Atualizar status de um pedido.
@@ -133,18 +352,32 @@ def update_order(
             detail="Você não tem permissão para atualizar este pedido."
         )
     
-    order = order_service.update_order(
-        db=db,
-        order_id=order_id,
-        obj_in=order_in
-    )
+    old_status = order.status
+    try:
+        order = order_service.update_order(
+            db=db,
+            order_id=order_id,
+            obj_in=order_in
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    if order.status != old_status:
+        notifications = order_notifications.resolve_notifications(
+            db, [order.id], order.status
+        )
+        if notifications:
+            background_tasks.add_task(order_notifications.send_notifications, notifications)
     return order
 
 @router.delete("/{order_id}", response_model=Order)
 def delete_order(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     order_id: int
 ) -> Any:
     """
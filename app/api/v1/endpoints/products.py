@@ -1,25 +1,36 @@
+import json
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
+from app.api.export import export_response
+from app.api.fields import parse_fields, sparse_response
 from app.db.base import get_db
-from app.models.user import User
-from app.schemas.product import Product, ProductCreate, ProductUpdate
+from app.schemas.product import (
+    Product,
+    ProductBulkResult,
+    ProductCreate,
+    ProductUpdate
+)
 from app.schemas.pagination import PaginatedResponse, PaginationMetadata
 from app.services import product as product_service
+from app.services.bulk import iter_lines
+from app.services.principal import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=PaginatedResponse[Product])
 def read_products(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(10, ge=1, le=100, description="Quantidade de itens por página"),
     search: str = Query(None, min_length=1, description="Termo de busca (nome ou descrição)"),
-    category: str = Query(None, description="Categoria do produto")
+    category: str = Query(None, description="Categoria do produto"),
+    fields: str = Query(None, description="Campos a retornar, separados por vírgula (ex: name,price,stock)")
 ) -> Any:
     """
     Listar produtos com suporte a paginação e busca por nome/descrição.
@@ -28,13 +39,16 @@ def read_products(
     - **size**: Quantidade de itens por página (máximo 100)
     - **search**: Termo de busca para filtrar por nome ou descrição
     - **category**: Categoria do produto
+    - **fields**: Campos a retornar (o id é sempre incluído)
     """
-    products, total = product_service.get_products(
+    selected_fields = parse_fields(fields, Product)
+    products, total = product_service.get_products_coalesced(
         db=db,
         page=page,
         size=size,
         search=search,
-        category=category
+        category=category,
+        fields=selected_fields
     )
     
     # Calcula o total de páginas
@@ -60,16 +74,39 @@ def read_products(
         prev_page=prev_page
     )
     
+    if selected_fields:
+        return sparse_response(products, selected_fields, metadata=metadata)
+    
     return PaginatedResponse(
         items=products,
         metadata=metadata
     )
 
+@router.get("/export")
+def export_products(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    search: str = Query(None, min_length=1, description="Termo de busca (nome ou descrição)"),
+    category: str = Query(None, description="Categoria do produto"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato: ndjson ou csv")
+) -> Any:
+    """
+    Exportar todos os produtos (com os mesmos filtros da listagem) em NDJSON
+    ou CSV, em streaming.
+    """
+    return export_response(
+        db,
+        lambda: product_service.iter_products(db, search=search, category=category),
+        Product,
+        format,
+        "produtos"
+    )
+
 @router.post("/", response_model=Product)
 def create_product(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     product_in: ProductCreate
 ) -> Any:
     """
@@ -83,29 +120,79 @@ def create_product(
     product = product_service.create_product(db=db, obj_in=product_in)
     return product
 
+@router.post("/bulk", response_model=ProductBulkResult)
+async def bulk_upsert_products(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """
+    Sincronizar produtos em lote (criação e atualização de preço, estoque etc.).
+    
+    Aceita um array JSON ou NDJSON (`Content-Type: application/x-ndjson`),
+    um item por linha. Itens com `id` atualizam apenas os campos enviados;
+    itens sem `id` criam novos produtos. Tudo é aplicado em uma transação.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403,
+            detail="Permissão negada"
+        )
+    
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            async def records():
+                async for line_no, line in iter_lines(request.stream()):
+                    if line is None:
+                        raise ValueError("Linha com codificação inválida")
+                    if line.strip():
+                        yield line_no, json.loads(line)
+
+            # Os lotes são aplicados enquanto o corpo ainda está chegando
+            return await product_service.bulk_upsert_products_stream(db, records())
+        payload = await request.json()
+        if not isinstance(payload, list):
+            raise ValueError
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Corpo inválido: envie um array JSON ou NDJSON"
+        )
+    
+    return await run_in_threadpool(
+        product_service.bulk_upsert_products, db, list(enumerate(payload))
+    )
+
 @router.get("/{product_id}", response_model=Product)
 def read_product(
     *,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    product_id: int
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    product_id: int,
+    fields: str = Query(None, description="Campos a retornar, separados por vírgula")
 ) -> Any:
     """
     Obter informações de um produto específico.
     """
-    product = product_service.get_product(db, product_id=product_id)
+    selected_fields = parse_fields(fields, Product)
+    product = product_service.get_product_coalesced(
+        db, product_id=product_id, fields=selected_fields
+    )
     if not product:
         raise HTTPException(
             status_code=404,
             detail="Produto não encontrado."
         )
+    if selected_fields:
+        return sparse_response(product, selected_fields)
     return product
 
 @router.put("/{product_id}", response_model=Product)
 def update_product(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     product_id: int,
     product_in: ProductUpdate
 ) -> Any:
@@ -136,7 +223,7 @@ def update_product(
 def delete_product(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     product_id: int
 ) -> Any:
     """
@@ -1,11 +1,15 @@
+import json
 from typing import Any, Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.models.user import User
+from app.core.config import settings
 from app.models.client import Client
-from app.services.whatsapp import whatsapp_service
+from app.services.whatsapp import get_whatsapp_service
+from app.services.principal import Principal
+from app.services.whatsapp_status import parse_statuses, status_buffer, verify_signature
 from app.schemas.whatsapp import (
     WhatsAppMessage,
     WhatsAppTemplate,
@@ -22,7 +26,7 @@ async def send_message(
     *,
     db: Session = Depends(deps.get_db),
     message: WhatsAppMessage,
-    current_user: User = Depends(deps.get_current_active_superuser)
+    current_user: Principal = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """
     Envia uma mensagem WhatsApp para um cliente.
@@ -34,7 +38,7 @@ async def send_message(
             detail="Cliente não encontrado"
         )
     
-    return await whatsapp_service.send_message(
+    return await get_whatsapp_service().send_message(
         to=client.phone,
         message=message.message
     )
@@ -44,7 +48,7 @@ async def send_template(
     *,
     db: Session = Depends(deps.get_db),
     template: WhatsAppTemplate,
-    current_user: User = Depends(deps.get_current_active_superuser)
+    current_user: Principal = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """
     Envia uma mensagem usando um template do WhatsApp.
@@ -56,7 +60,7 @@ async def send_template(
             detail="Cliente não encontrado"
         )
     
-    return await whatsapp_service.send_message(
+    return await get_whatsapp_service().send_message(
         to=client.phone,
         message="",  # Mensagem vazia pois usaremos template
         template_name=template.template_name,
@@ -68,7 +72,7 @@ async def notify_order(
     *,
     db: Session = Depends(deps.get_db),
     notification: WhatsAppOrderNotification,
-    current_user: User = Depends(deps.get_current_active_superuser)
+    current_user: Principal = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """
     Envia uma notificação sobre o status do pedido.
@@ -80,7 +84,7 @@ async def notify_order(
             detail="Cliente não encontrado"
         )
     
-    return await whatsapp_service.send_order_notification(
+    return await get_whatsapp_service().send_order_notification(
         client=client,
         order_number=notification.order_number,
         status=notification.status
@@ -91,7 +95,7 @@ async def notify_payment(
     *,
     db: Session = Depends(deps.get_db),
     notification: WhatsAppPaymentNotification,
-    current_user: User = Depends(deps.get_current_active_superuser)
+    current_user: Principal = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """
     Envia uma notificação sobre o pagamento do pedido.
@@ -103,7 +107,7 @@ async def notify_payment(
             detail="Cliente não encontrado"
         )
     
-    return await whatsapp_service.send_payment_notification(
+    return await get_whatsapp_service().send_payment_notification(
         client=client,
         order_number=notification.order_number,
         amount=notification.amount,
@@ -115,7 +119,7 @@ async def notify_shipping(
     *,
     db: Session = Depends(deps.get_db),
     notification: WhatsAppShippingNotification,
-    current_user: User = Depends(deps.get_current_active_superuser)
+    current_user: Principal = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """
     Envia uma notificação sobre o envio do pedido.
@@ -127,7 +131,7 @@ async def notify_shipping(
             detail="Cliente não encontrado"
         )
     
-    return await whatsapp_service.send_shipping_notification(
+    return await get_whatsapp_service().send_shipping_notification(
         client=client,
         order_number=notification.order_number,
         tracking_code=notification.tracking_code,
@@ -139,7 +143,7 @@ async def notify_promotion(
     *,
     db: Session = Depends(deps.get_db),
     notification: WhatsAppPromotionNotification,
-    current_user: User = Depends(deps.get_current_active_superuser)
+    current_user: Principal = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """
     Envia uma notificação sobre uma promoção.
@@ -151,9 +155,57 @@ async def notify_promotion(
             detail="Cliente não encontrado"
         )
     
-    return await whatsapp_service.send_promotion_notification(
+    return await get_whatsapp_service().send_promotion_notification(
         client=client,
         promotion_title=notification.promotion_title,
         promotion_description=notification.promotion_description,
         valid_until=notification.valid_until
-    ) 
\ No newline at end of file
+    ) 
+
+@router.get("/webhook", response_class=PlainTextResponse)
+async def verify_webhook(
+    mode: Optional[str] = Query(None, alias="hub.mode"),
+    verify_token: Optional[str] = Query(None, alias="hub.verify_token"),
+    challenge: str = Query("", alias="hub.challenge")
+) -> Any:
+    """
+    Confirma a assinatura do webhook: o WhatsApp envia o token de verificação
+    configurado e espera o ``hub.challenge`` de volta.
+    """
+    expected = settings.WHATSAPP_VERIFY_TOKEN
+    if mode != "subscribe" or not expected or verify_token != expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token de verificação inválido"
+        )
+    return challenge
+
+@router.post("/webhook", response_model=Dict[str, int])
+async def receive_webhook(request: Request) -> Any:
+    """
+    Recebe os recibos de entrega e leitura das mensagens enviadas. A
+    assinatura ``X-Hub-Signature-256`` é validada com o segredo do
+    aplicativo, e os status são gravados em lote (ver ``StatusBuffer``).
+    """
+    secret = settings.WHATSAPP_APP_SECRET
+    if not secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Integração com o WhatsApp não configurada"
+        )
+    body = await request.body()
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256"), secret):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Assinatura inválida"
+        )
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Corpo da notificação inválido"
+        )
+    rows = parse_statuses(payload)
+    await status_buffer.add(rows)
+    return {"received": len(rows)}
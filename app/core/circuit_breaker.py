@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Callable, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    O circuito está aberto: o serviço externo falhou repetidamente e a
+    chamada é recusada sem ser feita.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Circuito aberto")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Disjuntor para um serviço externo. Depois de ``failure_threshold`` falhas
+    seguidas o circuito abre e as chamadas falham na hora, sem ocupar o
+    handler, por ``reset_timeout`` segundos. Em seguida uma única chamada de
+    teste é liberada (meio aberto): se der certo o circuito fecha, senão abre
+    de novo.
+
+    ``status()`` expõe o estado atual e contadores de cada transição e das
+    chamadas recusadas.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.counters: Dict[str, int] = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0,
+            "half_opened": 0,
+            "closed": 0,
+        }
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Levanta ``CircuitOpenError`` se a chamada não deve ser feita agora.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - self._clock()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+                self.counters["half_opened"] += 1
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.counters["rejected"] += 1
+            raise CircuitOpenError(max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.counters["successes"] += 1
+            self.failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self.counters["closed"] += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.counters["failures"] += 1
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self._opened_at = self._clock()
+                self.counters["opened"] += 1
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, **self.counters}
@@ -0,0 +1,210 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # Dependência opcional
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Tipos de conteúdo que já chegam comprimidos e não se beneficiam de nova compressão
+EXCLUDED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+)
+
+# Status sem corpo ou cujo corpo não deve ser alterado
+SKIP_STATUS_CODES = {204, 206, 304}
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """
+    Converte o header ``Accept-Encoding`` em um dicionário codificação -> q.
+    """
+    encodings: Dict[str, float] = {}
+    for part in value.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[token] = quality
+    return encodings
+
+
+def select_encoding(
+    accept_encoding: str,
+    brotli_enabled: bool = True
+) -> Optional[str]:
+    """
+    Escolhe a melhor codificação suportada pelo cliente. Em caso de empate, o
+    brotli tem preferência sobre o gzip.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    supported: List[str] = ["gzip"]
+    if brotli_enabled and brotli is not None:
+        supported.insert(0, "br")
+
+    best: Tuple[float, Optional[str]] = (0.0, None)
+    for encoding in supported:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best[0]:
+            best = (quality, encoding)
+    return best[1]
+
+
+class _Compressor:
+    """
+    Interface comum para compressão incremental com gzip ou brotli.
+    """
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 gera o formato gzip (cabeçalho + trailer)
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime as respostas com brotli ou gzip conforme o
+    ``Accept-Encoding`` do cliente.
+
+    Respostas menores que ``minimum_size``, respostas ``304``/``204`` e
+    conteúdos já codificados são enviados sem alteração.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        brotli_enabled: bool = True
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_enabled = brotli_enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = select_encoding(
+            headers.get("accept-encoding", ""), self.brotli_enabled
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: str,
+        send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                message["status"] in SKIP_STATUS_CODES
+                or "content-encoding" in headers
+                or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            # Primeiro bloco do corpo: decide se a resposta será comprimida
+            start_message, self.start_message = self.start_message, None
+            if self.passthrough or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self._send(start_message)
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality
+            )
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start_message)
+                await self._send(
+                    {"type": "http.response.body", "body": compressed}
+                )
+                return
+
+            # Resposta em streaming: o tamanho final não é conhecido
+            del headers["Content-Length"]
+            await self._send(start_message)
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
@@ -11,6 +11,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 dias
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # 30 dias
+    AUTH_PRINCIPAL_CACHE_TTL: float = 5.0  # segundos de cache do usuário por token (0 = sem cache)
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
+    CRYPTO_POOL_WORKERS: int = 2  # Processos para bcrypt (0 = no threadpool)
+    CRYPTO_POOL_MAX_QUEUE: int = 64  # Operações aguardando além das em execução
     ALGORITHM: str = "HS256"
     
     # BACKEND_CORS_ORIGINS é uma lista de origens que podem fazer requisições para a API
@@ -46,14 +50,99 @@ class Settings(BaseSettings):
             path=f"{values.get('POSTGRES_DB') or ''}"
         )
 
-    # Configurações do WhatsApp
+    # Pool de conexões do banco de dados
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # segundos aguardando uma conexão livre
+    DB_POOL_RECYCLE: int = 1800  # segundos
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARM_CONNECTIONS: int = 2  # conexões abertas na inicialização
+    HEALTH_PROBE_TTL: float = 5.0  # segundos de cache da verificação do banco
+
+    # Réplicas de leitura, usadas pelos GET de clientes, produtos e pedidos
+    SQLALCHEMY_REPLICA_URIS: List[str] = []
+    DB_REPLICA_MAX_LAG: float = 5.0  # segundos; réplicas mais atrasadas não são usadas
+    DB_REPLICA_CHECK_TTL: float = 5.0  # segundos de cache da verificação das réplicas
+    DB_READ_YOUR_WRITES_WINDOW: float = 5.0  # segundos lendo do primário após escrever
+
+    @validator("SQLALCHEMY_REPLICA_URIS", pre=True)
+    def assemble_replica_uris(cls, v: Union[str, List[str]]) -> List[str]:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        return v
+
+    # Importação em lote de clientes
+    CLIENT_IMPORT_BATCH_SIZE: int = 2000
+    CLIENT_IMPORT_MAX_ERRORS: int = 1000  # Erros detalhados na resposta
+
+    # Sincronização em lote de produtos
+    PRODUCT_BULK_BATCH_SIZE: int = 1000
+
+    # Leituras idênticas simultâneas de produtos compartilham uma consulta
+    PRODUCT_READ_COALESCING: bool = True
+    READ_COALESCING_TIMEOUT: float = 5.0  # segundos aguardando a consulta em andamento
+
+    # Exportação em streaming
+    EXPORT_BATCH_SIZE: int = 1000  # Linhas buscadas por vez no cursor
+
+    # Limite de requisições (token bucket) e descarte de carga
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_USER_RATE: float = 20.0  # requisições por segundo por usuário
+    RATE_LIMIT_USER_BURST: int = 60
+    RATE_LIMIT_IP_RATE: float = 100.0  # requisições por segundo por IP
+    RATE_LIMIT_IP_BURST: int = 200
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Compartilha os limites entre workers
+    SHED_MAX_IN_FLIGHT: int = 256  # Requisições simultâneas por worker (0 = sem limite)
+    SHED_MAX_POOL_WAIT_MS: float = 1000.0  # Espera média por conexão (0 = sem limite)
+    SHED_RETRY_AFTER: int = 1  # segundos
+
+    # Idempotency-Key na criação de pedidos
+    IDEMPOTENCY_TTL: int = 60 * 60 * 24  # segundos que a resposta fica registrada
+    IDEMPOTENCY_CACHE_SIZE: int = 10000  # Respostas mantidas em memória
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0  # segundos aguardando a requisição original
+    IDEMPOTENCY_CLAIM_LEASE: int = 60  # segundos até uma requisição interrompida liberar a chave
+
+    # Notificações de mudança de status dos pedidos
+    ORDER_NOTIFICATION_CONCURRENCY: int = 10  # Envios simultâneos ao WhatsApp
+
+    # Configurações do WhatsApp (obrigatórias apenas para enviar mensagens)
     WHATSAPP_API_URL: str = "https://graph.facebook.com/v17.0"
-    WHATSAPP_API_TOKEN: str
-    WHATSAPP_PHONE_NUMBER_ID: str
+    WHATSAPP_API_TOKEN: Optional[str] = None
+    WHATSAPP_PHONE_NUMBER_ID: Optional[str] = None
+    WHATSAPP_CONNECT_TIMEOUT: float = 3.0  # segundos
+    WHATSAPP_READ_TIMEOUT: float = 10.0  # segundos aguardando a resposta
+    WHATSAPP_MAX_RETRIES: int = 2  # Novas tentativas em 429/5xx e falhas de conexão
+    WHATSAPP_RETRY_BACKOFF: float = 0.2  # segundos; dobra a cada tentativa (com jitter)
+    WHATSAPP_RETRY_BACKOFF_MAX: float = 2.0  # segundos
+    WHATSAPP_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Falhas seguidas que abrem o circuito
+    WHATSAPP_CIRCUIT_RESET_TIMEOUT: float = 30.0  # segundos até a próxima tentativa
+
+    # Webhook de status das mensagens (recibos de entrega e leitura)
+    WHATSAPP_APP_SECRET: Optional[str] = None  # Valida X-Hub-Signature-256
+    WHATSAPP_VERIFY_TOKEN: Optional[str] = None  # hub.verify_token da inscrição (GET); não valida assinaturas
+    WHATSAPP_STATUS_FLUSH_INTERVAL_MS: int = 500  # Intervalo entre gravações em lote
+    WHATSAPP_STATUS_FLUSH_SIZE: int = 500  # Grava antes do intervalo ao acumular N status
+    WHATSAPP_STATUS_MAX_PENDING: int = 50000  # Status mantidos se o banco falhar
     
     # URL do frontend para links nas mensagens
     FRONTEND_URL: str = "https://lu-estilo.com.br"
 
+    # Servidor (python -m app)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int = 0  # 0 = um worker por CPU disponível
+    SERVER_MAX_REQUESTS: int = 10000  # Recicla o worker após N requisições (0 = nunca)
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # segundos
+    SERVER_KEEPALIVE_TIMEOUT: int = 5  # segundos
+    SERVER_BACKLOG: int = 2048
+
+    # Compressão das respostas (gzip/brotli)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (rápido) a 9 (menor)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0 (rápido) a 11 (menor)
+    COMPRESSION_BROTLI_ENABLED: bool = True
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -64,4 +153,28 @@ def get_settings() -> Settings:
     return Settings()
 
 
-settings = get_settings() 
\ No newline at end of file
+def reset_settings() -> None:
+    """
+    Descarta as configurações carregadas; o próximo acesso relê o ambiente.
+    """
+    get_settings.cache_clear()
+
+
+class _LazySettings:
+    """
+    Encaminha o acesso a ``get_settings()``. As configurações (ambiente e
+    ``.env``) só são lidas no primeiro uso, e não ao importar o módulo, para
+    que scripts e testes que importam apenas modelos não dependam delas.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(get_settings(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+settings: Settings = _LazySettings()  # type: ignore[assignment] 
\ No newline at end of file
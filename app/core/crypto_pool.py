@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core import security
+
+logger = logging.getLogger(__name__)
+
+
+class CryptoPoolBusy(Exception):
+    """
+    A fila do pool de criptografia está cheia; a requisição deve ser
+    recusada em vez de aguardar.
+    """
+
+
+class CryptoPool:
+    """
+    Executa o hash e a verificação de senhas (bcrypt) em processos dedicados,
+    fora do threadpool que atende as requisições: um pico de logins não
+    ocupa as threads dos demais endpoints nem disputa o GIL.
+
+    No máximo ``workers + max_queue`` operações ficam pendentes; além disso
+    é levantado ``CryptoPoolBusy`` na hora (backpressure), para que o
+    endpoint responda ``503`` em vez de acumular requisições. Com
+    ``workers=0`` as operações rodam no threadpool, como antes. Parâmetros
+    omitidos vêm das configurações ``CRYPTO_POOL_*``.
+
+    Uma operação só deixa de contar como pendente quando termina no
+    processo, mesmo que quem a aguardava tenha sido cancelado. Se um
+    processo morrer, o pool quebrado é descartado e recriado, e a operação
+    é repetida uma vez.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None) -> None:
+        self._workers = workers
+        self._max_queue = max_queue
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        return settings.CRYPTO_POOL_WORKERS if self._workers is None else self._workers
+
+    @property
+    def max_queue(self) -> int:
+        if self._max_queue is None:
+            return settings.CRYPTO_POOL_MAX_QUEUE
+        return self._max_queue
+
+    @property
+    def capacity(self) -> int:
+        return max(1, self.workers) + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: não herda as threads e conexões do processo da API
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.pending >= self.capacity:
+                raise CryptoPoolBusy()
+            self.pending += 1
+
+    def _release(self, *_: Any) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _discard(self, executor: Executor) -> None:
+        """
+        Descarta um pool quebrado; o próximo envio cria outro.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Pool de criptografia quebrado; um novo será criado")
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Tuple[Executor, Future]:
+        self._acquire()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._discard(executor)
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Libera a vaga quando o processo termina, e não quando quem aguarda
+        # é cancelado: a operação continua ocupando o worker
+        future.add_done_callback(self._release)
+        return executor, future
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa ``fn(*args)`` (uma função de módulo, serializável) no pool.
+        """
+        if self.workers <= 0:
+            self._acquire()
+            try:
+                # O cancelamento aguarda a thread terminar
+                return await run_in_threadpool(fn, *args)
+            finally:
+                self._release()
+
+        for attempt in range(2):
+            executor, future = self._submit(fn, *args)
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                self._discard(executor)
+                if attempt:
+                    raise
+
+    async def hash_password(self, password: str) -> str:
+        return await self.run(security.get_password_hash, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(security.verify_password, plain_password, hashed_password)
+
+    def status(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "capacity": self.capacity,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Pool de criptografia encerrado")
+
+
+crypto_pool = CryptoPool()
@@ -0,0 +1,74 @@
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from app.core.warmup import warm_up
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResourceState:
+    """
+    Estado dos recursos compartilhados do worker, exposto em ``app.state``.
+    """
+    started: bool = False
+    shutting_down: bool = False
+
+    @property
+    def ready(self) -> bool:
+        return self.started and not self.shutting_down
+
+
+async def startup(application: FastAPI) -> ResourceState:
+    """
+    Cria e aquece os recursos do worker: configurações, engine e pool de
+    conexões, schema OpenAPI, o cliente HTTP do WhatsApp e a gravação em lote
+    dos status recebidos pelo webhook. Os recursos são criados sob demanda,
+    então importar a aplicação não os inicializa.
+    """
+    from app.services.whatsapp import get_whatsapp_service
+    from app.services.whatsapp_status import status_buffer
+
+    state = ResourceState()
+    application.state.resources = state
+
+    await run_in_threadpool(warm_up, application)
+    await get_whatsapp_service().startup()
+    await status_buffer.start()
+    state.started = True
+    return state
+
+
+async def shutdown(state: ResourceState) -> None:
+    """
+    Libera os recursos criados em ``startup`` (e os criados sob demanda).
+    """
+    from app.core.crypto_pool import crypto_pool
+    from app.db.base import dispose_engines
+    from app.services.whatsapp import get_whatsapp_service
+    from app.services.whatsapp_status import status_buffer
+
+    state.shutting_down = True
+    await status_buffer.stop()
+    await get_whatsapp_service().shutdown()
+    crypto_pool.shutdown()
+    dispose_engines()
+    logger.info("Recursos liberados")
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """
+    Inicializa e aquece os recursos antes de aceitar requisições e os libera
+    no encerramento do worker.
+    """
+    state = await startup(application)
+    try:
+        yield
+    finally:
+        await shutdown(state)
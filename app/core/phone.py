@@ -0,0 +1,28 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+COUNTRY_CODE = "55"
+# Limite do E.164 (código do país incluído)
+MAX_DIGITS = 15
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+@lru_cache(maxsize=65536)
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Telefone no formato internacional usado pelo WhatsApp: apenas dígitos,
+    com o código do país (55) quando ausente. Retorna ``None`` se não houver
+    dígitos ou se o número passar de ``MAX_DIGITS``.
+    """
+    if not phone:
+        return None
+    digits = _NON_DIGITS.sub("", phone)
+    if not digits:
+        return None
+    if not digits.startswith(COUNTRY_CODE):
+        digits = COUNTRY_CODE + digits
+    if len(digits) > MAX_DIGITS:
+        return None
+    return digits
@@ -0,0 +1,250 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Resultado de uma tentativa: (permitida, segundos até haver uma ficha)
+Decision = Tuple[bool, float]
+
+
+class MemoryRateLimitBackend:
+    """
+    Token bucket em memória, por worker. Cada chave acumula até ``burst``
+    fichas, repostas à taxa de ``rate`` fichas por segundo.
+
+    Ao passar de ``max_keys`` chaves, os baldes que já estariam cheios são
+    descartados (equivalem a não existir). Cada balde guarda o instante em
+    que fica cheio, pois chaves diferentes têm taxas diferentes (usuário e
+    IP). Se ainda assim houver chaves demais, ficam as que demoram mais para
+    encher.
+    """
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        self.max_keys = max_keys
+        # chave -> (fichas, atualizado em, cheio em)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, burst: int) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.get(key, (float(burst), now, now))
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def _prune(self, now: float) -> None:
+        buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+        if len(buckets) > self.max_keys:
+            # Folga de 10% para não repetir a ordenação a cada nova chave
+            keep = sorted(buckets.items(), key=lambda item: item[1][2])
+            buckets = dict(keep[-max(1, self.max_keys * 9 // 10):])
+        self._buckets = buckets
+
+
+# Executado atomicamente no Redis: KEYS[1] = balde; ARGV = taxa, capacidade, agora
+_TOKEN_BUCKET_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Token bucket compartilhado entre workers e instâncias, em um script Lua
+    no Redis. Se o Redis estiver indisponível a requisição é permitida, para
+    que o limitador não derrube a API.
+    """
+
+    def __init__(self, url: str, prefix: str = "rate_limit:") -> None:
+        # Dependência opcional, importada apenas com RATE_LIMIT_REDIS_URL
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:  # pragma: no cover - depende do ambiente
+            raise RuntimeError("O pacote redis é necessário para RATE_LIMIT_REDIS_URL")
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> Decision:
+        try:
+            allowed, tokens = await self._script(
+                keys=[self.prefix + key],
+                args=[rate, burst, time.time()]
+            )
+        except Exception as e:
+            logger.warning("Falha no limitador compartilhado: %s", e)
+            return True, 0.0
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate
+
+
+def decode_bearer_token(
+    authorization: Optional[str],
+    secret_key: str,
+    algorithm: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Decodifica e verifica o token de um header ``Authorization: Bearer``.
+    Tokens ausentes, inválidos ou expirados retornam ``None``.
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+    except JWTError:
+        return None
+    return payload
+
+
+def build_backend(redis_url: Optional[str]) -> Any:
+    """
+    Backend compartilhado no Redis quando configurado; senão, em memória.
+    """
+    if redis_url:
+        return RedisRateLimitBackend(redis_url)
+    return MemoryRateLimitBackend()
+
+
+def _too_many(detail: str, status_code: int, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Limita a taxa de requisições por usuário (``sub`` do JWT) e por IP com
+    token buckets e descarta carga quando o worker está saturado.
+
+    - Requisições autenticadas consomem uma ficha do balde do usuário; todas
+      consomem do balde do IP. Sem fichas, a resposta é ``429``.
+    - Com mais de ``max_in_flight`` requisições em andamento no worker, ou
+      com a espera média por conexão do pool acima de ``max_pool_wait_ms``,
+      a resposta é ``503``. Em ambos os casos é enviado ``Retry-After``.
+
+    O payload do token verificado fica em ``request.state.token_payload``
+    para ser reaproveitado na autenticação.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Any,
+        secret_key: str,
+        algorithm: str,
+        user_rate: float = 20.0,
+        user_burst: int = 60,
+        ip_rate: float = 100.0,
+        ip_burst: int = 200,
+        max_in_flight: int = 0,
+        max_pool_wait_ms: float = 0.0,
+        pool_wait_ms: Optional[Callable[[], float]] = None,
+        retry_after: float = 1.0,
+        exempt_paths: Sequence[str] = ("/health",)
+    ) -> None:
+        self.app = app
+        self.backend = backend
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.ip_rate = ip_rate
+        self.ip_burst = ip_burst
+        self.max_in_flight = max_in_flight
+        self.max_pool_wait_ms = max_pool_wait_ms
+        self.pool_wait_ms = pool_wait_ms
+        self.retry_after = retry_after
+        self.exempt_paths = tuple(exempt_paths)
+        self.in_flight = 0
+
+    def _overloaded(self) -> bool:
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return True
+        if self.max_pool_wait_ms and self.pool_wait_ms is not None:
+            return self.pool_wait_ms() > self.max_pool_wait_ms
+        return False
+
+    async def _check_rate(self, scope: Scope) -> Optional[JSONResponse]:
+        payload = decode_bearer_token(
+            Headers(scope=scope).get("authorization"),
+            self.secret_key,
+            self.algorithm
+        )
+        if payload is not None:
+            scope.setdefault("state", {})["token_payload"] = payload
+            user_id = payload.get("sub")
+            if user_id is not None:
+                allowed, wait = await self.backend.take(
+                    f"user:{user_id}", self.user_rate, self.user_burst
+                )
+                if not allowed:
+                    return _too_many("Limite de requisições excedido", 429, wait)
+
+        client = scope.get("client")
+        if client:
+            allowed, wait = await self.backend.take(
+                f"ip:{client[0]}", self.ip_rate, self.ip_burst
+            )
+            if not allowed:
+                return _too_many("Limite de requisições excedido", 429, wait)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        if self._overloaded():
+            response = _too_many(
+                "Serviço sobrecarregado, tente novamente em instantes",
+                503,
+                self.retry_after
+            )
+            await response(scope, receive, send)
+            return
+
+        response = await self._check_rate(scope)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
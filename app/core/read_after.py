@@ -0,0 +1,37 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Cookie com o instante (epoch) até o qual o cliente deve ler do primário
+READ_AFTER_COOKIE = "read_after"
+
+
+class ReadAfterCookieMiddleware:
+    """
+    Devolve o cookie ``read_after`` nas respostas de requisições que
+    escreveram no banco. Enquanto ele for válido, as leituras do mesmo
+    cliente vão para o primário, em qualquer worker, mesmo que a réplica
+    ainda não tenha recebido a escrita.
+    """
+
+    def __init__(self, app: ASGIApp, window: float = 5.0) -> None:
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                read_after = scope.get("state", {}).get("read_after")
+                if read_after is not None:
+                    headers = MutableHeaders(raw=message["headers"])
+                    headers.append(
+                        "Set-Cookie",
+                        f"{READ_AFTER_COOKIE}={read_after:.3f}; "
+                        f"Max-Age={int(self.window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,12 +1,21 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Union, Optional
 
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache()
+def get_pwd_context() -> Any:
+    """
+    Contexto do passlib, criado no primeiro hash ou verificação: importar o
+    passlib e carregar o bcrypt fica fora da inicialização da aplicação.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_token(
@@ -48,8 +57,8 @@ def create_refresh_token(
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return get_pwd_context().hash(password) 
\ No newline at end of file
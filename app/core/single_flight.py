@@ -0,0 +1,69 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas simultâneas: enquanto a primeira chamada de uma
+    chave está em andamento, as demais aguardam e recebem o mesmo resultado
+    (ou a mesma exceção) em vez de repetir o trabalho.
+
+    Nada é guardado depois que a chamada termina; não é um cache. Se a
+    chamada em andamento demorar mais que ``timeout`` segundos, quem está
+    aguardando desiste e executa a função por conta própria.
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = timeout
+        self.calls = 0
+        self.shared = 0
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Executa ``fn`` uma vez por grupo de chamadas simultâneas com a mesma
+        ``key``. Retorna ``(resultado, compartilhado)``, em que
+        ``compartilhado`` indica que o resultado veio da chamada de outro.
+        ``timeout`` substitui o tempo de espera padrão nesta chamada.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            if call.done.wait(self.timeout if timeout is None else timeout):
+                with self._lock:
+                    self.shared += 1
+                if call.error is not None:
+                    raise call.error
+                return call.result, True
+            return fn(), False
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
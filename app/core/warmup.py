@@ -0,0 +1,62 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def warm_pool(connections: int) -> bool:
+    """
+    Abre ``connections`` conexões simultâneas e as devolve ao pool, de modo que
+    as primeiras requisições não paguem o custo do handshake com o banco.
+
+    O resultado alimenta a verificação de saúde do banco. Retorna ``False`` se
+    não foi possível conectar.
+    """
+    from app.db.base import get_database_probe, get_engine
+
+    engine = get_engine()
+    database_probe = get_database_probe()
+
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for _ in range(max(1, connections)):
+                connection = stack.enter_context(engine.connect())
+                connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning("Falha ao conectar ao banco durante o warm-up: %s", e)
+        database_probe.record(False, error=type(e).__name__)
+        return False
+
+    database_probe.record(True, (time.perf_counter() - start) * 1000)
+    return True
+
+
+def warm_up(application: FastAPI) -> bool:
+    """
+    Prepara o worker antes de aceitar tráfego: carrega as configurações, abre
+    as conexões iniciais do pool e gera o schema OpenAPI das rotas.
+
+    Falhas de conexão com o banco não impedem a inicialização; apenas são
+    registradas e refletidas no retorno, para que o endpoint de readiness
+    indique o problema.
+    """
+    start = time.perf_counter()
+    settings = get_settings()
+
+    database_ok = warm_pool(settings.DB_POOL_WARM_CONNECTIONS)
+
+    # Gera (e mantém em cache) o schema OpenAPI, o que percorre todas as rotas
+    # e os modelos de resposta.
+    application.openapi()
+
+    logger.info(
+        "Warm-up concluído em %.1f ms", (time.perf_counter() - start) * 1000
+    )
+    return database_ok
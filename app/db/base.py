@@ -1,19 +1,170 @@
-from typing import Generator
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict, Generator, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import TimedQueuePool
+from app.db.probe import DatabaseProbe
+from app.db.routing import ReadRouter
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _create_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+# Recursos criados sob demanda: importar os modelos não cria engines nem lê
+# as configurações. ``dispose_engines`` os descarta no encerramento.
+_engine: Optional[Engine] = None
+_database_probe: Optional[DatabaseProbe] = None
+_read_router: Optional[ReadRouter] = None
+_lock = threading.RLock()
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    return _engine
+
+
+def get_database_probe() -> DatabaseProbe:
+    global _database_probe
+    if _database_probe is None:
+        with _lock:
+            if _database_probe is None:
+                _database_probe = DatabaseProbe(
+                    get_engine(), ttl=settings.HEALTH_PROBE_TTL
+                )
+    return _database_probe
+
+
+def get_read_router() -> ReadRouter:
+    global _read_router
+    if _read_router is None:
+        primary = get_engine()
+        with _lock:
+            if _read_router is None:
+                _read_router = ReadRouter(
+                    primary,
+                    [_create_engine(url) for url in settings.SQLALCHEMY_REPLICA_URIS],
+                    window=settings.DB_READ_YOUR_WRITES_WINDOW,
+                    max_lag=settings.DB_REPLICA_MAX_LAG,
+                    check_ttl=settings.DB_REPLICA_CHECK_TTL,
+                )
+    return _read_router
+
+
+def dispose_engines() -> None:
+    """
+    Fecha as conexões do primário e das réplicas e descarta os engines; um
+    novo acesso os recria.
+    """
+    global _engine, _database_probe, _read_router
+    with _lock:
+        engine, router = _engine, _read_router
+        _engine = _database_probe = _read_router = None
+    if router is not None:
+        router.dispose()
+    if engine is not None:
+        engine.dispose()
+
+
+def __getattr__(name: str) -> Any:
+    # Compatibilidade com ``from app.db.base import engine`` e afins
+    accessors = {
+        "engine": get_engine,
+        "database_probe": get_database_probe,
+        "read_router": get_read_router,
+    }
+    if name in accessors:
+        return accessors[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazyBindSession(Session):
+    """
+    Sessão que usa o engine primário quando nenhum ``bind`` foi informado,
+    criando-o no primeiro uso.
+    """
+
+    def get_bind(self, mapper: Any = None, **kwargs: Any) -> Engine:
+        if self.bind is None:
+            return get_engine()
+        return super().get_bind(mapper, **kwargs)
+
+
+SessionLocal = sessionmaker(class_=LazyBindSession, autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
 
-def get_db() -> Generator:
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Retorna as estatísticas do pool de conexões do engine.
+    """
+    pool = get_engine().pool
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    for stat in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, stat, None)
+        if method is not None:
+            status[stat] = method()
+    monitor = getattr(pool, "wait_monitor", None)
+    if monitor is not None:
+        status["wait_ms"] = round(monitor.average_ms, 2)
+    return status
+
+
+def record_write(session: Session) -> None:
+    """
+    Registra que a sessão escreveu no primário: o usuário (``info["user_id"]``)
+    passa a ler do primário durante a janela de leitura após escrita, e a
+    requisição (``info["request_state"]``) devolve o cookie ``read_after``.
+    """
+    if session.info.get("wrote"):
+        return
+    session.info["wrote"] = True
+    read_router = get_read_router()
+    read_router.mark_write(session.info.get("user_id"))
+    state = session.info.get("request_state")
+    if state is not None:
+        state.read_after = time.time() + read_router.window
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    record_write(session)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: Any) -> None:
+    # INSERT/UPDATE/DELETE executados diretamente (em lote), sem flush
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        record_write(orm_execute_state.session)
+
+
+def get_db(request: Request) -> Generator:
     try:
         db = SessionLocal()
+        db.info["request_state"] = request.state
         yield db
     finally:
         db.close() 
\ No newline at end of file
@@ -0,0 +1,15 @@
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def get_insert(db: Session) -> Any:
+    """
+    Retorna a construção ``insert`` do dialeto da sessão, que oferece
+    ``on_conflict_do_nothing``/``on_conflict_do_update`` (PostgreSQL e SQLite).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
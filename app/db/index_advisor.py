@@ -0,0 +1,178 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import MetaData, UniqueConstraint
+
+from app.db.profiler import QueryStats
+
+# Trecho de filtros: do WHERE até o fim da instrução ou da cláusula seguinte
+_WHERE = re.compile(
+    r"\bWHERE\b(.*?)(?=\bORDER BY\b|\bGROUP BY\b|\bLIMIT\b|\bRETURNING\b|\)\s*AS\b|$)",
+    re.IGNORECASE | re.DOTALL
+)
+_JOIN_ON = re.compile(
+    r"\bJOIN\s+\w+(?:\s+AS\s+\w+)?\s+ON\s+(.*?)(?=\bJOIN\b|\bWHERE\b|\bORDER BY\b|\bLIMIT\b|$)",
+    re.IGNORECASE | re.DOTALL
+)
+_ALIAS = re.compile(r"\b(\w+)\s+AS\s+(\w+)\b", re.IGNORECASE)
+# tabela.coluna seguida de um operador indexável
+_EQUALITY = re.compile(
+    r"\b(\w+)\.(\w+)\s*(?:=|\bIN\b|\bIS\b)", re.IGNORECASE
+)
+# Parâmetro à esquerda, como nas cargas lazy: ``? = order_items.order_id``
+_EQUALITY_RIGHT = re.compile(r"(?:=|\bIN\b)\s*\(?\s*(\w+)\.(\w+)\b", re.IGNORECASE)
+_RANGE = re.compile(r"\b(\w+)\.(\w+)\s*(?:>=|<=|>|<)", re.IGNORECASE)
+# LIKE/ILIKE, inclusive a forma lower(col) LIKE lower(?) usada no SQLite
+_LIKE = re.compile(
+    r"(?:lower\()?\b(\w+)\.(\w+)\)?\s+(?:NOT\s+)?I?LIKE\b", re.IGNORECASE
+)
+
+
+@dataclass
+class IndexSuggestion:
+    table: str
+    columns: Tuple[str, ...]
+    kind: str = "btree"  # btree ou trigram
+    calls: int = 0
+    total_ms: float = 0.0
+    covered_by: Optional[str] = None
+    statements: Set[str] = field(default_factory=set)
+
+    @property
+    def ddl(self) -> str:
+        name = f"ix_{self.table}_{'_'.join(self.columns)}"
+        if self.kind == "trigram":
+            return (
+                f"CREATE INDEX {name}_trgm ON {self.table} "
+                f"USING gin ({self.columns[0]} gin_trgm_ops);"
+            )
+        return f"CREATE INDEX {name} ON {self.table} ({', '.join(self.columns)});"
+
+
+# (nome, colunas, único)
+IndexEntry = Tuple[str, Tuple[str, ...], bool]
+
+
+def _index_prefixes(metadata: MetaData) -> Dict[str, List[IndexEntry]]:
+    """
+    Lista, por tabela, os índices (nome, colunas, único) incluindo a chave
+    primária.
+    """
+    result: Dict[str, List[IndexEntry]] = {}
+    for table in metadata.tables.values():
+        entries = [("pk", tuple(c.name for c in table.primary_key.columns), True)]
+        for index in table.indexes:
+            entries.append((index.name, tuple(c.name for c in index.columns), bool(index.unique)))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                entries.append((
+                    constraint.name or "unique",
+                    tuple(c.name for c in constraint.columns),
+                    True
+                ))
+        result[table.name] = entries
+    return result
+
+
+def _covering_index(
+    indexes: List[IndexEntry],
+    columns: Tuple[str, ...]
+) -> Optional[str]:
+    """
+    Retorna o índice cujo prefixo contém todas as colunas (em qualquer ordem)
+    ou um índice único com todas as colunas no filtro: este já localiza no
+    máximo uma linha, e as demais condições não precisam de índice.
+    """
+    for name, index_columns, _ in indexes:
+        prefix = set(index_columns[:len(columns)])
+        if prefix == set(columns):
+            return name
+    for name, index_columns, unique in indexes:
+        if unique and index_columns and set(index_columns) <= set(columns):
+            return name
+    return None
+
+
+def _predicates(statement: str) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], Set[Tuple[str, str]]]:
+    aliases = {alias: table for table, alias in _ALIAS.findall(statement)}
+    clauses = _WHERE.findall(statement) + _JOIN_ON.findall(statement)
+
+    equality: Dict[str, List[str]] = {}
+    ranges: Dict[str, List[str]] = {}
+    likes: Set[Tuple[str, str]] = set()
+    for clause in clauses:
+        for table, column in _LIKE.findall(clause):
+            likes.add((aliases.get(table, table), column))
+        for table, column in _EQUALITY.findall(clause) + _EQUALITY_RIGHT.findall(clause):
+            table = aliases.get(table, table)
+            if (table, column) not in likes and column not in equality.get(table, []):
+                equality.setdefault(table, []).append(column)
+        for table, column in _RANGE.findall(clause):
+            table = aliases.get(table, table)
+            if column not in ranges.get(table, []):
+                ranges.setdefault(table, []).append(column)
+    return equality, ranges, likes
+
+
+def advise(
+    stats: Iterable[QueryStats],
+    metadata: MetaData
+) -> List[IndexSuggestion]:
+    """
+    Analisa as instruções registradas pelo ``QueryProfiler`` e indica, para
+    cada conjunto de colunas filtradas, se existe um índice que o atende.
+
+    Igualdades na mesma tabela são agrupadas (candidatas a índice composto,
+    seguidas da primeira coluna de intervalo). Buscas com LIKE/ILIKE são
+    reportadas como candidatas a índice trigram (pg_trgm).
+    """
+    indexes = _index_prefixes(metadata)
+    suggestions: Dict[Tuple[str, Tuple[str, ...], str], IndexSuggestion] = {}
+
+    def add(table: str, columns: Tuple[str, ...], kind: str, item: QueryStats) -> None:
+        if table not in indexes:
+            return
+        key = (table, columns, kind)
+        suggestion = suggestions.get(key)
+        if suggestion is None:
+            covered = None if kind == "trigram" else _covering_index(indexes[table], columns)
+            suggestion = suggestions[key] = IndexSuggestion(
+                table=table, columns=columns, kind=kind, covered_by=covered
+            )
+        suggestion.calls += item.calls
+        suggestion.total_ms += item.total_ms
+        suggestion.statements.add(item.statement)
+
+    for item in stats:
+        equality, ranges, likes = _predicates(item.statement)
+        for table in set(equality) | set(ranges):
+            columns = tuple(equality.get(table, []))
+            range_columns = [c for c in ranges.get(table, []) if c not in columns]
+            if range_columns:
+                columns += (range_columns[0],)
+            add(table, columns, "btree", item)
+        for table, column in likes:
+            add(table, (column,), "trigram", item)
+
+    return sorted(
+        suggestions.values(),
+        key=lambda s: (s.covered_by is not None, -s.total_ms)
+    )
+
+
+def format_report(suggestions: List[IndexSuggestion]) -> str:
+    """
+    Formata as sugestões como uma tabela Markdown.
+    """
+    lines = [
+        "| Tabela | Colunas | Tipo | Execuções | Tempo total (ms) | Índice existente | Sugestão |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for s in suggestions:
+        lines.append(
+            f"| {s.table} | {', '.join(s.columns)} | {s.kind} | {s.calls} "
+            f"| {s.total_ms:.2f} | {s.covered_by or '-'} "
+            f"| {'-' if s.covered_by else '`' + s.ddl + '`'} |"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,61 @@
+import math
+import threading
+import time
+from typing import Any
+
+from sqlalchemy.pool import QueuePool
+
+
+class PoolWaitMonitor:
+    """
+    Média móvel do tempo de espera por uma conexão do pool.
+
+    A média decai pela metade a cada ``half_life`` segundos sem novas
+    medições, para que o sinal volte a zero quando as requisições deixam de
+    chegar ao banco (por exemplo, enquanto estão sendo descartadas).
+    """
+
+    def __init__(self, half_life: float = 1.0, alpha: float = 0.2) -> None:
+        self.half_life = half_life
+        self.alpha = alpha
+        self._average = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decayed(self, now: float) -> float:
+        elapsed = now - self._updated_at
+        return self._average * math.pow(0.5, elapsed / self.half_life)
+
+    def observe(self, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            average = self._decayed(now)
+            self._average = average + self.alpha * (seconds - average)
+            self._updated_at = now
+
+    @property
+    def average_ms(self) -> float:
+        with self._lock:
+            return self._decayed(time.monotonic()) * 1000
+
+
+class TimedQueuePool(QueuePool):
+    """
+    ``QueuePool`` que mede quanto tempo cada checkout esperou por uma conexão.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_monitor = PoolWaitMonitor()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_monitor.observe(time.perf_counter() - start)
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.wait_monitor = self.wait_monitor
+        return pool
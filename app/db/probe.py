@@ -0,0 +1,89 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency_ms: Optional[float] = None
+    checked_at: float = field(default_factory=time.monotonic)
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "latency_ms": (
+                round(self.latency_ms, 2) if self.latency_ms is not None else None
+            ),
+            "age_s": round(time.monotonic() - self.checked_at, 2),
+            "error": self.error,
+        }
+
+
+class DatabaseProbe:
+    """
+    Verificação de conectividade com o banco com resultado em cache.
+
+    Dentro de ``ttl`` segundos o último resultado é reutilizado, de modo que o
+    balanceador de carga não gere uma consulta por chamada. Apenas uma
+    verificação é executada por vez; as demais chamadas usam o resultado
+    anterior enquanto ela não termina.
+    """
+
+    def __init__(self, engine: Engine, ttl: float = 5.0) -> None:
+        self.engine = engine
+        self.ttl = ttl
+        self._result: Optional[ProbeResult] = None
+        self._lock = threading.Lock()
+
+    @property
+    def result(self) -> Optional[ProbeResult]:
+        return self._result
+
+    def is_stale(self) -> bool:
+        return (
+            self._result is None
+            or time.monotonic() - self._result.checked_at >= self.ttl
+        )
+
+    def record(self, ok: bool, latency_ms: Optional[float] = None,
+               error: Optional[str] = None) -> ProbeResult:
+        self._result = ProbeResult(ok=ok, latency_ms=latency_ms, error=error)
+        return self._result
+
+    def check(self) -> ProbeResult:
+        """
+        Retorna o resultado em cache ou executa ``run_check`` se ele expirou.
+        """
+        if not self.is_stale():
+            return self._result
+
+        if not self._lock.acquire(blocking=self._result is None):
+            # Outra thread já está verificando
+            return self._result
+        try:
+            if not self.is_stale():
+                return self._result
+            start = time.perf_counter()
+            try:
+                with self.engine.connect() as connection:
+                    error = self.run_check(connection)
+            except Exception as e:
+                return self.record(False, error=type(e).__name__)
+            latency_ms = (time.perf_counter() - start) * 1000
+            return self.record(error is None, latency_ms, error=error)
+        finally:
+            self._lock.release()
+
+    def run_check(self, connection: Connection) -> Optional[str]:
+        """
+        Executa a verificação na conexão. Retorna uma mensagem de erro quando
+        o banco responde mas não deve ser usado, ou ``None`` se está saudável.
+        """
+        connection.execute(text("SELECT 1"))
+        return None
@@ -0,0 +1,91 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class QueryProfiler:
+    """
+    Registra o tempo de cada instrução SQL executada pelo engine, agrupando
+    por texto da instrução (os parâmetros já vêm separados pelo driver).
+
+    Uso::
+
+        with QueryProfiler(engine) as profiler:
+            ...
+        profiler.report()
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+        self._active = False
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get("query_profiler_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        key = _WHITESPACE.sub(" ", statement).strip()
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = QueryStats(statement=key)
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def start(self) -> "QueryProfiler":
+        if not self._active:
+            event.listen(self.engine, "before_cursor_execute", self._before)
+            event.listen(self.engine, "after_cursor_execute", self._after)
+            self._active = True
+        return self
+
+    def stop(self) -> None:
+        if self._active:
+            event.remove(self.engine, "before_cursor_execute", self._before)
+            event.remove(self.engine, "after_cursor_execute", self._after)
+            self._active = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+    def report(self, top: Optional[int] = None) -> List[QueryStats]:
+        """
+        Instruções ordenadas pelo tempo total, da mais cara para a mais barata.
+        """
+        with self._lock:
+            ordered = sorted(
+                self.stats.values(), key=lambda s: s.total_ms, reverse=True
+            )
+        return ordered[:top] if top else ordered
+
+    def __enter__(self) -> "QueryProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
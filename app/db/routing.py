@@ -0,0 +1,152 @@
+import itertools
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.probe import DatabaseProbe
+
+# Atraso de replicação no PostgreSQL; zero quando não há nada a reproduzir
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReplicaProbe(DatabaseProbe):
+    """
+    Verificação de saúde de uma réplica: além de responder, o atraso de
+    replicação deve ser de no máximo ``max_lag`` segundos.
+    """
+
+    def __init__(self, engine: Engine, ttl: float = 5.0, max_lag: float = 5.0) -> None:
+        super().__init__(engine, ttl=ttl)
+        self.max_lag = max_lag
+        self.lag: Optional[float] = None
+
+    def run_check(self, connection: Connection) -> Optional[str]:
+        if connection.dialect.name != "postgresql":
+            return super().run_check(connection)
+        self.lag = float(connection.execute(REPLICATION_LAG_SQL).scalar() or 0)
+        if self.lag > self.max_lag:
+            return f"Réplica atrasada {self.lag:.1f}s"
+        return None
+
+
+class RecentWrites:
+    """
+    Momento da última escrita por chave (usuário), para garantir que quem
+    acabou de escrever leia do primário durante ``window`` segundos.
+    """
+
+    def __init__(self, window: float = 5.0, max_keys: int = 100000) -> None:
+        self.window = window
+        self.max_keys = max_keys
+        self._writes: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: Hashable) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._writes[key] = now
+            if len(self._writes) > self.max_keys:
+                self._writes = {
+                    k: at for k, at in self._writes.items()
+                    if now - at < self.window
+                }
+
+    def is_recent(self, key: Hashable) -> bool:
+        at = self._writes.get(key)
+        return at is not None and time.monotonic() - at < self.window
+
+
+class ReadRouter:
+    """
+    Escolhe o engine das leituras: uma réplica saudável (em rodízio) ou o
+    primário quando não há réplicas, quando todas estão atrasadas ou fora do
+    ar, ou quando o usuário escreveu há menos de ``window`` segundos.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        window: float = 5.0,
+        max_lag: float = 5.0,
+        check_ttl: float = 5.0
+    ) -> None:
+        self.primary = primary
+        self.probes: List[ReplicaProbe] = [
+            ReplicaProbe(replica, ttl=check_ttl, max_lag=max_lag)
+            for replica in replicas
+        ]
+        self.recent_writes = RecentWrites(window)
+        self._cycle = itertools.cycle(range(len(self.probes)))
+        self._lock = threading.Lock()
+
+    @property
+    def window(self) -> float:
+        return self.recent_writes.window
+
+    def mark_write(self, user_id: Optional[Hashable]) -> None:
+        if user_id is not None:
+            self.recent_writes.mark(user_id)
+
+    def _next_probes(self) -> List[ReplicaProbe]:
+        with self._lock:
+            start = next(self._cycle)
+        return self.probes[start:] + self.probes[:start]
+
+    def requires_primary(
+        self,
+        user_id: Optional[Hashable] = None,
+        read_after: Optional[float] = None
+    ) -> bool:
+        """
+        Indica se o usuário (ou o cliente) escreveu há pouco e precisa ler os
+        próprios dados. ``read_after`` é o instante (epoch) até o qual o
+        cliente deve ler do primário, informado pelo cookie de leitura após
+        escrita.
+        """
+        if read_after is not None and read_after > time.time():
+            return True
+        return user_id is not None and self.recent_writes.is_recent(user_id)
+
+    def choose(
+        self,
+        user_id: Optional[Hashable] = None,
+        read_after: Optional[float] = None
+    ) -> Engine:
+        if not self.probes or self.requires_primary(user_id, read_after):
+            return self.primary
+
+        for probe in self._next_probes():
+            if probe.check().ok:
+                return probe.engine
+        return self.primary
+
+    def report_failure(self, engine: Engine, error: Exception) -> None:
+        """
+        Marca a réplica como indisponível até a próxima verificação.
+        """
+        for probe in self.probes:
+            if probe.engine is engine:
+                probe.record(False, error=type(error).__name__)
+
+    def status(self) -> List[Dict[str, object]]:
+        return [
+            {
+                "url": probe.engine.url.render_as_string(hide_password=True),
+                "lag_s": probe.lag,
+                **(probe.result.as_dict() if probe.result else {"ok": None}),
+            }
+            for probe in self.probes
+        ]
+
+    def dispose(self) -> None:
+        for probe in self.probes:
+            probe.engine.dispose()
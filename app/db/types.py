@@ -0,0 +1,42 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value: Any) -> int:
+    """
+    Converte um valor monetário (``Decimal``, ``int``, ``float`` ou ``str``)
+    em centavos, arredondando meio centavo para cima.
+    """
+    if not isinstance(value, Decimal):
+        # str() evita carregar o erro binário do float (0.1 -> 0.1000000000000000055)
+        value = Decimal(str(value))
+    return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+class Money(TypeDecorator):
+    """
+    Valor monetário armazenado como inteiro de centavos e exposto como
+    ``Decimal`` com duas casas. Somas e comparações no banco são exatas e
+    ``SUM(coluna)`` também retorna ``Decimal``.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[int]:
+        if value is None:
+            return None
+        return to_cents(value)
+
+    def process_result_value(self, value: Any, dialect: Any) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return from_cents(value)
@@ -1,16 +1,41 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware, build_backend
+from app.core.read_after import ReadAfterCookieMiddleware
+from app.core.lifespan import lifespan
+from app.api.health import router as health_router
 from app.api.v1.api import api_router
+from app.db.base import get_engine
 
 app = FastAPI(
     title="Lu Estilo API",
     description="API RESTful para Lu Estilo",
     version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
+# Limite de requisições e descarte de carga (dentro do CORS, para que as
+# respostas 429/503 também levem os headers CORS)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=build_backend(settings.RATE_LIMIT_REDIS_URL),
+        secret_key=settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+        user_rate=settings.RATE_LIMIT_USER_RATE,
+        user_burst=settings.RATE_LIMIT_USER_BURST,
+        ip_rate=settings.RATE_LIMIT_IP_RATE,
+        ip_burst=settings.RATE_LIMIT_IP_BURST,
+        max_in_flight=settings.SHED_MAX_IN_FLIGHT,
+        max_pool_wait_ms=settings.SHED_MAX_POOL_WAIT_MS,
+        pool_wait_ms=lambda: get_engine().pool.wait_monitor.average_ms,
+        retry_after=settings.SHED_RETRY_AFTER,
+    )
+
 # Configuração CORS
 app.add_middleware(
     CORSMiddleware,
@@ -20,9 +45,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão das respostas
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    brotli_enabled=settings.COMPRESSION_BROTLI_ENABLED,
+)
+
+# Leitura após escrita com réplicas: cookie que direciona o cliente ao primário
+app.add_middleware(
+    ReadAfterCookieMiddleware,
+    window=settings.DB_READ_YOUR_WRITES_WINDOW,
+)
+
 # Incluir rotas da API
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Verificações de saúde para o balanceador de carga (sem autenticação)
+app.include_router(health_router, prefix="/health", tags=["health"])
+
 
 @app.get("/")
 async def root():
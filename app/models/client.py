@@ -1,7 +1,8 @@
 from sqlalchemy import Boolean, Column, Integer, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 
+from app.core.phone import normalize_phone
 from app.db.base import Base
 
 
@@ -12,8 +13,15 @@ class Client(Base):
     name = Column(String, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     phone = Column(String)
+    # Telefone normalizado para o WhatsApp, preenchido ao gravar ``phone``
+    whatsapp_phone = Column(String(20))
     cpf = Column(String, unique=True, index=True, nullable=False)
     address = Column(String)
     is_active = Column(Boolean(), default=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    @validates("phone")
+    def _fill_whatsapp_phone(self, key: str, phone: str) -> str:
+        self.whatsapp_phone = normalize_phone(phone)
+        return phone
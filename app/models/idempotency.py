@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Resposta registrada para um ``Idempotency-Key``. Enquanto a requisição
+    original está em andamento, ``status_code`` e ``response`` ficam nulos.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
 from app.db.base import Base
+from app.db.types import Money
 
 class OrderStatus(str, enum.Enum):
     PENDING = "pending"
@@ -19,7 +20,9 @@ class Order(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING, nullable=False)
-    total_amount = Column(Float, nullable=False, default=0.0)
+    total_amount = Column(Money, nullable=False, default=0)  # centavos
+    # Quantidade de itens, gravada com o pedido para a listagem resumida
+    item_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -27,15 +30,28 @@ class Order(Base):
     user = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Atende a listagem por usuário (com ou sem filtro de status), já na
+        # ordem de created_at; no PostgreSQL inclui as colunas da listagem
+        # resumida para index-only scans.
+        Index(
+            "ix_orders_user_id_status",
+            "user_id",
+            "status",
+            "created_at",
+            postgresql_include=["total_amount", "item_count"]
+        ),
+    )
+
 class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
     quantity = Column(Integer, nullable=False)
-    unit_price = Column(Float, nullable=False)
-    total_price = Column(Float, nullable=False)
+    unit_price = Column(Money, nullable=False)  # centavos
+    total_price = Column(Money, nullable=False)  # centavos
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
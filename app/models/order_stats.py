@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Date, Integer, String
+
+from app.db.base import Base
+from app.db.types import Money
+
+
+class OrderDailyStats(Base):
+    """
+    Pedidos e faturamento por dia (pedidos cancelados não são contabilizados).
+    """
+    __tablename__ = "order_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Money, nullable=False, default=0)  # centavos
+
+
+class OrderStatusStats(Base):
+    """
+    Quantidade e valor dos pedidos em cada status.
+    """
+    __tablename__ = "order_status_stats"
+
+    status = Column(String(20), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Money, nullable=False, default=0)  # centavos
+
+
+class ProductSalesStats(Base):
+    """
+    Quantidade vendida e faturamento por produto (sem pedidos cancelados).
+    """
+    __tablename__ = "product_sales_stats"
+
+    product_id = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Money, nullable=False, default=0)  # centavos
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.db.base import Base
+from app.db.types import Money
 
 class Product(Base):
     __tablename__ = "products"
@@ -10,7 +11,7 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text)
-    price = Column(Float, nullable=False)
+    price = Column(Money, nullable=False)  # centavos
     stock = Column(Integer, default=0)
     category = Column(String, index=True)
     is_active = Column(Boolean, default=True)
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+
+from app.db.base import Base
+
+
+class WhatsAppMessageStatus(Base):
+    """
+    Recibo de entrega de uma mensagem enviada (``sent``, ``delivered``,
+    ``read`` ou ``failed``), recebido pelo webhook do WhatsApp. Cada status
+    de uma mensagem é gravado uma única vez, mesmo que o webhook o reenvie.
+    """
+    __tablename__ = "whatsapp_message_statuses"
+    __table_args__ = (
+        UniqueConstraint("message_id", "status", name="uq_whatsapp_message_statuses_message_status"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    message_id = Column(String(128), nullable=False)
+    status = Column(String(20), nullable=False)
+    recipient_id = Column(String(32))
+    conversation_id = Column(String(128))
+    error_code = Column(Integer)
+    error_title = Column(String(255))
+    timestamp = Column(DateTime, nullable=False)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
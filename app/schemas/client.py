@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, constr, validator
 
@@ -55,4 +55,16 @@ class Client(ClientInDBBase):
 
 
 class ClientInDB(ClientInDBBase):
-    pass 
\ No newline at end of file
+    pass 
+
+
+class ClientImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ClientImportResult(BaseModel):
+    received: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[ClientImportError] = []
@@ -0,0 +1,14 @@
+from decimal import Decimal
+
+from pydantic import PlainSerializer
+from typing_extensions import Annotated
+
+# Valor monetário com duas casas decimais. Internamente é ``Decimal`` (sem
+# erros de arredondamento); no JSON continua sendo um número, como antes.
+Money = Annotated[
+    Decimal,
+    PlainSerializer(float, return_type=float, when_used="json")
+]
+
+MONEY_MAX_DIGITS = 14
+MONEY_DECIMAL_PLACES = 2
@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
 from app.models.order import OrderStatus
+from app.schemas.money import Money
 
 class OrderItemBase(BaseModel):
     product_id: int = Field(..., gt=0)
@@ -14,8 +15,8 @@ class OrderItemCreate(OrderItemBase):
 class OrderItem(OrderItemBase):
     id: int
     order_id: int
-    unit_price: float
-    total_price: float
+    unit_price: Money
+    total_price: Money
 
     class Config:
         from_attributes = True
@@ -29,13 +30,71 @@ class OrderCreate(OrderBase):
 class OrderUpdate(BaseModel):
     status: Optional[OrderStatus] = None
 
+class OrderStatusTransition(BaseModel):
+    order_id: int = Field(..., gt=0)
+    status: OrderStatus
+
+class OrderStatusBulkError(BaseModel):
+    order_id: int
+    error: str
+
+class OrderStatusBulkResult(BaseModel):
+    received: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: List[OrderStatusBulkError] = []
+
 class Order(OrderBase):
     id: int
     user_id: int
-    total_amount: float
+    total_amount: Money
+    item_count: int
     created_at: datetime
     updated_at: datetime
     items: List[OrderItem]
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class OrderSummary(BaseModel):
+    """
+    Representação resumida para listagens, sem os itens.
+    """
+    id: int
+    status: OrderStatus
+    total_amount: Money
+    item_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DailyStats(BaseModel):
+    day: date
+    order_count: int
+    revenue: Money
+
+    class Config:
+        from_attributes = True
+
+class StatusStats(BaseModel):
+    status: OrderStatus
+    order_count: int
+    revenue: Money
+
+    class Config:
+        from_attributes = True
+
+class ProductSalesStats(BaseModel):
+    product_id: int
+    quantity: int
+    revenue: Money
+
+    class Config:
+        from_attributes = True
+
+class OrderStats(BaseModel):
+    daily: List[DailyStats]
+    by_status: List[StatusStats]
+    top_products: List[ProductSalesStats]
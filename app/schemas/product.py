@@ -1,11 +1,15 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, Field, validator
+
+from app.schemas.money import MONEY_DECIMAL_PLACES, MONEY_MAX_DIGITS, Money
 
 class ProductBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
-    price: float = Field(..., gt=0)
+    price: Money = Field(
+        ..., gt=0, max_digits=MONEY_MAX_DIGITS, decimal_places=MONEY_DECIMAL_PLACES
+    )
     stock: int = Field(0, ge=0)
     category: str = Field(..., min_length=1, max_length=50)
     is_active: bool = True
@@ -16,15 +20,42 @@ class ProductCreate(ProductBase):
 class ProductUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
-    price: Optional[float] = Field(None, gt=0)
+    price: Optional[Money] = Field(
+        None, gt=0, max_digits=MONEY_MAX_DIGITS, decimal_places=MONEY_DECIMAL_PLACES
+    )
     stock: Optional[int] = Field(None, ge=0)
     category: Optional[str] = Field(None, min_length=1, max_length=50)
     is_active: Optional[bool] = None
 
+    @validator('name', 'price', 'stock', 'category', 'is_active')
+    def reject_null(cls, v):
+        # Os campos podem ser omitidos, mas não enviados como null
+        if v is None:
+            raise ValueError('não pode ser nulo')
+        return v
+
 class Product(ProductBase):
     id: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class ProductBulkItem(ProductUpdate):
+    """
+    Item da sincronização em lote: com ``id`` atualiza o produto existente
+    (apenas os campos enviados); sem ``id`` cria um novo produto.
+    """
+    id: Optional[int] = Field(None, gt=0)
+
+class ProductBulkError(BaseModel):
+    index: int
+    error: str
+
+class ProductBulkResult(BaseModel):
+    received: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ProductBulkError] = []
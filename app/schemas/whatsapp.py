@@ -1,6 +1,8 @@
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 
+from app.schemas.money import Money
+
 class WhatsAppMessage(BaseModel):
     client_id: int
     message: str
@@ -18,7 +20,7 @@ class WhatsAppOrderNotification(BaseModel):
 class WhatsAppPaymentNotification(BaseModel):
     client_id: int
     order_number: str
-    amount: float
+    amount: Money
     payment_method: str
 
 class WhatsAppShippingNotification(BaseModel):
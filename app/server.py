@@ -0,0 +1,107 @@
+import argparse
+import inspect
+import os
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+
+from app.core.config import get_settings
+
+
+def available_cpus() -> int:
+    """
+    Retorna a quantidade de CPUs disponíveis para o processo, respeitando a
+    afinidade de CPU e o limite de cota do cgroup (containers).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - plataformas sem sched_getaffinity
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def get_worker_count(configured: int = 0) -> int:
+    """
+    Define a quantidade de workers. Com ``configured`` igual a 0, usa um
+    worker por CPU disponível.
+    """
+    if configured > 0:
+        return configured
+    return available_cpus()
+
+
+def build_config(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    reload: bool = False
+) -> Dict[str, Any]:
+    """
+    Monta os parâmetros do uvicorn a partir das configurações da aplicação.
+    """
+    settings = get_settings()
+    config: Dict[str, Any] = {
+        "app": "app.main:app",
+        "host": host or settings.SERVER_HOST,
+        "port": port or settings.SERVER_PORT,
+        "loop": "uvloop" if find_spec("uvloop") else "auto",
+        "http": "httptools" if find_spec("httptools") else "auto",
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        "backlog": settings.SERVER_BACKLOG,
+        "proxy_headers": True,
+    }
+
+    if reload:
+        # Modo de desenvolvimento: um único processo com recarga automática
+        config["reload"] = True
+        return config
+
+    config["workers"] = get_worker_count(
+        workers if workers is not None else settings.WEB_CONCURRENCY
+    )
+    if settings.SERVER_MAX_REQUESTS > 0:
+        config["limit_max_requests"] = settings.SERVER_MAX_REQUESTS
+        # O jitter evita que todos os workers reciclem ao mesmo tempo; só
+        # existe nas versões mais recentes do uvicorn.
+        if "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+            config["limit_max_requests_jitter"] = settings.SERVER_MAX_REQUESTS_JITTER
+    return config
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Servidor da API Lu Estilo")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade de workers (0 = um por CPU)"
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Recarrega a aplicação a cada alteração (desenvolvimento)"
+    )
+    return parser.parse_args(argv)
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    uvicorn.run(**build_config(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload
+    ))
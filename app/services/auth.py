@@ -6,12 +6,15 @@ from sqlalchemy.orm import Session
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from starlette.concurrency import run_in_threadpool
 
 from app.core.security import get_password_hash, verify_password, create_access_token
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.models.token import Token
 from app.core.config import settings
+from app.core.crypto_pool import CryptoPoolBusy, crypto_pool
+from app.services.principal import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/login")
 
@@ -35,10 +38,53 @@ def authenticate(db: Session, email: str, password: str) -> User | str | bool:
     return user
 
 
-def create_user(db: Session, *, obj_in: UserCreate) -> User:
+async def _offload_crypto(operation: str, *args):
+    """
+    Executa ``hash_password`` ou ``verify_password`` no pool de
+    criptografia, respondendo ``503`` quando a fila está cheia.
+    """
+    try:
+        return await getattr(crypto_pool, operation)(*args)
+    except CryptoPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serviço de autenticação sobrecarregado, tente novamente em instantes",
+            headers={"Retry-After": str(settings.SHED_RETRY_AFTER)}
+        )
+
+
+async def authenticate_async(db: Session, email: str, password: str) -> User | str | bool:
+    """
+    Igual a ``authenticate``, mas a consulta roda no threadpool e o bcrypt no
+    pool de criptografia, sem ocupar uma thread durante a verificação.
+    """
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        return False
+    if not user.is_active:
+        return "inactive"
+    if not await _offload_crypto("verify_password", password, user.hashed_password):
+        return False
+    return user
+
+
+async def hash_password_async(password: str) -> str:
+    return await _offload_crypto("hash_password", password)
+
+
+def create_user(
+    db: Session,
+    *,
+    obj_in: UserCreate,
+    hashed_password: Optional[str] = None
+) -> User:
+    """
+    Cria o usuário. ``hashed_password`` evita recalcular o hash quando ele
+    já foi gerado no pool de criptografia.
+    """
     db_obj = User(
         email=obj_in.email,
-        hashed_password=get_password_hash(obj_in.password),
+        hashed_password=hashed_password or get_password_hash(obj_in.password),
         full_name=obj_in.full_name,
         is_superuser=obj_in.is_superuser,
         is_active=obj_in.is_active if obj_in.is_active is not None else True
@@ -94,6 +140,8 @@ def create_user_token(
     db.add(db_token)
     db.commit()
     db.refresh(db_token)
+    # Os tokens anteriores não podem continuar valendo pelo cache
+    principal_cache.invalidate_user(user.id)
     
     return db_token
 
@@ -115,6 +163,7 @@ def deactivate_token(db: Session, token: str) -> None:
     """
     db.query(Token).filter(Token.token == token).update({"is_active": False})
     db.commit()
+    principal_cache.invalidate_token(token)
 
 
 def deactivate_user_tokens(db: Session, user_id: int) -> None:
@@ -126,6 +175,7 @@ def deactivate_user_tokens(db: Session, user_id: int) -> None:
         Token.is_active == True
     ).update({"is_active": False})
     db.commit()
+    principal_cache.invalidate_user(user_id)
 
 
 def get_current_user(db: Session, token: str) -> User:
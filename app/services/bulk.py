@@ -0,0 +1,41 @@
+from typing import AsyncIterator, Optional, Tuple
+
+from pydantic import ValidationError
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes]
+) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Divide um corpo recebido em blocos em linhas, sem carregá-lo inteiro em
+    memória. Retorna tuplas (número da linha, conteúdo); o conteúdo é
+    ``None`` quando a linha não é UTF-8 válido, para que o erro seja
+    reportado na linha em vez de interromper o corpo inteiro.
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, _decode(line)
+    if buffer:
+        yield line_no + 1, _decode(buffer)
+
+
+def _decode(line: bytes) -> Optional[str]:
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Resume os erros de validação de um registro em uma única linha.
+    """
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}"
+        for e in error.errors()
+    )
@@ -1,14 +1,56 @@
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import or_, func
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.models.client import Client
 from app.schemas.client import ClientCreate, ClientUpdate
 
 
-def get_client(db: Session, client_id: int) -> Optional[Client]:
-    return db.query(Client).filter(Client.id == client_id).first()
+def _apply_fields(query, fields: Optional[Sequence[str]]):
+    """
+    Restringe a projeção SQL às colunas solicitadas.
+    """
+    if fields:
+        query = query.options(load_only(*[getattr(Client, f) for f in fields]))
+    return query
+
+
+def get_client(
+    db: Session,
+    client_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Client]:
+    query = _apply_fields(db.query(Client), fields)
+    return query.filter(Client.id == client_id).first()
+
+
+def _filter_clients(query, search: Optional[str]):
+    if search:
+        search = f"%{search}%"
+        query = query.filter(
+            or_(
+                Client.name.ilike(search),
+                Client.email.ilike(search)
+            )
+        )
+    return query
+
+
+def iter_clients(
+    db: Session,
+    search: Optional[str] = None,
+    batch_size: Optional[int] = None
+) -> Iterator[Client]:
+    """
+    Percorre todos os clientes que atendem aos filtros com um cursor no
+    servidor, mantendo em memória apenas ``batch_size`` registros por vez.
+    """
+    query = _filter_clients(db.query(Client), search).order_by(Client.id)
+    return query.execution_options(stream_results=True).yield_per(
+        batch_size or settings.EXPORT_BATCH_SIZE
+    )
 
 
 def get_client_by_email(db: Session, email: str) -> Optional[Client]:
@@ -23,28 +65,20 @@ def get_clients(
     db: Session,
     page: int = 1,
     size: int = 100,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> Tuple[List[Client], int]:
     """
     Retorna uma tupla contendo a lista de clientes e o total de registros.
     """
-    query = db.query(Client)
-    
-    if search:
-        search = f"%{search}%"
-        query = query.filter(
-            or_(
-                Client.name.ilike(search),
-                Client.email.ilike(search)
-            )
-        )
+    query = _filter_clients(db.query(Client), search)
     
     # Conta o total de registros
     total = query.count()
     
     # Aplica paginação
     skip = (page - 1) * size
-    clients = query.offset(skip).limit(size).all()
+    clients = _apply_fields(query, fields).offset(skip).limit(size).all()
     
     return clients, total
 
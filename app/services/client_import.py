@@ -0,0 +1,190 @@
+import csv
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.phone import normalize_phone
+from app.db.dialects import get_insert
+from app.models.client import Client
+from app.schemas.client import ClientCreate, ClientImportError, ClientImportResult
+from app.services.bulk import format_validation_error, iter_lines
+
+logger = logging.getLogger(__name__)
+
+# (linha, registro bruto)
+RawRecord = Tuple[int, Dict[str, Any]]
+
+
+async def iter_records(
+    lines: AsyncIterator[Tuple[int, Optional[str]]],
+    fmt: str
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Converte as linhas em registros. Retorna tuplas (linha, registro, erro).
+
+    No CSV a primeira linha é o cabeçalho; campos com quebra de linha não são
+    suportados, pois cada linha é interpretada isoladamente.
+    """
+    header: Optional[List[str]] = None
+    async for line_no, line in lines:
+        if line is None:
+            yield line_no, None, "Linha com codificação inválida (esperado UTF-8)"
+            continue
+        if not line.strip():
+            continue
+
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [h.strip().lstrip("\ufeff").lower() for h in values]
+                continue
+            if len(values) != len(header):
+                yield line_no, None, "Quantidade de colunas diferente do cabeçalho"
+                continue
+            yield line_no, {
+                key: value.strip() or None for key, value in zip(header, values)
+            }, None
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_no, None, "JSON inválido"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Cada linha deve conter um objeto JSON"
+                continue
+            yield line_no, record, None
+
+
+def import_batch(
+    db: Session,
+    batch: List[RawRecord]
+) -> Tuple[int, List[ClientImportError]]:
+    """
+    Valida, remove duplicados e insere um lote de clientes com
+    ``ON CONFLICT DO NOTHING``. Clientes que já existem no banco (email ou CPF)
+    são reportados como erro da respectiva linha, sem abortar o lote.
+
+    Retorna a quantidade de clientes criados e os erros por linha.
+    """
+    errors: List[ClientImportError] = []
+    rows: List[Tuple[int, ClientCreate]] = []
+    seen_emails: Dict[str, int] = {}
+    seen_cpfs: Dict[str, int] = {}
+
+    for line, record in batch:
+        try:
+            client = ClientCreate(**record)
+        except ValidationError as e:
+            errors.append(ClientImportError(line=line, error=format_validation_error(e)))
+            continue
+
+        if client.email in seen_emails:
+            errors.append(ClientImportError(
+                line=line,
+                error=f"Email duplicado no arquivo (linha {seen_emails[client.email]})"
+            ))
+            continue
+        if client.cpf in seen_cpfs:
+            errors.append(ClientImportError(
+                line=line,
+                error=f"CPF duplicado no arquivo (linha {seen_cpfs[client.cpf]})"
+            ))
+            continue
+        seen_emails[client.email] = line
+        seen_cpfs[client.cpf] = line
+        rows.append((line, client))
+
+    if not rows:
+        return 0, errors
+
+    now = datetime.utcnow()
+    insert = get_insert(db)
+    stmt = insert(Client).on_conflict_do_nothing().returning(Client.email)
+    try:
+        result = db.execute(stmt, [
+            {
+                "name": client.name,
+                "email": client.email,
+                "cpf": client.cpf,
+                "phone": client.phone,
+                "whatsapp_phone": normalize_phone(client.phone),
+                "address": client.address,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, client in rows
+        ])
+        inserted = set(result.scalars())
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Falha ao inserir lote de %s clientes", len(rows))
+        errors.extend(
+            ClientImportError(line=line, error="Erro ao gravar o cliente, tente novamente.")
+            for line, _ in rows
+        )
+        return 0, errors
+
+    for line, client in rows:
+        if client.email not in inserted:
+            errors.append(ClientImportError(
+                line=line,
+                error="Já existe um cliente cadastrado com este email ou CPF."
+            ))
+    return len(inserted), errors
+
+
+async def import_clients(
+    db: Session,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    batch_size: Optional[int] = None,
+    max_errors: Optional[int] = None
+) -> ClientImportResult:
+    """
+    Importa clientes de um corpo CSV ou JSONL recebido em streaming.
+
+    Os registros são agrupados em lotes de ``batch_size``; validação e
+    inserção de cada lote rodam no threadpool, em uma transação por lote.
+    Apenas os primeiros ``max_errors`` erros são detalhados na resposta.
+    """
+    batch_size = batch_size or settings.CLIENT_IMPORT_BATCH_SIZE
+    if max_errors is None:
+        max_errors = settings.CLIENT_IMPORT_MAX_ERRORS
+
+    result = ClientImportResult()
+
+    def add_errors(errors: List[ClientImportError]) -> None:
+        result.failed += len(errors)
+        room = max(0, max_errors - len(result.errors))
+        result.errors.extend(errors[:room])
+
+    async def flush(batch: List[RawRecord]) -> None:
+        created, errors = await run_in_threadpool(import_batch, db, batch)
+        result.created += created
+        add_errors(errors)
+
+    batch: List[RawRecord] = []
+    async for line, record, error in iter_records(iter_lines(chunks), fmt):
+        result.received += 1
+        if error:
+            add_errors([ClientImportError(line=line, error=error)])
+            continue
+        batch.append((line, record))
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+
+    if batch:
+        await flush(batch)
+
+    result.errors.sort(key=lambda e: e.line)
+    return result
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.dialects import get_insert
+from app.models.idempotency import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+
+# Intervalo entre consultas ao aguardar uma requisição de outro processo
+POLL_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: Any
+    expires_at: datetime
+
+
+def request_hash(payload: str) -> str:
+    """
+    Impressão digital do corpo da requisição, usada para rejeitar a mesma
+    chave com um payload diferente.
+    """
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Executa uma operação no máximo uma vez por ``(user_id, key)``.
+
+    A tabela ``idempotency_keys`` é a fonte da verdade entre processos: a
+    primeira requisição reivindica a chave com ``INSERT ... ON CONFLICT``,
+    executa a operação e grava a resposta. Repetições devolvem a resposta
+    gravada sem executar a operação de novo. Um cache LRU em memória evita a
+    consulta ao banco nas repetições mais comuns, e requisições simultâneas
+    com a mesma chave no mesmo processo aguardam a primeira terminar.
+
+    Apenas respostas de sucesso são gravadas; se a operação falhar, a chave é
+    liberada para que o cliente possa tentar novamente. A operação não deve
+    confirmar a transação: a resposta é gravada e confirmada junto com ela,
+    então não existe pedido criado sem resposta registrada. Se o processo
+    morrer antes disso, a reivindicação expira após ``claim_lease`` segundos
+    e uma nova tentativa pode assumi-la.
+
+    Parâmetros omitidos vêm das configurações ``IDEMPOTENCY_*``, lidas no
+    primeiro uso.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        claim_lease: Optional[int] = None,
+        purge_interval: float = 300.0
+    ) -> None:
+        self._ttl = ttl
+        self._claim_lease = claim_lease
+        self._cache_size = cache_size
+        self._wait_timeout = wait_timeout
+        self.purge_interval = purge_interval
+        self._cache: "OrderedDict[Tuple[int, str], StoredResponse]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, str], threading.Event] = {}
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+
+    @property
+    def ttl(self) -> int:
+        return settings.IDEMPOTENCY_TTL if self._ttl is None else self._ttl
+
+    @property
+    def claim_lease(self) -> int:
+        if self._claim_lease is None:
+            return settings.IDEMPOTENCY_CLAIM_LEASE
+        return self._claim_lease
+
+    @property
+    def cache_size(self) -> int:
+        if self._cache_size is None:
+            return settings.IDEMPOTENCY_CACHE_SIZE
+        return self._cache_size
+
+    @property
+    def wait_timeout(self) -> float:
+        if self._wait_timeout is None:
+            return settings.IDEMPOTENCY_WAIT_TIMEOUT
+        return self._wait_timeout
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cache_get(self, cache_key: Tuple[int, str]) -> Optional[StoredResponse]:
+        with self._lock:
+            stored = self._cache.get(cache_key)
+            if stored is None:
+                return None
+            if stored.expires_at <= datetime.utcnow():
+                del self._cache[cache_key]
+                return None
+            self._cache.move_to_end(cache_key)
+            return stored
+
+    def _cache_set(self, cache_key: Tuple[int, str], stored: StoredResponse) -> None:
+        with self._lock:
+            self._cache[cache_key] = stored
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _check_hash(stored_hash: str, fingerprint: str) -> None:
+        if stored_hash != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key já utilizada com outro conteúdo de requisição."
+            )
+
+    def purge_expired(self, db: Session) -> int:
+        """
+        Remove as chaves expiradas. Retorna a quantidade removida.
+        """
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+        db.commit()
+        self._last_purge = time.monotonic()
+        return deleted
+
+    def _load(self, db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+        row = db.get(IdempotencyKey, (user_id, key), populate_existing=True)
+        if row is None or row.expires_at <= datetime.utcnow():
+            return None
+        return row
+
+    def _claim(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        fingerprint: str
+    ) -> Optional[datetime]:
+        """
+        Reivindica a chave por ``claim_lease`` segundos. Uma chave expirada
+        (ou uma reivindicação abandonada) é reaproveitada no mesmo comando.
+
+        Retorna o instante da reivindicação, que a identifica ao gravar a
+        resposta, ou ``None`` se outra requisição já possui a chave.
+        """
+        now = datetime.utcnow()
+        table = IdempotencyKey.__table__
+        insert = get_insert(db)
+        stmt = insert(table).values(
+            user_id=user_id,
+            key=key,
+            request_hash=fingerprint,
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.claim_lease)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "status_code": None,
+                "response": None,
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=table.c.expires_at <= now
+        ).returning(table.c.key)
+        claimed = db.execute(stmt).first() is not None
+        db.commit()
+        return now if claimed else None
+
+    def _wait_for_other_process(
+        self,
+        db: Session,
+        user_id: int,
+        key: str
+    ) -> Optional[StoredResponse]:
+        """
+        Aguarda a requisição que reivindicou a chave em outro processo.
+        Retorna ``None`` se a chave foi liberada (a operação falhou).
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            row = self._load(db, user_id, key)
+            if row is None:
+                return None
+            if row.status_code is not None:
+                return self._to_stored(row)
+            time.sleep(POLL_INTERVAL)
+        raise HTTPException(
+            status_code=409,
+            detail="Uma requisição com esta Idempotency-Key ainda está em processamento."
+        )
+
+    @staticmethod
+    def _to_stored(row: IdempotencyKey) -> StoredResponse:
+        return StoredResponse(
+            request_hash=row.request_hash,
+            status_code=row.status_code,
+            body=json.loads(row.response),
+            expires_at=row.expires_at
+        )
+
+    def _execute(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Tuple[int, Any]]
+    ) -> Tuple[StoredResponse, bool]:
+        while True:
+            row = self._load(db, user_id, key)
+            if row is not None:
+                if row.status_code is not None:
+                    return self._to_stored(row), True
+                self._check_hash(row.request_hash, fingerprint)
+                stored = self._wait_for_other_process(db, user_id, key)
+                if stored is not None:
+                    return stored, True
+                continue
+
+            claimed_at = self._claim(db, user_id, key, fingerprint)
+            if claimed_at is not None:
+                break
+
+        claim = db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at == claimed_at
+        )
+        try:
+            status_code, body = operation()
+            response = json.dumps(body)
+            expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+            # Na mesma transação da operação; falha se a reivindicação
+            # expirou e foi assumida por outra requisição
+            saved = claim.update({
+                IdempotencyKey.status_code: status_code,
+                IdempotencyKey.response: response,
+                IdempotencyKey.expires_at: expires_at,
+            }, synchronize_session=False)
+            if not saved:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Uma requisição com esta Idempotency-Key ainda está em processamento."
+                )
+            db.commit()
+        except BaseException:
+            db.rollback()
+            claim.delete(synchronize_session=False)
+            db.commit()
+            raise
+
+        stored = StoredResponse(
+            request_hash=fingerprint,
+            status_code=status_code,
+            body=json.loads(response),
+            expires_at=expires_at
+        )
+        return stored, False
+
+    def execute(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        payload: str,
+        operation: Callable[[], Tuple[int, Any]]
+    ) -> Tuple[int, Any, bool]:
+        """
+        Executa ``operation`` (que retorna ``(status_code, corpo JSON)``) uma
+        única vez para a chave informada.
+
+        Retorna ``(status_code, corpo, repetida)``, em que ``repetida`` indica
+        que a resposta veio do registro de uma requisição anterior.
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Idempotency-Key deve ter entre 1 e {MAX_KEY_LENGTH} caracteres."
+            )
+        fingerprint = request_hash(payload)
+        cache_key = (user_id, key)
+
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self.purge_expired(db)
+
+        while True:
+            stored = self._cache_get(cache_key)
+            if stored is not None:
+                self._check_hash(stored.request_hash, fingerprint)
+                return stored.status_code, stored.body, True
+
+            with self._lock:
+                event = self._inflight.get(cache_key)
+                owner = event is None
+                if owner:
+                    event = self._inflight[cache_key] = threading.Event()
+
+            if not owner:
+                # Mesma chave em andamento neste processo: aguarda o resultado
+                if not event.wait(self.wait_timeout):
+                    raise HTTPException(
+                        status_code=409,
+                        detail="Uma requisição com esta Idempotency-Key ainda está em processamento."
+                    )
+                continue
+
+            try:
+                stored, replayed = self._execute(
+                    db, user_id, key, fingerprint, operation
+                )
+                self._cache_set(cache_key, stored)
+                self._check_hash(stored.request_hash, fingerprint)
+                return stored.status_code, stored.body, replayed
+            finally:
+                with self._lock:
+                    del self._inflight[cache_key]
+                event.set()
+
+
+idempotency_store = IdempotencyStore()
@@ -1,84 +1,195 @@
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import func, or_, select, update
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.models.order import Order, OrderItem, OrderStatus
-from app.models.product import Product
 from app.schemas.order import OrderCreate, OrderUpdate
+from app.services import order_stats, order_status, stock
 
-def get_order(db: Session, order_id: int) -> Optional[Order]:
-    return db.query(Order).filter(Order.id == order_id).first()
+def _apply_options(
+    query,
+    fields: Optional[Sequence[str]],
+    include_items: bool
+):
+    """
+    Restringe a projeção às colunas solicitadas e carrega os itens em lote
+    apenas quando eles fazem parte da resposta.
+    """
+    if fields:
+        query = query.options(load_only(*[getattr(Order, f) for f in fields]))
+    if include_items:
+        query = query.options(selectinload(Order.items))
+    return query
+
+def get_order(
+    db: Session,
+    order_id: int,
+    fields: Optional[Sequence[str]] = None,
+    include_items: bool = False
+) -> Optional[Order]:
+    query = _apply_options(db.query(Order), fields, include_items)
+    return query.filter(Order.id == order_id).first()
+
+def _filter_orders(query, user_id: int, status: Optional[OrderStatus]):
+    query = query.filter(Order.user_id == user_id)
+    
+    if status:
+        query = query.filter(Order.status == status)
+    return query
+
+# Ordem estável das listagens paginadas (servida por ix_orders_user_id_status)
+LISTING_ORDER = (Order.created_at.desc(), Order.id.desc())
+
+def iter_orders(
+    db: Session,
+    user_id: int,
+    status: Optional[OrderStatus] = None,
+    include_items: bool = True,
+    batch_size: Optional[int] = None
+) -> Iterator[Order]:
+    """
+    Percorre todos os pedidos do usuário com um cursor no servidor, mantendo
+    em memória apenas ``batch_size`` pedidos (e seus itens) por vez.
+    """
+    query = _filter_orders(db.query(Order), user_id, status).order_by(Order.id)
+    query = _apply_options(query, None, include_items)
+    return query.execution_options(stream_results=True).yield_per(
+        batch_size or settings.EXPORT_BATCH_SIZE
+    )
 
 def get_orders(
     db: Session,
     user_id: int,
     page: int = 1,
     size: int = 100,
-    status: Optional[OrderStatus] = None
+    status: Optional[OrderStatus] = None,
+    fields: Optional[Sequence[str]] = None,
+    include_items: bool = False
 ) -> Tuple[List[Order], int]:
     """
     Retorna uma tupla contendo a lista de pedidos e o total de registros.
     """
-    query = db.query(Order).filter(Order.user_id == user_id)
-    
-    if status:
-        query = query.filter(Order.status == status)
+    query = _filter_orders(db.query(Order), user_id, status)
     
     # Conta o total de registros
     total = query.count()
     
     # Aplica paginação
     skip = (page - 1) * size
-    orders = query.offset(skip).limit(size).all()
+    query = _apply_options(query, fields, include_items)
+    orders = query.order_by(*LISTING_ORDER).offset(skip).limit(size).all()
     
     return orders, total
 
-def create_order(db: Session, *, user_id: int, obj_in: OrderCreate) -> Order:
+def order_totals(order_id: int) -> Dict[str, Any]:
+    """
+    Subconsultas com o total exato (em centavos) e a quantidade de itens do
+    pedido, para gravar os campos desnormalizados de ``Order``.
+    """
+    items = OrderItem.order_id == order_id
+    return {
+        "total_amount": select(
+            func.coalesce(func.sum(OrderItem.total_price), 0)
+        ).where(items).scalar_subquery(),
+        "item_count": select(func.count(OrderItem.id)).where(items).scalar_subquery(),
+    }
+
+# Colunas da listagem resumida; no PostgreSQL ficam todas em
+# ix_orders_user_id_status (INCLUDE), permitindo index-only scans
+ORDER_SUMMARY_COLUMNS = (
+    Order.id,
+    Order.status,
+    Order.total_amount,
+    Order.item_count,
+    Order.created_at,
+)
+
+def get_order_summaries(
+    db: Session,
+    user_id: int,
+    page: int = 1,
+    size: int = 100,
+    status: Optional[OrderStatus] = None
+) -> Tuple[List[Any], int]:
+    """
+    Listagem resumida: uma única consulta, sem carregar itens. O total de
+    registros vem de ``COUNT(*) OVER ()`` na própria página; apenas uma página
+    vazia além da primeira exige uma contagem separada.
+    """
+    total_column = func.count().over().label("total")
+    query = _filter_orders(
+        db.query(*ORDER_SUMMARY_COLUMNS, total_column), user_id, status
+    )
+    skip = (page - 1) * size
+    rows = query.order_by(*LISTING_ORDER).offset(skip).limit(size).all()
+    
+    if rows:
+        total = rows[0].total
+    elif page == 1:
+        total = 0
+    else:
+        total = _filter_orders(db.query(Order), user_id, status).count()
+    return rows, total
+
+def create_order(
+    db: Session,
+    *,
+    user_id: int,
+    obj_in: OrderCreate,
+    commit: bool = True
+) -> Order:
+    """
+    Cria o pedido e reserva o estoque. Com ``commit=False`` a transação fica
+    aberta, para que quem chamou grave mais dados junto (ex: a resposta de
+    uma ``Idempotency-Key``).
+    """
+    # Reserva o estoque de todos os itens em um único comando condicional
+    products = stock.reserve_stock(
+        db,
+        stock.aggregate_quantities(
+            (item.product_id, item.quantity) for item in obj_in.items
+        )
+    )
+    
     # Cria o pedido
     db_order = Order(
         user_id=user_id,
         status=obj_in.status,
-        total_amount=0.0
+        total_amount=0,
+        item_count=0
     )
     db.add(db_order)
     db.flush()  # Para obter o ID do pedido
     
-    total_amount = 0.0
-    
-    # Adiciona os itens do pedido
-    for item in obj_in.items:
-        # Busca o produto
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        if not product:
-            raise ValueError(f"Produto {item.product_id} não encontrado")
-        
-        # Verifica se há estoque suficiente
-        if product.stock < item.quantity:
-            raise ValueError(f"Estoque insuficiente para o produto {product.name}")
-        
-        # Calcula os preços
-        unit_price = product.price
-        total_price = unit_price * item.quantity
-        total_amount += total_price
-        
-        # Cria o item do pedido
-        db_item = OrderItem(
+    # Adiciona os itens do pedido com o preço retornado pela reserva
+    items = [
+        OrderItem(
             order_id=db_order.id,
             product_id=item.product_id,
             quantity=item.quantity,
-            unit_price=unit_price,
-            total_price=total_price
+            unit_price=products[item.product_id][1],
+            total_price=products[item.product_id][1] * item.quantity
         )
-        db.add(db_item)
-        
-        # Atualiza o estoque
-        product.stock -= item.quantity
+        for item in obj_in.items
+    ]
+    db.add_all(items)
+    db.flush()
     
-    # Atualiza o valor total do pedido
-    db_order.total_amount = total_amount
+    # Total (em centavos) e quantidade de itens calculados pelo banco
+    db.execute(
+        update(Order)
+        .where(Order.id == db_order.id)
+        .values(**order_totals(db_order.id))
+        .execution_options(synchronize_session="fetch")
+    )
     
-    db.commit()
+    # Atualiza os agregados de vendas na mesma transação
+    order_stats.record_order(db, db_order, items)
+    
+    if commit:
+        db.commit()
     db.refresh(db_order)
     return db_order
 
@@ -88,16 +199,30 @@ def update_order(
     order_id: int,
     obj_in: OrderUpdate
 ) -> Optional[Order]:
+    """
+    Atualiza o pedido. Mudanças de status passam pela máquina de estados e
+    seus efeitos (agregados, devolução de estoque no cancelamento); uma
+    transição inválida levanta ``ValueError``.
+    """
     db_obj = db.query(Order).filter(Order.id == order_id).first()
     if not db_obj:
         return None
         
     update_data = obj_in.model_dump(exclude_unset=True)
+    status = update_data.pop("status", None)
     
     for field in update_data:
         setattr(db_obj, field, update_data[field])
-    
     db.add(db_obj)
+    
+    if status is not None and status != db_obj.status:
+        result, _ = order_status.transition_orders(
+            db, [(order_id, status)], commit=False
+        )
+        if result.errors:
+            db.rollback()
+            raise ValueError(result.errors[0].error)
+    
     db.commit()
     db.refresh(db_obj)
     return db_obj
@@ -105,13 +230,17 @@ def update_order(
 def delete_order(db: Session, *, order_id: int) -> Optional[Order]:
     order = db.query(Order).filter(Order.id == order_id).first()
     if order:
-        # Restaura o estoque dos produtos
-        for item in order.items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if product:
-                product.stock += item.quantity
-                db.add(product)
+        # Restaura o estoque dos produtos em um único comando (o de pedidos
+        # cancelados já foi devolvido no cancelamento)
+        if order.status != OrderStatus.CANCELLED:
+            stock.release_stock(
+                db,
+                stock.aggregate_quantities(
+                    (item.product_id, item.quantity) for item in order.items
+                )
+            )
         
+        order_stats.record_order(db, order, order.items, sign=-1)
         db.delete(order)
         db.commit()
     return order 
\ No newline at end of file
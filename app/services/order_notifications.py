@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.client import Client
+from app.models.order import Order, OrderStatus
+from app.models.user import User
+from app.services.whatsapp import get_whatsapp_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OrderNotification:
+    order_id: int
+    name: str
+    phone: str
+    status: OrderStatus
+    whatsapp_phone: Optional[str] = None
+
+
+def resolve_notifications(
+    db: Session,
+    order_ids: Sequence[int],
+    status: OrderStatus
+) -> List[OrderNotification]:
+    """
+    Busca em uma consulta os destinatários das notificações de mudança de
+    status. O cliente do pedido é o cadastro com o mesmo email do usuário;
+    pedidos sem cliente ou sem telefone são ignorados.
+    """
+    if not order_ids:
+        return []
+    rows = db.query(Order.id, Client.name, Client.phone, Client.whatsapp_phone).join(
+        User, User.id == Order.user_id
+    ).join(
+        Client, Client.email == User.email
+    ).filter(
+        Order.id.in_(list(order_ids)),
+        Client.phone.isnot(None),
+        Client.phone != ""
+    ).all()
+    return [
+        OrderNotification(
+            order_id=order_id,
+            name=name,
+            phone=phone,
+            status=status,
+            whatsapp_phone=whatsapp_phone
+        )
+        for order_id, name, phone, whatsapp_phone in rows
+    ]
+
+
+async def send_notifications(
+    notifications: Sequence[OrderNotification],
+    concurrency: Optional[int] = None
+) -> int:
+    """
+    Envia as notificações pelo WhatsApp com no máximo ``concurrency`` envios
+    simultâneos. Falhas são registradas no log e não interrompem os demais.
+
+    Retorna a quantidade de mensagens enviadas.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.ORDER_NOTIFICATION_CONCURRENCY)
+
+    async def send(notification: OrderNotification) -> bool:
+        async with semaphore:
+            try:
+                await get_whatsapp_service().send_order_notification(
+                    client=notification,
+                    order_number=str(notification.order_id),
+                    status=notification.status.value
+                )
+                return True
+            except Exception:
+                logger.warning(
+                    "Falha ao notificar o pedido %s", notification.order_id,
+                    exc_info=True
+                )
+                return False
+
+    results = await asyncio.gather(*(send(n) for n in notifications))
+    return sum(results)
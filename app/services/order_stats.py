@@ -0,0 +1,224 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.dialects import get_insert
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.order_stats import (
+    OrderDailyStats,
+    OrderStatusStats,
+    ProductSalesStats
+)
+from app.schemas.order import OrderStats
+
+
+def _increment(
+    db: Session,
+    model: Any,
+    keys: List[str],
+    rows: List[Dict[str, Any]]
+) -> None:
+    """
+    Soma os valores de ``rows`` às linhas agregadas com
+    ``INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col``.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    insert = get_insert(db)
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            column: table.c[column] + stmt.excluded[column]
+            for column in rows[0]
+            if column not in keys
+        }
+    )
+    db.execute(stmt, rows)
+
+
+def _record_sales(
+    db: Session,
+    orders: Iterable[Tuple[Order, Iterable[OrderItem]]],
+    sign: int
+) -> None:
+    """
+    Atualiza os agregados por dia e por produto, que ignoram cancelados.
+    Os valores de todos os pedidos são somados antes de gravar.
+    """
+    per_day: Dict[date, Dict[str, Any]] = {}
+    per_product: Dict[int, Dict[str, Any]] = {}
+    for order, items in orders:
+        day = (order.created_at or datetime.utcnow()).date()
+        row = per_day.setdefault(
+            day, {"day": day, "order_count": 0, "revenue": Decimal(0)}
+        )
+        row["order_count"] += sign
+        row["revenue"] += sign * order.total_amount
+
+        for item in items:
+            row = per_product.setdefault(
+                item.product_id,
+                {"product_id": item.product_id, "quantity": 0, "revenue": Decimal(0)}
+            )
+            row["quantity"] += sign * item.quantity
+            row["revenue"] += sign * item.total_price
+    _increment(db, OrderDailyStats, ["day"], list(per_day.values()))
+    _increment(db, ProductSalesStats, ["product_id"], list(per_product.values()))
+
+
+def _status_row(
+    rows: Dict[str, Dict[str, Any]],
+    status: OrderStatus,
+    total_amount: Decimal,
+    sign: int
+) -> None:
+    value = OrderStatus(status).value
+    row = rows.setdefault(
+        value, {"status": value, "order_count": 0, "revenue": Decimal(0)}
+    )
+    row["order_count"] += sign
+    row["revenue"] += sign * total_amount
+
+
+def record_order(
+    db: Session,
+    order: Order,
+    items: Iterable[OrderItem],
+    sign: int = 1
+) -> None:
+    """
+    Contabiliza (``sign=1``) ou remove (``sign=-1``) um pedido dos agregados.
+    Deve ser chamado na mesma transação que cria ou exclui o pedido.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    _status_row(rows, order.status, order.total_amount, sign)
+    _increment(db, OrderStatusStats, ["status"], list(rows.values()))
+    if order.status != OrderStatus.CANCELLED:
+        _record_sales(db, [(order, items)], sign)
+
+
+def record_status_changes(
+    db: Session,
+    changes: Iterable[Tuple[Order, OrderStatus]],
+    new_status: OrderStatus
+) -> None:
+    """
+    Move os pedidos (com seus status anteriores) para ``new_status`` nos
+    agregados de status e, ao entrar ou sair do status cancelado, ajusta os
+    agregados de vendas. Cada tabela recebe um único comando.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    cancelled: List[Order] = []
+    restored: List[Order] = []
+    for order, old_status in changes:
+        if old_status == new_status:
+            continue
+        _status_row(rows, old_status, order.total_amount, -1)
+        _status_row(rows, new_status, order.total_amount, 1)
+
+        was_cancelled = old_status == OrderStatus.CANCELLED
+        is_cancelled = new_status == OrderStatus.CANCELLED
+        if was_cancelled != is_cancelled:
+            (cancelled if is_cancelled else restored).append(order)
+
+    _increment(db, OrderStatusStats, ["status"], list(rows.values()))
+    _record_sales(db, [(order, order.items) for order in cancelled], -1)
+    _record_sales(db, [(order, order.items) for order in restored], 1)
+
+
+def record_status_change(
+    db: Session,
+    order: Order,
+    old_status: OrderStatus,
+    new_status: OrderStatus
+) -> None:
+    """
+    Versão de ``record_status_changes`` para um único pedido.
+    """
+    record_status_changes(db, [(order, old_status)], new_status)
+
+
+def rebuild_stats(db: Session) -> None:
+    """
+    Recalcula todos os agregados a partir dos pedidos. Útil para a carga
+    inicial ou para corrigir divergências; não é usado no fluxo normal.
+    """
+    db.query(OrderDailyStats).delete()
+    db.query(OrderStatusStats).delete()
+    db.query(ProductSalesStats).delete()
+
+    not_cancelled = Order.status != OrderStatus.CANCELLED
+    day = func.date(Order.created_at)
+    for row in db.execute(
+        select(day, func.count(Order.id), func.sum(Order.total_amount))
+        .where(not_cancelled)
+        .group_by(day)
+    ):
+        db.add(OrderDailyStats(
+            day=row[0] if isinstance(row[0], date) else date.fromisoformat(row[0]),
+            order_count=row[1],
+            revenue=row[2] or 0
+        ))
+
+    for status, count, revenue in db.execute(
+        select(Order.status, func.count(Order.id), func.sum(Order.total_amount))
+        .group_by(Order.status)
+    ):
+        db.add(OrderStatusStats(
+            status=OrderStatus(status).value,
+            order_count=count,
+            revenue=revenue or 0
+        ))
+
+    for product_id, quantity, revenue in db.execute(
+        select(
+            OrderItem.product_id,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.total_price)
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(not_cancelled)
+        .group_by(OrderItem.product_id)
+    ):
+        db.add(ProductSalesStats(
+            product_id=product_id,
+            quantity=quantity,
+            revenue=revenue or 0
+        ))
+
+    db.commit()
+
+
+def get_stats(
+    db: Session,
+    days: int = 30,
+    top: int = 10,
+    today: Optional[date] = None
+) -> OrderStats:
+    """
+    Lê os agregados: faturamento diário dos últimos ``days`` dias, pedidos
+    por status e os ``top`` produtos mais vendidos.
+    """
+    since = (today or datetime.utcnow().date()) - timedelta(days=days - 1)
+    daily = db.query(OrderDailyStats).filter(
+        OrderDailyStats.day >= since
+    ).order_by(OrderDailyStats.day).all()
+    by_status = db.query(OrderStatusStats).filter(
+        OrderStatusStats.order_count > 0
+    ).order_by(OrderStatusStats.status).all()
+    top_products = db.query(ProductSalesStats).filter(
+        ProductSalesStats.quantity > 0
+    ).order_by(
+        ProductSalesStats.quantity.desc(), ProductSalesStats.product_id
+    ).limit(top).all()
+
+    return OrderStats(
+        daily=daily,
+        by_status=by_status,
+        top_products=top_products
+    )
@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from app.models.order import Order, OrderStatus
+from app.schemas.order import OrderStatusBulkError, OrderStatusBulkResult
+from app.services import order_stats, stock
+
+# Etapas do atendimento, na ordem em que acontecem
+STATUS_FLOW = [
+    OrderStatus.PENDING,
+    OrderStatus.CONFIRMED,
+    OrderStatus.PREPARING,
+    OrderStatus.READY,
+    OrderStatus.DELIVERED,
+]
+
+
+def _build_transitions() -> Dict[OrderStatus, FrozenSet[OrderStatus]]:
+    """
+    Um pedido pode avançar para qualquer etapa seguinte (o depósito pode
+    marcar um pedido confirmado diretamente como pronto) e pode ser cancelado
+    enquanto não for entregue. Entregues e cancelados são estados finais.
+    """
+    transitions = {}
+    for position, status in enumerate(STATUS_FLOW):
+        allowed = set(STATUS_FLOW[position + 1:])
+        if status != OrderStatus.DELIVERED:
+            allowed.add(OrderStatus.CANCELLED)
+        transitions[status] = frozenset(allowed)
+    transitions[OrderStatus.CANCELLED] = frozenset()
+    return transitions
+
+
+ALLOWED_TRANSITIONS = _build_transitions()
+
+
+def can_transition(old_status: OrderStatus, new_status: OrderStatus) -> bool:
+    return old_status == new_status or new_status in ALLOWED_TRANSITIONS[old_status]
+
+
+def allowed_sources(new_status: OrderStatus) -> List[OrderStatus]:
+    """
+    Status a partir dos quais é possível chegar em ``new_status``.
+    """
+    return [
+        status for status, targets in ALLOWED_TRANSITIONS.items()
+        if new_status in targets
+    ]
+
+
+def transition_error(old_status: OrderStatus, new_status: OrderStatus) -> str:
+    return (
+        "Transição de status inválida: "
+        f"{OrderStatus(old_status).value} -> {OrderStatus(new_status).value}"
+    )
+
+
+def transition_orders(
+    db: Session,
+    transitions: Sequence[Tuple[int, OrderStatus]],
+    commit: bool = True
+) -> Tuple[OrderStatusBulkResult, Dict[OrderStatus, List[int]]]:
+    """
+    Aplica as transições ``(order_id, status)`` em uma transação. Com
+    ``commit=False`` a transação fica aberta para quem chamou.
+
+    Os pedidos são lidos em uma consulta e validados contra a máquina de
+    estados. Para cada status de destino é executado um único
+    ``UPDATE ... WHERE id IN (...) AND status IN (origens válidas)``; pedidos
+    alterados por outra requisição nesse intervalo não são retornados e
+    viram erro. Os efeitos colaterais também são feitos em lote: agregados,
+    e a devolução do estoque de todos os cancelados em um único comando.
+
+    Retorna o resultado por item e os ids alterados por status de destino.
+    """
+    result = OrderStatusBulkResult(received=len(transitions))
+    requested: Dict[int, OrderStatus] = {}
+    for order_id, status in transitions:
+        if order_id in requested:
+            result.errors.append(OrderStatusBulkError(
+                order_id=order_id,
+                error="Pedido repetido na requisição."
+            ))
+            continue
+        requested[order_id] = OrderStatus(status)
+
+    query = db.query(Order).options(load_only(
+        Order.id, Order.status, Order.total_amount, Order.created_at
+    ))
+    if OrderStatus.CANCELLED in requested.values():
+        # Os itens são necessários para devolver o estoque e ajustar as vendas
+        query = query.options(selectinload(Order.items))
+    orders = {
+        order.id: order
+        for order in query.filter(Order.id.in_(list(requested))).all()
+    } if requested else {}
+
+    groups: Dict[OrderStatus, List[Tuple[Order, OrderStatus]]] = {}
+    for order_id, new_status in requested.items():
+        order = orders.get(order_id)
+        if order is None:
+            result.errors.append(OrderStatusBulkError(
+                order_id=order_id,
+                error="Pedido não encontrado."
+            ))
+        elif order.status == new_status:
+            result.unchanged += 1
+        elif not can_transition(order.status, new_status):
+            result.errors.append(OrderStatusBulkError(
+                order_id=order_id,
+                error=transition_error(order.status, new_status)
+            ))
+        else:
+            groups.setdefault(new_status, []).append((order, order.status))
+
+    changed: Dict[OrderStatus, List[int]] = {}
+    now = datetime.utcnow()
+    for new_status, group in groups.items():
+        ids = [order.id for order, _ in group]
+        stmt = (
+            update(Order)
+            .where(
+                Order.id.in_(ids),
+                Order.status.in_(allowed_sources(new_status))
+            )
+            .values(status=new_status, updated_at=now)
+            .returning(Order.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        updated = set(db.execute(stmt).scalars())
+
+        applied = []
+        for order, old_status in group:
+            if order.id in updated:
+                applied.append((order, old_status))
+            else:
+                result.errors.append(OrderStatusBulkError(
+                    order_id=order.id,
+                    error="O status do pedido foi alterado por outra requisição."
+                ))
+        if not applied:
+            continue
+
+        order_stats.record_status_changes(db, applied, new_status)
+        if new_status == OrderStatus.CANCELLED:
+            stock.release_stock(db, stock.aggregate_quantities(
+                (item.product_id, item.quantity)
+                for order, _ in applied
+                for item in order.items
+            ))
+        changed[new_status] = [order.id for order, _ in applied]
+        result.updated += len(applied)
+
+    if commit:
+        db.commit()
+    result.failed = len(result.errors)
+    result.errors.sort(key=lambda e: e.order_id)
+    return result, changed
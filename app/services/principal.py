@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.token import Token
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Usuário autenticado da requisição, com apenas o necessário para
+    autorização. Não é um objeto ORM: não fica preso à sessão e pode ser
+    mantido em cache.
+    """
+    id: int
+    email: str
+    is_active: bool
+    is_superuser: bool
+
+
+def load_principal(db: Session, token: str) -> Tuple[Optional[Principal], Optional[datetime]]:
+    """
+    Busca, em uma única consulta de colunas, o usuário dono de um token ativo.
+
+    Retorna ``(principal, expiração do token)`` ou ``(None, None)``.
+    """
+    row = db.execute(
+        select(
+            User.id, User.email, User.is_active, User.is_superuser,
+            Token.expires_at
+        )
+        .join(Token, Token.user_id == User.id)
+        .where(
+            Token.token == token,
+            Token.is_active == True,
+            Token.expires_at > datetime.utcnow()
+        )
+    ).first()
+    if row is None:
+        return None, None
+    principal = Principal(
+        id=row.id,
+        email=row.email,
+        is_active=bool(row.is_active),
+        is_superuser=bool(row.is_superuser)
+    )
+    return principal, row.expires_at
+
+
+class PrincipalCache:
+    """
+    Cache LRU, por worker, de token -> ``Principal``. Cada entrada vale por
+    ``ttl`` segundos (e nunca além da expiração do token), o que limita por
+    quanto tempo outro worker pode aceitar um token revogado. Revogações
+    feitas neste worker removem as entradas na hora. ``ttl=0`` desativa.
+    Parâmetros omitidos vêm das configurações ``AUTH_PRINCIPAL_CACHE_*``.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None) -> None:
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        return settings.AUTH_PRINCIPAL_CACHE_TTL if self._ttl is None else self._ttl
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is None:
+            return settings.AUTH_PRINCIPAL_CACHE_SIZE
+        return self._max_size
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            principal, valid_until = entry
+            if valid_until <= time.monotonic():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def set(self, token: str, principal: Principal, expires_at: datetime) -> None:
+        if self.ttl <= 0:
+            return
+        remaining = (expires_at - datetime.utcnow()).total_seconds()
+        valid_until = time.monotonic() + min(self.ttl, remaining)
+        with self._lock:
+            self._entries[token] = (principal, valid_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._entries = OrderedDict(
+                (token, entry) for token, entry in self._entries.items()
+                if entry[0].id != user_id
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def get_principal(db: Session, token: str) -> Optional[Principal]:
+    """
+    ``Principal`` do token, do cache ou do banco.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    principal, expires_at = load_principal(db, token)
+    if principal is not None:
+        principal_cache.set(token, principal, expires_at)
+    return principal
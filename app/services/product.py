@@ -1,55 +1,154 @@
-from typing import List, Optional, Tuple, Union, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from datetime import datetime
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, Dict, Any
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import insert, or_, select, update
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
+from app.core.single_flight import SingleFlight
 from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.schemas.product import (
+    ProductBulkError,
+    ProductBulkItem,
+    ProductBulkResult,
+    ProductCreate,
+    ProductUpdate
+)
+from app.services.bulk import format_validation_error
 
-def get_product(db: Session, product_id: int) -> Optional[Product]:
+def _apply_fields(query, fields: Optional[Sequence[str]]):
+    """
+    Restringe a projeção SQL às colunas solicitadas.
+    """
+    if fields:
+        query = query.options(load_only(*[getattr(Product, f) for f in fields]))
+    return query
+
+def get_product(
+    db: Session,
+    product_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Product]:
     try:
-        return db.query(Product).filter(Product.id == product_id).first()
+        query = _apply_fields(db.query(Product), fields)
+        return query.filter(Product.id == product_id).first()
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _filter_products(query, search: Optional[str], category: Optional[str]):
+    if search:
+        search = f"%{search}%"
+        query = query.filter(
+            or_(
+                Product.name.ilike(search),
+                Product.description.ilike(search)
+            )
+        )
+    
+    if category:
+        query = query.filter(Product.category == category)
+    return query
+
+def iter_products(
+    db: Session,
+    search: Optional[str] = None,
+    category: Optional[str] = None,
+    batch_size: Optional[int] = None
+) -> Iterator[Product]:
+    """
+    Percorre todos os produtos que atendem aos filtros com um cursor no
+    servidor, mantendo em memória apenas ``batch_size`` registros por vez.
+    """
+    query = _filter_products(db.query(Product), search, category)
+    return query.order_by(Product.id).execution_options(
+        stream_results=True
+    ).yield_per(batch_size or settings.EXPORT_BATCH_SIZE)
+
 def get_products(
     db: Session,
     page: int = 1,
     size: int = 100,
     search: Optional[str] = None,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> Tuple[List[Product], int]:
     """
     Retorna uma tupla contendo a lista de produtos e o total de registros.
     """
     try:
-        query = db.query(Product)
-        
-        if search:
-            search = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(search),
-                    Product.description.ilike(search)
-                )
-            )
-        
-        if category:
-            query = query.filter(Product.category == category)
+        query = _filter_products(db.query(Product), search, category)
         
         # Conta o total de registros
         total = query.count()
         
         # Aplica paginação
         skip = (page - 1) * size
-        products = query.offset(skip).limit(size).all()
+        products = _apply_fields(query, fields).offset(skip).limit(size).all()
         
         return products, total
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+# Leituras de produtos em andamento no worker, compartilhadas entre
+# requisições idênticas simultâneas (ex.: o mesmo produto em promoção)
+product_reads = SingleFlight()
+
+def _coalesce(db: Session, key: Tuple[Any, ...], load: Callable[[], Any]) -> Any:
+    """
+    Executa ``load`` compartilhando o resultado com requisições idênticas em
+    andamento. Apenas sessões marcadas por ``get_read_db`` participam, e a
+    chave inclui o engine, para que leituras do primário e de réplicas não
+    se misturem.
+    """
+    if not settings.PRODUCT_READ_COALESCING or not db.info.get("coalesce_reads"):
+        return load()
+    result, _ = product_reads.do(
+        (db.get_bind(), *key), load, timeout=settings.READ_COALESCING_TIMEOUT
+    )
+    return result
+
+def get_product_coalesced(
+    db: Session,
+    product_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Product]:
+    """
+    ``get_product`` para endpoints somente leitura. O produto retornado é
+    desanexado da sessão, pois pode ser entregue a outras requisições.
+    """
+    def load() -> Optional[Product]:
+        product = get_product(db, product_id, fields)
+        if product is not None:
+            db.expunge(product)
+        return product
+
+    return _coalesce(db, ("product", product_id, tuple(fields or ())), load)
+
+def get_products_coalesced(
+    db: Session,
+    page: int = 1,
+    size: int = 100,
+    search: Optional[str] = None,
+    category: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Tuple[List[Product], int]:
+    """
+    ``get_products`` para endpoints somente leitura, com os produtos
+    desanexados da sessão.
+    """
+    def load() -> Tuple[List[Product], int]:
+        products, total = get_products(db, page, size, search, category, fields)
+        for product in products:
+            db.expunge(product)
+        return products, total
+
+    key = ("products", page, size, search, category, tuple(fields or ()))
+    return _coalesce(db, key, load)
+
 def create_product(db: Session, obj_in: ProductCreate, **kwargs) -> Product:
     try:
         db_obj = Product(
@@ -120,4 +219,140 @@ def delete_product(db: Session, product_id: int) -> Product:
         raise
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+def _apply_product_batch(
+    db: Session,
+    batch: List[Tuple[int, Any]],
+    result: ProductBulkResult
+) -> None:
+    """
+    Aplica um lote de criações e atualizações sem confirmar a transação.
+    """
+    now = datetime.utcnow()
+    creates: List[Dict[str, Any]] = []
+    # id -> (índice do último item, campos acumulados)
+    updates: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+
+    for index, record in batch:
+        try:
+            item = ProductBulkItem.model_validate(record)
+            fields = item.model_dump(exclude={"id"}, exclude_unset=True)
+            if item.id is None:
+                product_in = ProductCreate(**fields)
+                creates.append({
+                    **product_in.model_dump(),
+                    "created_at": now,
+                    "updated_at": now
+                })
+                continue
+        except ValidationError as e:
+            result.errors.append(
+                ProductBulkError(index=index, error=format_validation_error(e))
+            )
+            continue
+
+        if not fields:
+            result.errors.append(
+                ProductBulkError(index=index, error="Nenhum campo para atualizar")
+            )
+            continue
+        previous = updates.get(item.id, (index, {}))[1]
+        updates[item.id] = (index, {**previous, **fields})
+
+    if updates:
+        existing = set(db.scalars(
+            select(Product.id).where(Product.id.in_(list(updates)))
+        ))
+        # Agrupa pelas colunas alteradas: um UPDATE em executemany por grupo
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for product_id, (index, fields) in updates.items():
+            if product_id not in existing:
+                result.errors.append(ProductBulkError(
+                    index=index,
+                    error=f"Produto {product_id} não encontrado"
+                ))
+                continue
+            row = {"id": product_id, **fields, "updated_at": now}
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        for rows in groups.values():
+            db.execute(update(Product), rows)
+            result.updated += len(rows)
+
+    if creates:
+        db.execute(insert(Product), creates)
+        result.created += len(creates)
+
+def _finish_bulk_result(result: ProductBulkResult) -> ProductBulkResult:
+    result.failed = len(result.errors)
+    result.errors.sort(key=lambda e: e.index)
+    return result
+
+def bulk_upsert_products(
+    db: Session,
+    records: Iterable[Tuple[int, Any]],
+    batch_size: Optional[int] = None
+) -> ProductBulkResult:
+    """
+    Sincroniza produtos em lote, em uma única transação.
+
+    ``records`` são tuplas (índice, item). Itens com ``id`` atualizam os campos
+    enviados; itens sem ``id`` são criados. Itens inválidos ou inexistentes
+    são reportados no resultado sem abortar a sincronização.
+    """
+    batch_size = batch_size or settings.PRODUCT_BULK_BATCH_SIZE
+    result = ProductBulkResult()
+    try:
+        batch: List[Tuple[int, Any]] = []
+        for index, record in records:
+            result.received += 1
+            batch.append((index, record))
+            if len(batch) >= batch_size:
+                _apply_product_batch(db, batch, result)
+                batch = []
+        if batch:
+            _apply_product_batch(db, batch, result)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return _finish_bulk_result(result)
+
+async def bulk_upsert_products_stream(
+    db: Session,
+    records: AsyncIterator[Tuple[int, Any]],
+    batch_size: Optional[int] = None
+) -> ProductBulkResult:
+    """
+    Como ``bulk_upsert_products``, mas consome os itens à medida que o corpo
+    chega: cada lote é aplicado no threadpool enquanto o restante ainda está
+    sendo recebido, sem acumular a requisição inteira em memória. Tudo
+    continua em uma única transação.
+
+    Um ``ValueError`` de ``records`` (linha inválida) desfaz o que foi
+    aplicado e é propagado.
+    """
+    batch_size = batch_size or settings.PRODUCT_BULK_BATCH_SIZE
+    result = ProductBulkResult()
+    try:
+        batch: List[Tuple[int, Any]] = []
+        async for index, record in records:
+            result.received += 1
+            batch.append((index, record))
+            if len(batch) >= batch_size:
+                await run_in_threadpool(_apply_product_batch, db, batch, result)
+                batch = []
+        if batch:
+            await run_in_threadpool(_apply_product_batch, db, batch, result)
+        await run_in_threadpool(db.commit)
+    except ValueError:
+        await run_in_threadpool(db.rollback)
+        raise
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return _finish_bulk_result(result)
+
@@ -0,0 +1,91 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+
+
+def aggregate_quantities(items: Iterable[Tuple[int, int]]) -> Dict[int, int]:
+    """
+    Soma as quantidades por produto, preservando a ordem em que cada produto
+    aparece pela primeira vez.
+    """
+    quantities: Dict[int, int] = {}
+    for product_id, quantity in items:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    return quantities
+
+
+def _quantity_case(quantities: Dict[int, int]):
+    return case(quantities, value=Product.id)
+
+
+def reserve_stock(
+    db: Session,
+    quantities: Dict[int, int]
+) -> Dict[int, Tuple[str, Decimal]]:
+    """
+    Reserva o estoque de todos os produtos em um único comando:
+
+        UPDATE products SET stock = stock - :q
+        WHERE id IN (...) AND stock >= :q
+        RETURNING id, name, price
+
+    A condição ``stock >= :q`` é avaliada pelo banco na mesma linha que é
+    decrementada, então reservas concorrentes não conseguem vender além do
+    estoque. Se alguma linha não for retornada, a transação é desfeita e o
+    erro do primeiro produto sem estoque (ou inexistente) é levantado como
+    ``ValueError``.
+
+    Retorna ``{product_id: (name, price)}`` dos produtos reservados.
+    """
+    if not quantities:
+        return {}
+
+    quantity = _quantity_case(quantities)
+    stmt = (
+        update(Product)
+        .where(Product.id.in_(list(quantities)), Product.stock >= quantity)
+        .values(stock=Product.stock - quantity)
+        .returning(Product.id, Product.name, Product.price)
+        .execution_options(synchronize_session="fetch")
+    )
+    reserved = {
+        product_id: (name, price)
+        for product_id, name, price in db.execute(stmt)
+    }
+    if len(reserved) == len(quantities):
+        return reserved
+
+    db.rollback()
+    missing = [product_id for product_id in quantities if product_id not in reserved]
+    names = dict(
+        db.query(Product.id, Product.name).filter(Product.id.in_(missing)).all()
+    )
+    product_id = missing[0]
+    if product_id not in names:
+        raise ValueError(f"Produto {product_id} não encontrado")
+    raise ValueError(f"Estoque insuficiente para o produto {names[product_id]}")
+
+
+def release_stock(db: Session, quantities: Dict[int, int]) -> List[int]:
+    """
+    Devolve ao estoque as quantidades informadas com um único ``UPDATE``.
+    Produtos que não existem mais são ignorados.
+
+    Retorna os ids dos produtos atualizados.
+    """
+    if not quantities:
+        return []
+
+    quantity = _quantity_case(quantities)
+    stmt = (
+        update(Product)
+        .where(Product.id.in_(list(quantities)))
+        .values(stock=Product.stock + quantity)
+        .returning(Product.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    return list(db.execute(stmt).scalars())
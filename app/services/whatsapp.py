@@ -1,19 +1,271 @@
-import httpx
-from typing import Optional, Dict, Any
+import asyncio
+import json
+import math
+import random
+from decimal import Decimal
+from functools import lru_cache
+
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any
 from fastapi import HTTPException, status
 
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.core.config import settings
+from app.core.phone import normalize_phone
 from app.models.client import Client
 
+if TYPE_CHECKING:  # httpx é importado apenas ao enviar a primeira mensagem
+    import httpx
+
+# Respostas do Graph API que valem uma nova tentativa
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Textos das notificações; {frontend_url} é preenchido uma vez por serviço
+ORDER_TEMPLATE = (
+    "Olá {name}! Seu pedido #{order_number} foi atualizado.\n"
+    "Status atual: {status}\n"
+    "Acompanhe seu pedido em: {frontend_url}/orders/{order_number}"
+)
+PAYMENT_TEMPLATE = (
+    "Olá {name}! Recebemos seu pagamento.\n"
+    "Pedido: #{order_number}\n"
+    "Valor: R$ {amount:.2f}\n"
+    "Método: {payment_method}\n"
+    "Obrigado pela preferência!"
+)
+SHIPPING_TEMPLATE = (
+    "Olá {name}! Seu pedido #{order_number} foi enviado.\n"
+    "Transportadora: {carrier}\n"
+    "Código de rastreio: {tracking_code}\n"
+    "Acompanhe seu pedido em: {frontend_url}/orders/{order_number}"
+)
+PROMOTION_TEMPLATE = (
+    "Olá {name}! Temos uma promoção especial para você!\n"
+    "Promoção: {promotion_title}\n"
+    "{promotion_description}\n"
+    "Válido até: {valid_until}\n"
+    "Acesse: {frontend_url}/promotions"
+)
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+# Partes fixas do JSON enviado; apenas o destinatário e o texto variam
+_PAYLOAD_START = b'{"messaging_product":"whatsapp","to":"'
+_TEXT_BODY = b'","type":"text","text":{"body":'
+_TEMPLATE_BODY = b'","type":"template","template":'
+
+
+def compile_template(template: str, **constants: str) -> Callable[..., str]:
+    """
+    Preenche os campos constantes (ex.: ``frontend_url``) de um texto e
+    retorna o ``format`` do resultado, que recebe apenas os campos variáveis.
+    """
+    for name, value in constants.items():
+        escaped = value.replace("{", "{{").replace("}", "}}")
+        template = template.replace("{" + name + "}", escaped)
+    return template.format
+
+
+def text_payload(to: str, message: str) -> bytes:
+    """
+    Corpo JSON de uma mensagem de texto para ``to`` (já normalizado).
+    """
+    return b"".join((
+        _PAYLOAD_START, to.encode(), _TEXT_BODY, _encode(message).encode(), b"}}"
+    ))
+
+
+@lru_cache(maxsize=256)
+def _template_header(template_name: str) -> bytes:
+    # Objeto "template" sem a chave de fechamento, para anexar os parâmetros
+    return _encode({"name": template_name, "language": {"code": "pt_BR"}})[:-1].encode()
+
+
+def template_payload(
+    to: str,
+    template_name: str,
+    template_params: Optional[Dict[str, Any]] = None
+) -> bytes:
+    """
+    Corpo JSON de uma mensagem de template para ``to`` (já normalizado).
+    """
+    parts = [_PAYLOAD_START, to.encode(), _TEMPLATE_BODY, _template_header(template_name)]
+    if template_params:
+        components = [{
+            "type": "body",
+            "parameters": [
+                {"type": "text", "text": value}
+                for value in template_params.values()
+            ]
+        }]
+        parts += (b',"components":', _encode(components).encode())
+    parts.append(b"}}")
+    return b"".join(parts)
+
+
 class WhatsAppService:
-    def __init__(self):
+    def __init__(self, transport: Optional["httpx.AsyncBaseTransport"] = None):
         self.base_url = settings.WHATSAPP_API_URL
         self.token = settings.WHATSAPP_API_TOKEN
         self.phone_number_id = settings.WHATSAPP_PHONE_NUMBER_ID
+        self.messages_url = f"{self.base_url}/{self.phone_number_id}/messages"
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
+        frontend_url = settings.FRONTEND_URL
+        self._order_message = compile_template(ORDER_TEMPLATE, frontend_url=frontend_url)
+        self._payment_message = compile_template(PAYMENT_TEMPLATE)
+        self._shipping_message = compile_template(SHIPPING_TEMPLATE, frontend_url=frontend_url)
+        self._promotion_message = compile_template(PROMOTION_TEMPLATE, frontend_url=frontend_url)
+        self.connect_timeout = settings.WHATSAPP_CONNECT_TIMEOUT
+        self.read_timeout = settings.WHATSAPP_READ_TIMEOUT
+        self.max_retries = settings.WHATSAPP_MAX_RETRIES
+        self.retry_backoff = settings.WHATSAPP_RETRY_BACKOFF
+        self.retry_backoff_max = settings.WHATSAPP_RETRY_BACKOFF_MAX
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.WHATSAPP_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.WHATSAPP_CIRCUIT_RESET_TIMEOUT
+        )
+        self.metrics = {"requests": 0, "retries": 0, "timeouts": 0}
+        # Transporte alternativo do httpx (ex.: httpx.MockTransport nos testes)
+        self.transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._started = False
+
+    async def startup(self) -> None:
+        """
+        Habilita o cliente HTTP compartilhado, que reaproveita conexões entre
+        envios. O cliente é criado no primeiro envio, e não na inicialização.
+        """
+        self._started = True
+
+    async def shutdown(self) -> None:
+        """
+        Fecha o cliente HTTP compartilhado.
+        """
+        self._started = False
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _timeout(self) -> "httpx.Timeout":
+        import httpx
+
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    async def _request(self, url: str, payload: bytes) -> "httpx.Response":
+        import httpx
+
+        if self._started and self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers, timeout=self._timeout(), transport=self.transport
+            )
+        if self._client is not None:
+            return await self._client.post(url, content=payload)
+        # Fora do ciclo de vida da aplicação (scripts, testes)
+        async with httpx.AsyncClient(timeout=self._timeout(), transport=self.transport) as client:
+            return await client.post(url, content=payload, headers=self.headers)
+
+    def _backoff(self, attempt: int, response: Optional["httpx.Response"]) -> float:
+        """
+        Espera antes da nova tentativa: backoff exponencial com jitter
+        completo, respeitando o ``Retry-After`` do upstream até o limite.
+        """
+        delay = random.uniform(0, min(self.retry_backoff_max, self.retry_backoff * 2 ** attempt))
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.retry_backoff_max))
+        return delay
+
+    async def _post(self, url: str, payload: bytes) -> "httpx.Response":
+        """
+        Envia ``payload`` ao Graph API. Falhas de conexão e os status em
+        ``RETRYABLE_STATUS`` são repetidos até ``max_retries`` vezes; tempos
+        esgotados na leitura não, pois a mensagem pode ter sido entregue.
+        Cada falha conta para o disjuntor, que recusa os envios com ``503``
+        enquanto estiver aberto.
+        """
+        import httpx
+
+        if not self.token or not self.phone_number_id:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Integração com o WhatsApp não configurada"
+            )
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="WhatsApp indisponível no momento",
+                    headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+                )
+            self.metrics["requests"] += 1
+            response: Optional[httpx.Response] = None
+            try:
+                response = await self._request(url, payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                # A requisição não chegou ao upstream: pode ser repetida
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if isinstance(e, httpx.TimeoutException):
+                    self.metrics["timeouts"] += 1
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    return response
+            self.metrics["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    async def _send(self, payload: bytes) -> Dict[str, Any]:
+        import httpx
+
+        try:
+            response = await self._post(self.messages_url, payload)
+            response.raise_for_status()
+            return response.json()
+        except httpx.TimeoutException as e:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Tempo esgotado ao enviar mensagem WhatsApp: {str(e)}"
+            )
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erro ao enviar mensagem WhatsApp: {str(e)}"
+            )
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Estado do disjuntor e contadores de envios, repetições e tempos
+        esgotados do worker.
+        """
+        return {"circuit": self.breaker.status(), **self.metrics}
+
+    @staticmethod
+    def _recipient(phone: Optional[str]) -> str:
+        to = normalize_phone(phone)
+        if to is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Telefone do cliente inválido"
+            )
+        return to
+
+    async def _send_text(self, client: Any, message: str) -> Dict[str, Any]:
+        # Clientes gravados já trazem o telefone normalizado
+        to = getattr(client, "whatsapp_phone", None) or self._recipient(client.phone)
+        return await self._send(text_payload(to, message))
 
     async def send_message(
         self,
@@ -31,96 +283,38 @@ class WhatsAppService:
             template_name: Nome do template a ser usado (opcional)
             template_params: Parâmetros do template (opcional)
         """
-        try:
-            url = f"{self.base_url}/{self.phone_number_id}/messages"
-            
-            # Remove caracteres não numéricos do número
-            to = ''.join(filter(str.isdigit, to))
-            
-            # Adiciona o código do país se não estiver presente
-            if not to.startswith('55'):
-                to = f"55{to}"
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "to": to,
-                "type": "text",
-                "text": {"body": message}
-            }
-            
-            # Se um template for especificado, usa o template ao invés da mensagem simples
-            if template_name:
-                payload = {
-                    "messaging_product": "whatsapp",
-                    "to": to,
-                    "type": "template",
-                    "template": {
-                        "name": template_name,
-                        "language": {
-                            "code": "pt_BR"
-                        }
-                    }
-                }
-                
-                if template_params:
-                    payload["template"]["components"] = [
-                        {
-                            "type": "body",
-                            "parameters": [
-                                {"type": "text", "text": value}
-                                for value in template_params.values()
-                            ]
-                        }
-                    ]
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-                
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Erro ao enviar mensagem WhatsApp: {str(e)}"
-            )
+        to = self._recipient(to)
+        # Se um template for especificado, usa o template ao invés da mensagem simples
+        if template_name:
+            return await self._send(template_payload(to, template_name, template_params))
+        return await self._send(text_payload(to, message))
 
     async def send_order_notification(self, client: Client, order_number: str, status: str) -> Dict[str, Any]:
         """
         Envia uma notificação sobre o status do pedido para o cliente.
         """
-        message = (
-            f"Olá {client.name}! Seu pedido #{order_number} foi atualizado.\n"
-            f"Status atual: {status}\n"
-            f"Acompanhe seu pedido em: {settings.FRONTEND_URL}/orders/{order_number}"
-        )
-        
-        return await self.send_message(
-            to=client.phone,
-            message=message
+        message = self._order_message(
+            name=client.name, order_number=order_number, status=status
         )
+        return await self._send_text(client, message)
 
     async def send_payment_notification(
         self,
         client: Client,
         order_number: str,
-        amount: float,
+        amount: Decimal,
         payment_method: str
     ) -> Dict[str, Any]:
         """
         Envia uma notificação sobre o pagamento do pedido.
         """
-        message = (
-            f"Olá {client.name}! Recebemos seu pagamento.\n"
-            f"Pedido: #{order_number}\n"
-            f"Valor: R$ {amount:.2f}\n"
-            f"Método: {payment_method}\n"
-            f"Obrigado pela preferência!"
-        )
-        
-        return await self.send_message(
-            to=client.phone,
-            message=message
+        message = self._payment_message(
+            name=client.name,
+            order_number=order_number,
+            amount=amount,
+            payment_method=payment_method
         )
+        return await self._send_text(client, message)
 
     async def send_shipping_notification(
         self,
@@ -132,17 +326,13 @@ class WhatsAppService:
         """
         Envia uma notificação sobre o envio do pedido.
         """
-        message = (
-            f"Olá {client.name}! Seu pedido #{order_number} foi enviado.\n"
-            f"Transportadora: {carrier}\n"
-            f"Código de rastreio: {tracking_code}\n"
-            f"Acompanhe seu pedido em: {settings.FRONTEND_URL}/orders/{order_number}"
-        )
-        
-        return await self.send_message(
-            to=client.phone,
-            message=message
+        message = self._shipping_message(
+            name=client.name,
+            order_number=order_number,
+            tracking_code=tracking_code,
+            carrier=carrier
         )
+        return await self._send_text(client, message)
 
     async def send_promotion_notification(
         self,
@@ -154,18 +344,29 @@ class WhatsAppService:
         """
         Envia uma notificação sobre uma promoção.
         """
-        message = (
-            f"Olá {client.name}! Temos uma promoção especial para você!\n"
-            f"Promoção: {promotion_title}\n"
-            f"{promotion_description}\n"
-            f"Válido até: {valid_until}\n"
-            f"Acesse: {settings.FRONTEND_URL}/promotions"
-        )
-        
-        return await self.send_message(
-            to=client.phone,
-            message=message
+        message = self._promotion_message(
+            name=client.name,
+            promotion_title=promotion_title,
+            promotion_description=promotion_description,
+            valid_until=valid_until
         )
+        return await self._send_text(client, message)
+
+_whatsapp_service: Optional[WhatsAppService] = None
+
+
+def get_whatsapp_service() -> WhatsAppService:
+    """
+    Instância do serviço no worker, criada no primeiro uso.
+    """
+    global _whatsapp_service
+    if _whatsapp_service is None:
+        _whatsapp_service = WhatsAppService()
+    return _whatsapp_service
+
 
-# Instância global do serviço
-whatsapp_service = WhatsAppService() 
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    # Compatibilidade com ``from app.services.whatsapp import whatsapp_service``
+    if name == "whatsapp_service":
+        return get_whatsapp_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.dialects import get_insert
+from app.models.whatsapp import WhatsAppMessageStatus
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_PREFIX = "sha256="
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Confere o cabeçalho ``X-Hub-Signature-256`` (HMAC-SHA256 do corpo com o
+    segredo do aplicativo) em tempo constante.
+    """
+    if not signature or not signature.startswith(SIGNATURE_PREFIX):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len(SIGNATURE_PREFIX):])
+
+
+def parse_statuses(payload: Any) -> List[Dict[str, Any]]:
+    """
+    Extrai as linhas de ``whatsapp_message_statuses`` de uma notificação do
+    webhook, que agrupa vários status em ``entry[].changes[].value.statuses[]``.
+    Mensagens recebidas e status incompletos são ignorados.
+    """
+    rows: List[Dict[str, Any]] = []
+    if not isinstance(payload, dict):
+        return rows
+    for entry in payload.get("entry") or []:
+        for change in entry.get("changes") or []:
+            value = change.get("value") or {}
+            for item in value.get("statuses") or []:
+                try:
+                    timestamp = datetime.utcfromtimestamp(int(item["timestamp"]))
+                    message_id = str(item["id"])
+                    status = str(item["status"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                errors = item.get("errors") or [{}]
+                rows.append({
+                    "message_id": message_id,
+                    "status": status,
+                    "recipient_id": item.get("recipient_id"),
+                    "conversation_id": (item.get("conversation") or {}).get("id"),
+                    "error_code": errors[0].get("code"),
+                    "error_title": errors[0].get("title"),
+                    "timestamp": timestamp,
+                })
+    return rows
+
+
+def insert_statuses(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Grava os status em um único ``INSERT`` multi-linhas; status já recebidos
+    (reenvios do webhook) são ignorados.
+    """
+    received_at = datetime.utcnow()
+    rows = [{**row, "received_at": received_at} for row in rows]
+    insert = get_insert(db)
+    stmt = insert(WhatsAppMessageStatus.__table__).on_conflict_do_nothing(
+        index_elements=["message_id", "status"]
+    )
+    db.execute(stmt, rows)
+    db.commit()
+
+
+class StatusBuffer:
+    """
+    Acumula os status recebidos pelo webhook e os grava em lote, a cada
+    ``flush_interval_ms`` ou ao juntar ``flush_size`` status, em vez de uma
+    transação por evento. Em uma rajada de recibos (campanhas), o webhook
+    responde sem esperar o banco.
+
+    Fora do ciclo de vida da aplicação (scripts, testes sem ``startup``) cada
+    chamada a ``add`` grava na hora. Se a gravação falhar, os status voltam
+    para o buffer, limitado a ``max_pending`` (os mais antigos são
+    descartados). Parâmetros omitidos vêm das configurações
+    ``WHATSAPP_STATUS_*``.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: Optional[int] = None,
+        flush_size: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ) -> None:
+        self._flush_interval_ms = flush_interval_ms
+        self._flush_size = flush_size
+        self._max_pending = max_pending
+        self.session_factory = session_factory
+        self.flushes = 0
+        self._rows: List[Dict[str, Any]] = []
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def flush_interval_ms(self) -> int:
+        if self._flush_interval_ms is None:
+            return settings.WHATSAPP_STATUS_FLUSH_INTERVAL_MS
+        return self._flush_interval_ms
+
+    @property
+    def flush_size(self) -> int:
+        if self._flush_size is None:
+            return settings.WHATSAPP_STATUS_FLUSH_SIZE
+        return self._flush_size
+
+    @property
+    def max_pending(self) -> int:
+        if self._max_pending is None:
+            return settings.WHATSAPP_STATUS_MAX_PENDING
+        return self._max_pending
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Interrompe as gravações periódicas e grava o que estiver pendente.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_ms / 1000)
+            await self.flush()
+
+    async def add(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        self._rows.extend(rows)
+        if self._task is None or len(self._rows) >= self.flush_size:
+            await self.flush()
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            insert_statuses(db, rows)
+        finally:
+            db.close()
+
+    async def flush(self) -> int:
+        """
+        Grava os status pendentes. Retorna a quantidade gravada.
+        """
+        rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            await run_in_threadpool(self._write, rows)
+        except Exception:
+            logger.exception("Falha ao gravar %s status do WhatsApp", len(rows))
+            self._rows[:0] = rows
+            overflow = len(self._rows) - self.max_pending
+            if overflow > 0:
+                del self._rows[:overflow]
+                logger.error("%s status do WhatsApp descartados", overflow)
+            return 0
+        self.flushes += 1
+        return len(rows)
+
+
+status_buffer = StatusBuffer()
@@ -0,0 +1,111 @@
+"""
+Benchmark de compressão das respostas.
+
+Gera payloads semelhantes às listagens paginadas da API (produtos com
+descrição e pedidos com itens) e mede, para cada codificação e nível, o
+tamanho resultante e o tempo de compressão por resposta.
+
+Uso:
+    poetry run python -m benchmarks.bench_compression
+"""
+import json
+import time
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from app.core.compression import brotli
+
+ITERATIONS = 200
+
+
+def build_products_page(size: int = 100) -> bytes:
+    now = datetime.utcnow().isoformat()
+    items = [
+        {
+            "id": i,
+            "name": f"Produto {i}",
+            "description": f"Descrição detalhada do produto {i}. " * 8,
+            "price": 99.9 + i,
+            "stock": i % 50,
+            "category": f"categoria-{i % 7}",
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(size)
+    ]
+    return json.dumps({"items": items, "metadata": {"total": size}}).encode()
+
+
+def build_orders_page(size: int = 100) -> bytes:
+    now = datetime.utcnow().isoformat()
+    items = [
+        {
+            "id": i,
+            "user_id": 1,
+            "status": "pending",
+            "total_amount": 199.8,
+            "created_at": now,
+            "updated_at": now,
+            "items": [
+                {
+                    "id": i * 10 + j,
+                    "order_id": i,
+                    "product_id": j,
+                    "quantity": 2,
+                    "unit_price": 99.9,
+                    "total_price": 199.8,
+                }
+                for j in range(5)
+            ],
+        }
+        for i in range(size)
+    ]
+    return json.dumps({"items": items, "metadata": {"total": size}}).encode()
+
+
+def compressors() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    result: List[Tuple[str, Callable[[bytes], bytes]]] = []
+    for level in (1, 6, 9):
+        result.append((
+            f"gzip-{level}",
+            lambda data, level=level: zlib.compress(data, level)
+        ))
+    if brotli is not None:
+        for quality in (1, 4, 11):
+            result.append((
+                f"br-{quality}",
+                lambda data, quality=quality: brotli.compress(data, quality=quality)
+            ))
+    return result
+
+
+def run() -> Dict[str, Dict[str, Tuple[int, float]]]:
+    payloads = {
+        "products": build_products_page(),
+        "orders": build_orders_page(),
+    }
+    results: Dict[str, Dict[str, Tuple[int, float]]] = {}
+    for payload_name, payload in payloads.items():
+        results[payload_name] = {"identity": (len(payload), 0.0)}
+        for name, compress in compressors():
+            start = time.perf_counter()
+            for _ in range(ITERATIONS):
+                compressed = compress(payload)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / ITERATIONS
+            results[payload_name][name] = (len(compressed), elapsed_ms)
+    return results
+
+
+def main() -> None:
+    for payload_name, rows in run().items():
+        original = rows["identity"][0]
+        print(f"\n{payload_name} ({original} bytes)")
+        print(f"{'codificação':<12}{'bytes':>10}{'razão':>8}{'ms/resp':>10}")
+        for name, (size, elapsed_ms) in rows.items():
+            print(f"{name:<12}{size:>10}{size / original:>8.2f}{elapsed_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark de inicialização.
+
+Mede, em processos Python novos (sem cache de módulos), o tempo para
+importar os modelos, para importar ``app.main`` e até a primeira resposta
+(inicialização do ciclo de vida + ``GET /health/live``). Também verifica que
+importar os modelos não lê as configurações nem cria o engine.
+
+Uso:
+    poetry run python -m benchmarks.bench_startup [execuções]
+"""
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+RUNS = 5
+
+# Executado em um processo novo a cada medição
+_CHILD = """
+import json, time
+start = time.perf_counter()
+import app.models.order, app.models.user
+models = time.perf_counter()
+
+from app.core.config import get_settings
+import app.db.base as base
+side_effects = {
+    "settings_loaded": get_settings.cache_info().currsize > 0,
+    "engine_created": base._engine is not None,
+}
+
+import app.main
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/health/live")
+    first_request = time.perf_counter()
+
+print(json.dumps({
+    "import_models_ms": (models - start) * 1000,
+    "import_main_ms": (imported - start) * 1000,
+    "first_request_ms": (first_request - start) * 1000,
+    **side_effects,
+}))
+"""
+
+
+def measure() -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(runs: int = RUNS) -> List[Dict[str, float]]:
+    return [measure() for _ in range(runs)]
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    results = run(runs)
+    print(f"{'etapa':<20}{'mediana ms':>12}{'mínimo ms':>12}")
+    for key in ("import_models_ms", "import_main_ms", "first_request_ms"):
+        values = [result[key] for result in results]
+        print(f"{key:<20}{statistics.median(values):>12.1f}{min(values):>12.1f}")
+    first = results[0]
+    print(f"\nconfigurações lidas ao importar os modelos: {first['settings_loaded']}")
+    print(f"engine criado ao importar os modelos: {first['engine_created']}")
+
+
+if __name__ == "__main__":
+    main()
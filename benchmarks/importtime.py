@@ -0,0 +1,123 @@
+"""
+Relatório de tempo de importação.
+
+Executa ``python -X importtime -c "import <módulo>"`` em um processo novo e
+monta a árvore de importações, com o tempo próprio e o acumulado de cada
+módulo. Mostra os ramos mais caros e os módulos que mais pesam sozinhos.
+
+Uso:
+    poetry run python -m benchmarks.importtime [módulo] [limite_ms]
+"""
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+DEFAULT_MODULE = "app.main"
+DEFAULT_THRESHOLD_MS = 5.0
+
+# import time:       self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+@dataclass
+class ImportNode:
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List["ImportNode"] = field(default_factory=list)
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000
+
+    @property
+    def self_ms(self) -> float:
+        return self.self_us / 1000
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(output: str) -> List[ImportNode]:
+    """
+    Converte a saída de ``-X importtime`` em árvores. O Python imprime cada
+    módulo depois dos que ele importou, com a profundidade indicada pela
+    indentação; os filhos pendentes de um nível são adotados pelo próximo
+    módulo de nível menor.
+    """
+    pending: dict = {}
+    roots: List[ImportNode] = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        node = ImportNode(name, int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        if depth == 0:
+            roots.append(node)
+        else:
+            pending.setdefault(depth, []).append(node)
+    return roots
+
+
+def profile(module: str = DEFAULT_MODULE, python: Optional[str] = None) -> List[ImportNode]:
+    """
+    Importa ``module`` em um processo novo e retorna a árvore de importações.
+    """
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_ms(roots: List[ImportNode]) -> float:
+    return sum(root.cumulative_us for root in roots) / 1000
+
+
+def format_tree(
+    roots: List[ImportNode],
+    threshold_ms: float = DEFAULT_THRESHOLD_MS,
+    max_depth: int = 6
+) -> List[str]:
+    lines: List[str] = []
+
+    def visit(node: ImportNode, depth: int) -> None:
+        if node.cumulative_ms < threshold_ms or depth > max_depth:
+            return
+        lines.append(
+            f"{node.cumulative_ms:>9.1f} {node.self_ms:>8.1f}  {'  ' * depth}{node.name}"
+        )
+        for child in sorted(node.children, key=lambda c: -c.cumulative_us):
+            visit(child, depth + 1)
+
+    for root in sorted(roots, key=lambda r: -r.cumulative_us):
+        visit(root, 0)
+    return lines
+
+
+def main() -> None:
+    module = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODULE
+    threshold_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_THRESHOLD_MS
+    roots = profile(module)
+
+    print(f"import {module}: {total_ms(roots):.1f} ms\n")
+    print(f"{'acum. ms':>9} {'próprio':>8}  módulo")
+    print("\n".join(format_tree(roots, threshold_ms)))
+
+    print("\nmaior tempo próprio:")
+    nodes = [node for root in roots for node in root.walk()]
+    for node in sorted(nodes, key=lambda n: -n.self_us)[:15]:
+        print(f"{node.self_ms:>9.1f}  {node.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Relatório de índices a partir do profiler de consultas.
+
+Executa as principais rotas de leitura e escrita dos serviços (listagem de
+pedidos por usuário e status, carga dos itens, verificação de pedidos na
+exclusão de produto, buscas de produtos e clientes) sobre um banco SQLite em
+memória, registra as consultas com o ``QueryProfiler`` e imprime, em Markdown,
+quais filtros são atendidos por índices e quais precisam de um.
+
+Uso:
+    poetry run python -m benchmarks.index_advisor
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.index_advisor import advise, format_report
+from app.db.profiler import QueryProfiler
+from app.models.client import Client
+from app.models.order import OrderStatus
+from app.models.product import Product
+from app.models.token import Token  # noqa: F401 - registra o relacionamento de User
+from app.models.user import User
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderUpdate
+from app.services import client as client_service
+from app.services import order as order_service
+from app.services import product as product_service
+
+USERS = 20
+PRODUCTS = 200
+ORDERS_PER_USER = 10
+
+
+def seed(db) -> None:
+    db.add_all(
+        User(email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}")
+        for i in range(USERS)
+    )
+    db.add_all(
+        Product(
+            name=f"Produto {i}",
+            description=f"Descrição {i}",
+            price=10.0 + i,
+            stock=10_000,
+            category=f"categoria-{i % 10}"
+        )
+        for i in range(PRODUCTS)
+    )
+    db.add_all(
+        Client(name=f"Cliente {i}", email=f"cliente{i}@example.com", cpf=f"{i:011d}")
+        for i in range(100)
+    )
+    db.commit()
+
+
+def workload(db) -> None:
+    for user_id in range(1, USERS + 1):
+        for n in range(ORDERS_PER_USER):
+            order = order_service.create_order(
+                db,
+                user_id=user_id,
+                obj_in=OrderCreate(items=[
+                    OrderItemCreate(product_id=(user_id * n) % PRODUCTS + 1, quantity=1)
+                ])
+            )
+        order_service.update_order(
+            db, order_id=order.id, obj_in=OrderUpdate(status=OrderStatus.CONFIRMED)
+        )
+
+    for user_id in range(1, USERS + 1):
+        order_service.get_orders(db, user_id=user_id, size=10)
+        orders, _ = order_service.get_orders(
+            db, user_id=user_id, status=OrderStatus.PENDING, size=10
+        )
+        for order in orders:
+            db.expire(order)
+            list(order_service.get_order(db, order.id).items)
+
+    for product_id in range(PRODUCTS, PRODUCTS - 20, -1):
+        try:
+            product_service.delete_product(db, product_id)
+        except Exception:
+            pass
+
+    for category in range(10):
+        product_service.get_products(db, category=f"categoria-{category}")
+    product_service.get_products(db, search="Produto 1")
+    client_service.get_clients(db, search="Cliente 1")
+
+
+def main() -> None:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    seed(db)
+
+    with QueryProfiler(engine) as profiler:
+        workload(db)
+
+    print("# Relatório de índices\n")
+    print(format_report(advise(profiler.report(), Base.metadata)))
+    print("\n## Consultas mais caras\n")
+    for stats in profiler.report(top=10):
+        print(f"- {stats.calls}x, {stats.total_ms:.2f} ms: `{stats.statement[:160]}`")
+
+
+if __name__ == "__main__":
+    main()
@@ -255,4 +255,72 @@ def test_delete_client(
         f"/api/v1/clients/{client_id}",
         headers=user_token_headers
     )
-    assert get_response.status_code == 404 
\ No newline at end of file
+    assert get_response.status_code == 404 
+def test_read_clients_with_fields(
+    client: TestClient,
+    user_token_headers: dict,
+    client_dict: dict
+):
+    response = client.get(
+        "/api/v1/clients/?fields=name,email",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) >= 1
+    for item in data["items"]:
+        assert set(item.keys()) == {"id", "name", "email"}
+
+def test_import_clients_csv(
+    client: TestClient,
+    user_token_headers: dict
+):
+    cpf_1 = generate_unique_cpf()
+    cpf_2 = generate_unique_cpf()
+    body = (
+        "name,email,cpf,phone,address\n"
+        f"Cliente Um,um@example.com,{cpf_1},11999999999,Rua A\n"
+        f"Cliente Dois,dois@example.com,{cpf_2},,\n"
+        f"Cliente Repetido,um@example.com,{generate_unique_cpf()},,\n"
+        "Cliente Invalido,invalido@example.com,123,,\n"
+    )
+    
+    response = client.post(
+        "/api/v1/clients/import",
+        headers={**user_token_headers, "Content-Type": "text/csv"},
+        content=body
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["received"] == 4
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    assert [e["line"] for e in data["errors"]] == [4, 5]
+    assert "Email duplicado" in data["errors"][0]["error"]
+    assert "CPF deve conter 11 dígitos" in data["errors"][1]["error"]
+
+def test_import_clients_jsonl_existing(
+    client: TestClient,
+    user_token_headers: dict,
+    client_dict: dict
+):
+    body = (
+        '{"name": "Novo", "email": "novo@example.com", "cpf": "%s"}\n'
+        '{"name": "Existente", "email": "%s", "cpf": "%s"}\n'
+        'not json\n'
+    ) % (generate_unique_cpf(), client_dict["email"], generate_unique_cpf())
+    
+    response = client.post(
+        "/api/v1/clients/import?format=jsonl",
+        headers=user_token_headers,
+        content=body
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 2
+    assert "Já existe um cliente" in data["errors"][0]["error"]
+    assert data["errors"][1] == {"line": 3, "error": "JSON inválido"}
@@ -0,0 +1,91 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, select_encoding
+
+LARGE_BODY = "x" * 5000
+
+
+def build_app(**kwargs) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1000, **kwargs)
+
+    @app.get("/large")
+    def large():
+        return Response(LARGE_BODY, media_type="text/plain")
+
+    @app.get("/small")
+    def small():
+        return Response("ok", media_type="text/plain")
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304)
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for _ in range(5):
+                yield LARGE_BODY
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_select_encoding():
+    assert select_encoding("gzip") == "gzip"
+    assert select_encoding("identity") is None
+    assert select_encoding("gzip;q=0.5, br;q=0") == "gzip"
+    assert select_encoding("br, gzip", brotli_enabled=False) == "gzip"
+
+
+def test_gzip_large_response():
+    client = TestClient(build_app())
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(LARGE_BODY)
+    assert response.text == LARGE_BODY
+
+
+def test_small_response_not_compressed():
+    client = TestClient(build_app())
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_not_modified_not_compressed():
+    client = TestClient(build_app())
+    response = client.get("/not-modified", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_compressed():
+    client = TestClient(build_app())
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == LARGE_BODY * 5
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli não instalado")
+def test_brotli_preferred():
+    client = TestClient(build_app(brotli_quality=5))
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip, br"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "br"
+    assert compression.brotli.decompress(raw).decode() == LARGE_BODY
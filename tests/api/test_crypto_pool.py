@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.crypto_pool import CryptoPool, CryptoPoolBusy
+from app.core.security import verify_password
+
+
+def test_crypto_pool_hashes_in_worker_process():
+    pool = CryptoPool(workers=1, max_queue=4)
+    try:
+        async def run():
+            hashed = await pool.hash_password("segredo123")
+            return hashed, await asyncio.gather(
+                pool.verify_password("segredo123", hashed),
+                pool.verify_password("errada", hashed)
+            )
+
+        hashed, results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert verify_password("segredo123", hashed)
+    assert results == [True, False]
+    assert pool.pending == 0
+
+
+def test_crypto_pool_keeps_slot_until_cancelled_job_finishes():
+    pool = CryptoPool(workers=1, max_queue=0)
+    try:
+        async def run():
+            task = asyncio.create_task(pool.run(time.sleep, 0.5))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # O processo ainda executa a operação cancelada
+            with pytest.raises(CryptoPoolBusy):
+                await pool.run(pow, 2, 3)
+            deadline = time.monotonic() + 10
+            while pool.pending and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            return await pool.run(pow, 2, 3)
+
+        assert asyncio.run(run()) == 8
+    finally:
+        pool.shutdown()
+    assert pool.pending == 0
+
+
+def test_crypto_pool_recreates_broken_executor():
+    pool = CryptoPool(workers=1, max_queue=1)
+    try:
+        async def run():
+            with pytest.raises(BrokenProcessPool):
+                await pool.run(os._exit, 1)
+            return await pool.run(pow, 2, 3)
+
+        assert asyncio.run(run()) == 8
+    finally:
+        pool.shutdown()
+    assert pool.pending == 0
+
+
+def test_crypto_pool_rejects_when_queue_is_full():
+    pool = CryptoPool(workers=0, max_queue=1)
+    for _ in range(pool.capacity):
+        pool._acquire()
+
+    with pytest.raises(CryptoPoolBusy):
+        asyncio.run(pool.hash_password("segredo123"))
+    assert pool.pending == pool.capacity
+
+
+def test_login_returns_503_when_crypto_pool_is_busy(client: TestClient, test_user, monkeypatch):
+    from app.services import auth as auth_service
+
+    busy = CryptoPool(workers=0, max_queue=0)
+    busy._acquire()
+    monkeypatch.setattr(auth_service, "crypto_pool", busy)
+
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user.email, "password": "testpassword123"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
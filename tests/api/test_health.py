@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.db.base import database_probe
+from app.db.probe import DatabaseProbe
+from app.main import app
+
+test_engine = create_engine("sqlite://")
+
+
+@pytest.fixture
+def healthy_probe():
+    previous = database_probe.result
+    database_probe.record(True, 1.0)
+    yield database_probe
+    database_probe._result = previous
+
+
+def test_liveness(client: TestClient):
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_readiness_ready(client: TestClient, healthy_probe: DatabaseProbe):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["database"]["ok"] is True
+    assert "pool" in data
+
+
+def test_readiness_database_unavailable(client: TestClient):
+    previous = database_probe.result
+    database_probe.record(False, error="OperationalError")
+    try:
+        response = client.get("/health/ready")
+    finally:
+        database_probe._result = previous
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "unavailable"
+    assert data["database"]["error"] == "OperationalError"
+
+
+def test_database_probe_is_cached():
+    probe = DatabaseProbe(test_engine, ttl=60)
+
+    first = probe.check()
+    second = probe.check()
+
+    assert first.ok is True
+    assert first.latency_ms is not None
+    assert second is first
+
+
+def test_database_probe_expires():
+    probe = DatabaseProbe(test_engine, ttl=0)
+
+    first = probe.check()
+    time.sleep(0.001)
+    second = probe.check()
+
+    assert second is not first
@@ -1,5 +1,11 @@
+import csv
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from app.models.order import OrderStatus
 from app.schemas.product import Product
@@ -304,4 +310,343 @@ def test_unauthorized_access(
 ):
     response = client.get("/api/v1/orders/")
     assert response.status_code == 401
-    assert "Not authenticated" in response.json()["detail"] 
\ No newline at end of file
+    assert "Not authenticated" in response.json()["detail"] 
+def test_read_orders_with_fields(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    client.post(
+        "/api/v1/orders/",
+        headers=user_token_headers,
+        json={"items": [{"product_id": product["id"], "quantity": 1}]}
+    )
+    
+    response = client.get(
+        "/api/v1/orders/?fields=status,total_amount",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) >= 1
+    for order in data["items"]:
+        assert set(order.keys()) == {"id", "status", "total_amount"}
+
+def test_read_order_with_fields_and_items(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    create_response = client.post(
+        "/api/v1/orders/",
+        headers=user_token_headers,
+        json={"items": [{"product_id": product["id"], "quantity": 2}]}
+    )
+    order_id = create_response.json()["id"]
+    
+    response = client.get(
+        f"/api/v1/orders/{order_id}?fields=total_amount&include=items",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data.keys()) == {"id", "total_amount", "items"}
+    assert data["items"][0]["quantity"] == 2
+
+def test_read_orders_without_items(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    client.post(
+        "/api/v1/orders/",
+        headers=user_token_headers,
+        json={"items": [{"product_id": product["id"], "quantity": 1}]}
+    )
+    
+    response = client.get(
+        "/api/v1/orders/?include=",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) >= 1
+    assert all("items" not in order for order in data["items"])
+    assert all("total_amount" in order for order in data["items"])
+
+def test_export_orders(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    client.post(
+        "/api/v1/orders/",
+        headers=user_token_headers,
+        json={"items": [{"product_id": product["id"], "quantity": 1}]}
+    )
+    
+    response = client.get(
+        "/api/v1/orders/export?status=pending",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert len(orders) >= 1
+    assert all(o["status"] == "pending" for o in orders)
+    assert all(len(o["items"]) >= 1 for o in orders)
+
+def test_export_orders_csv_does_not_load_items(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict,
+    db: Session
+):
+    for _ in range(3):
+        client.post(
+            "/api/v1/orders/",
+            headers=user_token_headers,
+            json={"items": [{"product_id": product["id"], "quantity": 1}]}
+        )
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(
+            "/api/v1/orders/export?format=csv",
+            headers=user_token_headers
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert "items" not in rows[0]
+    assert not [s for s in statements if "FROM order_items" in s]
+
+def test_read_order_stats(
+    client: TestClient,
+    admin_token_headers: dict,
+    product: dict
+):
+    client.post(
+        "/api/v1/orders/",
+        headers=admin_token_headers,
+        json={"items": [{"product_id": product["id"], "quantity": 1}]}
+    )
+    
+    response = client.get(
+        "/api/v1/orders/stats",
+        headers=admin_token_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["daily"][-1]["order_count"] >= 1
+    assert any(s["status"] == "pending" for s in data["by_status"])
+    assert any(p["product_id"] == product["id"] for p in data["top_products"])
+
+def test_read_order_stats_unauthorized(
+    client: TestClient,
+    user_token_headers: dict
+):
+    response = client.get(
+        "/api/v1/orders/stats",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 403
+
+def test_create_order_idempotency_key(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    import uuid
+
+    headers = {**user_token_headers, "Idempotency-Key": str(uuid.uuid4())}
+    payload = {"items": [{"product_id": product["id"], "quantity": 2}]}
+
+    first = client.post("/api/v1/orders/", headers=headers, json=payload)
+    assert first.status_code == 200
+    assert "idempotent-replayed" not in first.headers
+
+    retry = client.post("/api/v1/orders/", headers=headers, json=payload)
+    assert retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # O estoque foi baixado uma única vez
+    product_response = client.get(
+        f"/api/v1/products/{product['id']}",
+        headers=user_token_headers
+    )
+    assert product_response.json()["stock"] == product["stock"] - 2
+
+    orders = client.get("/api/v1/orders/", headers=user_token_headers).json()
+    assert orders["metadata"]["total"] == 1
+
+    # Mesma chave com outro conteúdo
+    other = client.post(
+        "/api/v1/orders/",
+        headers=headers,
+        json={"items": [{"product_id": product["id"], "quantity": 1}]}
+    )
+    assert other.status_code == 422
+
+
+def test_create_order_idempotency_key_released_on_error(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    import uuid
+
+    headers = {**user_token_headers, "Idempotency-Key": str(uuid.uuid4())}
+    payload = {"items": [{"product_id": product["id"], "quantity": product["stock"] + 1}]}
+
+    assert client.post("/api/v1/orders/", headers=headers, json=payload).status_code == 400
+    # A falha não é registrada: a repetição executa o pedido novamente
+    assert client.post("/api/v1/orders/", headers=headers, json=payload).status_code == 400
+
+def test_bulk_update_order_status(
+    client: TestClient,
+    user_token_headers: dict,
+    admin_token_headers: dict,
+    product: dict
+):
+    order_ids = []
+    for _ in range(3):
+        response = client.post(
+            "/api/v1/orders/",
+            headers=user_token_headers,
+            json={"items": [{"product_id": product["id"], "quantity": 2}]}
+        )
+        order_ids.append(response.json()["id"])
+
+    response = client.post(
+        "/api/v1/orders/status",
+        headers=admin_token_headers,
+        json=[
+            {"order_id": order_ids[0], "status": "ready"},
+            {"order_id": order_ids[1], "status": "ready"},
+            {"order_id": order_ids[2], "status": "cancelled"},
+            {"order_id": 999999, "status": "ready"}
+        ]
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["received"] == 4
+    assert data["updated"] == 3
+    assert data["failed"] == 1
+    assert data["errors"][0]["order_id"] == 999999
+
+    # O cancelamento devolveu o estoque do pedido
+    product_response = client.get(
+        f"/api/v1/products/{product['id']}",
+        headers=user_token_headers
+    )
+    assert product_response.json()["stock"] == product["stock"] - 4
+
+    # Estados finais não podem ser alterados
+    response = client.post(
+        "/api/v1/orders/status",
+        headers=admin_token_headers,
+        json=[
+            {"order_id": order_ids[0], "status": "delivered"},
+            {"order_id": order_ids[1], "status": "pending"},
+            {"order_id": order_ids[2], "status": "ready"}
+        ]
+    )
+    data = response.json()
+    assert data["updated"] == 1
+    assert data["failed"] == 2
+    assert data["errors"][0]["error"] == "Transição de status inválida: ready -> pending"
+
+    response = client.put(
+        f"/api/v1/orders/{order_ids[0]}",
+        headers=user_token_headers,
+        json={"status": "cancelled"}
+    )
+    assert response.status_code == 400
+    assert "delivered -> cancelled" in response.json()["detail"]
+
+
+def test_bulk_update_order_status_requires_superuser(
+    client: TestClient,
+    user_token_headers: dict
+):
+    response = client.post(
+        "/api/v1/orders/status",
+        headers=user_token_headers,
+        json=[{"order_id": 1, "status": "ready"}]
+    )
+    assert response.status_code == 403
+
+def test_read_orders_summary(
+    client: TestClient,
+    user_token_headers: dict,
+    product: dict
+):
+    for quantity in (1, 2):
+        client.post(
+            "/api/v1/orders/",
+            headers=user_token_headers,
+            json={"items": [
+                {"product_id": product["id"], "quantity": quantity},
+                {"product_id": product["id"], "quantity": 1}
+            ]}
+        )
+
+    response = client.get(
+        "/api/v1/orders/?view=summary&size=1",
+        headers=user_token_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["total"] == 2
+    assert data["metadata"]["has_next"] is True
+    order = data["items"][0]
+    assert set(order.keys()) == {"id", "status", "total_amount", "item_count", "created_at"}
+    assert order["item_count"] == 2
+    # Mais recentes primeiro, sem repetir pedidos entre as páginas
+    assert order["total_amount"] == round(product["price"] * 3, 2)
+
+    response = client.get(
+        "/api/v1/orders/?view=summary&size=1&page=2",
+        headers=user_token_headers
+    )
+    assert response.json()["items"][0]["total_amount"] == round(product["price"] * 2, 2)
+    assert response.json()["items"][0]["id"] != order["id"]
+
+    response = client.get(
+        "/api/v1/orders/?view=summary&page=5",
+        headers=user_token_headers
+    )
+    assert response.json()["items"] == []
+    assert response.json()["metadata"]["total"] == 2
+
+    response = client.get(
+        "/api/v1/orders/?view=summary&fields=status",
+        headers=user_token_headers
+    )
+    assert response.status_code == 400
+
+def test_read_orders_documents_summary_response(client: TestClient):
+    schema = client.get("/api/v1/openapi.json").json()
+    response = schema["paths"]["/api/v1/orders/"]["get"]["responses"]["200"]
+    refs = [
+        option["$ref"]
+        for option in response["content"]["application/json"]["schema"]["anyOf"]
+    ]
+    assert len(refs) == 2
+    assert any("OrderSummary" in ref for ref in refs)
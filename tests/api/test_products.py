@@ -1,5 +1,15 @@
+import csv
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.config import settings
+from app.db.routing import ReadRouter
 from app.schemas.product import Product
 
 
@@ -134,10 +144,36 @@ def test_read_product(
     assert data["id"] == test_product.id
     assert data["name"] == test_product.name
     assert data["description"] == test_product.description
-    assert data["price"] == test_product.price
+    assert data["price"] == float(test_product.price)
     assert data["stock"] == test_product.stock
     assert data["category"] == test_product.category
 
+def test_read_product_falls_back_to_primary(
+    client: TestClient,
+    admin_token_headers: dict,
+    test_product: Product,
+    db: Session,
+    monkeypatch
+):
+    # Réplica sem as tabelas: a consulta falha no driver
+    replica = create_engine("sqlite://")
+    router = ReadRouter(db.get_bind(), [replica], check_ttl=60)
+    monkeypatch.setattr(deps, "get_read_router", lambda: router)
+
+    response = client.get(
+        f"/api/v1/products/{test_product.id}",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 500
+    assert router.status()[0]["ok"] is False
+
+    response = client.get(
+        f"/api/v1/products/{test_product.id}",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == test_product.id
+
 def test_read_product_not_found(
     client: TestClient,
     admin_token_headers: dict
@@ -220,4 +256,193 @@ def test_delete_product_unauthorized(
     )
     
     assert response.status_code == 403
-    assert "Permissão negada" in response.json()["detail"] 
\ No newline at end of file
+    assert "Permissão negada" in response.json()["detail"] 
+def test_read_products_with_fields(
+    client: TestClient,
+    user_token_headers: dict,
+    test_product: Product
+):
+    response = client.get(
+        "/api/v1/products/?fields=name,price,stock",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["total"] >= 1
+    for item in data["items"]:
+        assert set(item.keys()) == {"id", "name", "price", "stock"}
+
+def test_read_product_with_fields(
+    client: TestClient,
+    user_token_headers: dict,
+    test_product: Product
+):
+    response = client.get(
+        f"/api/v1/products/{test_product.id}?fields=name",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    assert response.json() == {"id": test_product.id, "name": test_product.name}
+
+def test_read_products_with_invalid_fields(
+    client: TestClient,
+    user_token_headers: dict
+):
+    response = client.get(
+        "/api/v1/products/?fields=name,secret",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 400
+    assert "Campos inválidos" in response.json()["detail"]
+
+def test_bulk_upsert_products(
+    client: TestClient,
+    admin_token_headers: dict,
+    test_product: Product
+):
+    response = client.post(
+        "/api/v1/products/bulk",
+        headers=admin_token_headers,
+        json=[
+            {"id": test_product.id, "price": 79.9, "stock": 3},
+            {"name": "Bulk Product", "price": 10.0, "stock": 5, "category": "bulk"},
+            {"id": 999999, "stock": 1},
+            {"name": "Sem categoria", "price": 10.0}
+        ]
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["received"] == 4
+    assert data["updated"] == 1
+    assert data["created"] == 1
+    assert data["failed"] == 2
+    assert [e["index"] for e in data["errors"]] == [2, 3]
+    
+    get_response = client.get(
+        f"/api/v1/products/{test_product.id}",
+        headers=admin_token_headers
+    )
+    assert get_response.json()["price"] == 79.9
+    assert get_response.json()["stock"] == 3
+    assert get_response.json()["name"] == test_product.name
+
+def test_bulk_upsert_products_ndjson(
+    client: TestClient,
+    admin_token_headers: dict,
+    test_product: Product
+):
+    response = client.post(
+        "/api/v1/products/bulk",
+        headers={**admin_token_headers, "Content-Type": "application/x-ndjson"},
+        content=(
+            f'{{"id": {test_product.id}, "stock": 7}}\n'
+            f'{{"id": {test_product.id}, "price": 5.5}}\n'
+        )
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["updated"] == 1
+    
+    get_response = client.get(
+        f"/api/v1/products/{test_product.id}",
+        headers=admin_token_headers
+    )
+    assert get_response.json()["stock"] == 7
+    assert get_response.json()["price"] == 5.5
+
+def test_bulk_upsert_products_rejects_nulls(
+    client: TestClient,
+    admin_token_headers: dict,
+    test_product: Product
+):
+    response = client.post(
+        "/api/v1/products/bulk",
+        headers=admin_token_headers,
+        json=[
+            {"id": test_product.id, "name": None},
+            {"id": test_product.id, "stock": 4, "description": None}
+        ]
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 1
+    assert data["failed"] == 1
+    assert data["errors"][0]["index"] == 0
+    assert "name" in data["errors"][0]["error"]
+    
+    get_response = client.get(
+        f"/api/v1/products/{test_product.id}",
+        headers=admin_token_headers
+    )
+    assert get_response.json()["name"] == test_product.name
+    assert get_response.json()["stock"] == 4
+
+def test_bulk_upsert_products_ndjson_invalid_line_rolls_back(
+    client: TestClient,
+    admin_token_headers: dict,
+    test_product: Product,
+    monkeypatch
+):
+    # Um lote por linha: a primeira já foi aplicada quando a inválida chega
+    monkeypatch.setattr(settings, "PRODUCT_BULK_BATCH_SIZE", 1)
+    response = client.post(
+        "/api/v1/products/bulk",
+        headers={**admin_token_headers, "Content-Type": "application/x-ndjson"},
+        content=f'{{"id": {test_product.id}, "stock": 8}}\n{{invalido\n'
+    )
+    
+    assert response.status_code == 400
+    get_response = client.get(
+        f"/api/v1/products/{test_product.id}",
+        headers=admin_token_headers
+    )
+    assert get_response.json()["stock"] == test_product.stock
+
+def test_bulk_upsert_products_unauthorized(
+    client: TestClient,
+    user_token_headers: dict
+):
+    response = client.post(
+        "/api/v1/products/bulk",
+        headers=user_token_headers,
+        json=[{"id": 1, "stock": 1}]
+    )
+    
+    assert response.status_code == 403
+
+def test_export_products_ndjson(
+    client: TestClient,
+    user_token_headers: dict,
+    test_product: Product
+):
+    response = client.get(
+        "/api/v1/products/export?category=test",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert any(p["id"] == test_product.id for p in lines)
+    assert all(p["category"] == "test" for p in lines)
+
+def test_export_products_csv(
+    client: TestClient,
+    user_token_headers: dict,
+    test_product: Product
+):
+    response = client.get(
+        "/api/v1/products/export?format=csv",
+        headers=user_token_headers
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert any(int(r["id"]) == test_product.id for r in rows)
+    assert rows[0]["name"] == test_product.name
@@ -0,0 +1,169 @@
+import asyncio
+from datetime import timedelta
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import (
+    MemoryRateLimitBackend, RateLimitMiddleware, decode_bearer_token
+)
+from app.core.security import create_access_token
+from app.db.pool import PoolWaitMonitor
+
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+
+
+def build_app(**kwargs) -> FastAPI:
+    app = FastAPI()
+    options = dict(
+        backend=MemoryRateLimitBackend(),
+        secret_key=SECRET_KEY,
+        algorithm=ALGORITHM,
+        user_rate=0.001,
+        user_burst=2,
+        ip_rate=0.001,
+        ip_burst=5,
+    )
+    options.update(kwargs)
+    app.add_middleware(RateLimitMiddleware, **options)
+
+    @app.get("/items")
+    def items(request: Request):
+        payload = getattr(request.state, "token_payload", None)
+        return {"sub": payload["sub"] if payload else None}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def auth_header(subject: str) -> dict:
+    token = create_access_token(subject, timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_memory_backend_refills():
+    backend = MemoryRateLimitBackend()
+
+    async def run():
+        first = await backend.take("k", rate=1000.0, burst=1)
+        second = await backend.take("k", rate=1000.0, burst=1)
+        await asyncio.sleep(0.01)
+        third = await backend.take("k", rate=1000.0, burst=1)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == (True, 0.0)
+    assert second[0] is False and second[1] > 0
+    assert third[0] is True
+
+
+def test_memory_backend_prunes_each_bucket_with_its_own_rate():
+    backend = MemoryRateLimitBackend(max_keys=1)
+
+    async def run():
+        await backend.take("slow", rate=0.001, burst=1)
+        # A chave rápida força a limpeza; o balde lento continua vazio
+        await backend.take("fast", rate=1000.0, burst=1)
+        await asyncio.sleep(0.01)
+        await backend.take("other", rate=1000.0, burst=1)
+        return await backend.take("slow", rate=0.001, burst=1)
+
+    allowed, retry_after = asyncio.run(run())
+    assert allowed is False
+    assert retry_after > 0
+    assert "fast" not in backend._buckets
+
+
+def test_decode_bearer_token():
+    header = auth_header("7")["Authorization"]
+    assert decode_bearer_token(header, SECRET_KEY, ALGORITHM)["sub"] == "7"
+    assert decode_bearer_token(header, "other-secret", ALGORITHM) is None
+    assert decode_bearer_token("Basic abc", SECRET_KEY, ALGORITHM) is None
+    assert decode_bearer_token(None, SECRET_KEY, ALGORITHM) is None
+
+
+def test_user_bucket_returns_429_with_retry_after():
+    client = TestClient(build_app())
+    headers = auth_header("1")
+
+    for _ in range(2):
+        response = client.get("/items", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"sub": "1"}
+
+    response = client.get("/items", headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Outro usuário no mesmo IP ainda tem fichas próprias
+    assert client.get("/items", headers=auth_header("2")).status_code == 200
+
+
+def test_ip_bucket_limits_anonymous_requests():
+    client = TestClient(build_app())
+    for _ in range(5):
+        assert client.get("/items").status_code == 200
+    response = client.get("/items")
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_health_is_exempt():
+    client = TestClient(build_app(ip_burst=1))
+    for _ in range(3):
+        assert client.get("/health").status_code == 200
+
+
+def test_sheds_when_too_many_in_flight():
+    app = build_app(max_in_flight=1, retry_after=3)
+    middleware = app.build_middleware_stack()
+    while not isinstance(middleware, RateLimitMiddleware):
+        middleware = middleware.app
+    middleware.in_flight = 1
+
+    async def run():
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "method": "GET", "path": "/items",
+            "headers": [], "query_string": b"", "client": ("1.2.3.4", 1),
+        }
+        await middleware(scope, receive, send)
+        return messages
+
+    start = asyncio.run(run())[0]
+    assert start["status"] == 503
+    assert (b"retry-after", b"3") in start["headers"]
+    assert middleware.in_flight == 1
+
+
+def test_sheds_when_pool_wait_is_high():
+    wait = {"ms": 900.0}
+    client = TestClient(build_app(
+        max_pool_wait_ms=500, pool_wait_ms=lambda: wait["ms"]
+    ))
+    response = client.get("/items")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    wait["ms"] = 10.0
+    assert client.get("/items").status_code == 200
+
+
+def test_pool_wait_monitor_decays():
+    monitor = PoolWaitMonitor(half_life=0.05, alpha=1.0)
+    monitor.observe(0.2)
+    assert 100 < monitor.average_ms <= 200
+    monitor._updated_at -= 0.5
+    assert monitor.average_ms < 1
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.whatsapp import WhatsAppMessageStatus
+from app.services.whatsapp_status import (
+    StatusBuffer, parse_statuses, status_buffer, verify_signature
+)
+
+SECRET = "app-secret"
+
+
+def status_payload(*statuses) -> dict:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [{
+            "id": "1",
+            "changes": [{
+                "field": "messages",
+                "value": {
+                    "messaging_product": "whatsapp",
+                    "statuses": [
+                        {
+                            "id": message_id,
+                            "status": status,
+                            "timestamp": "1700000000",
+                            "recipient_id": "5511999999999",
+                        }
+                        for message_id, status in statuses
+                    ],
+                },
+            }],
+        }],
+    }
+
+
+def signed(body: bytes) -> dict:
+    digest = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return {"X-Hub-Signature-256": f"sha256={digest}", "Content-Type": "application/json"}
+
+
+@pytest.fixture
+def webhook(monkeypatch, db: Session):
+    monkeypatch.setattr(settings, "WHATSAPP_APP_SECRET", SECRET)
+    monkeypatch.setattr(settings, "WHATSAPP_VERIFY_TOKEN", "verify-me")
+    monkeypatch.setattr(status_buffer, "session_factory", sessionmaker(bind=db.get_bind()))
+    monkeypatch.setattr(status_buffer, "_flush_size", 1)
+
+
+def test_verify_signature():
+    body = b'{"entry": []}'
+    header = signed(body)["X-Hub-Signature-256"]
+    assert verify_signature(body, header, SECRET)
+    assert not verify_signature(body + b" ", header, SECRET)
+    assert not verify_signature(body, header[len("sha256="):], SECRET)
+    assert not verify_signature(body, None, SECRET)
+
+
+def test_parse_statuses_reads_batched_callbacks():
+    payload = status_payload(("wamid.1", "delivered"), ("wamid.2", "read"))
+    payload["entry"][0]["changes"][0]["value"]["statuses"].append(
+        {"id": "wamid.3", "status": "failed"}  # sem timestamp: ignorado
+    )
+    rows = parse_statuses(payload)
+    assert [(row["message_id"], row["status"]) for row in rows] == [
+        ("wamid.1", "delivered"), ("wamid.2", "read")
+    ]
+    assert rows[0]["recipient_id"] == "5511999999999"
+    assert parse_statuses({"entry": [{"changes": [{"value": {"messages": []}}]}]}) == []
+
+
+def test_status_buffer_batches_inserts(db: Session):
+    buffer = StatusBuffer(
+        flush_interval_ms=10_000,
+        flush_size=100,
+        session_factory=sessionmaker(bind=db.get_bind())
+    )
+
+    async def run():
+        await buffer.start()
+        for i in range(50):
+            await buffer.add(parse_statuses(status_payload((f"wamid.{i}", "delivered"))))
+        pending = buffer.pending
+        await buffer.stop()
+        return pending
+
+    assert asyncio.run(run()) == 50
+    assert buffer.flushes == 1
+    assert db.query(WhatsAppMessageStatus).count() == 50
+
+
+def test_webhook_verification(client, webhook):
+    response = client.get(
+        f"{settings.API_V1_STR}/whatsapp/webhook",
+        params={"hub.mode": "subscribe", "hub.verify_token": "verify-me", "hub.challenge": "42"}
+    )
+    assert response.status_code == 200
+    assert response.text == "42"
+
+    response = client.get(
+        f"{settings.API_V1_STR}/whatsapp/webhook",
+        params={"hub.mode": "subscribe", "hub.verify_token": "wrong", "hub.challenge": "42"}
+    )
+    assert response.status_code == 403
+
+
+def test_webhook_rejects_invalid_signature(client, webhook, db: Session):
+    body = json.dumps(status_payload(("wamid.1", "delivered"))).encode()
+    headers = signed(body)
+    response = client.post(
+        f"{settings.API_V1_STR}/whatsapp/webhook",
+        content=body + b" ",
+        headers=headers
+    )
+    assert response.status_code == 403
+    assert db.query(WhatsAppMessageStatus).count() == 0
+
+
+def test_webhook_stores_statuses_once(client, webhook, db: Session):
+    body = json.dumps(
+        status_payload(("wamid.1", "delivered"), ("wamid.1", "read"))
+    ).encode()
+    for _ in range(2):  # o WhatsApp pode reenviar a mesma notificação
+        response = client.post(
+            f"{settings.API_V1_STR}/whatsapp/webhook",
+            content=body,
+            headers=signed(body)
+        )
+        assert response.status_code == 200
+        assert response.json() == {"received": 2}
+
+    statuses = db.query(WhatsAppMessageStatus).order_by(WhatsAppMessageStatus.id).all()
+    assert [(s.message_id, s.status) for s in statuses] == [
+        ("wamid.1", "delivered"), ("wamid.1", "read")
+    ]
@@ -16,6 +16,7 @@ from app.models.user import User
 from app.models.product import Product
 from app.models.client import Client
 from app.services.auth import get_password_hash, create_user_token
+from app.services.principal import principal_cache
 from app.models.token import Token
 # from app.db.session import engine
 
@@ -47,6 +48,8 @@ def client():
 @pytest.fixture(scope="function")
 def db():
     Base.metadata.create_all(bind=engine)
+    # O banco é recriado a cada teste; usuários em cache seriam de outro teste
+    principal_cache.clear()
     db = TestingSessionLocal()
     try:
         yield db
@@ -197,7 +200,7 @@ def product(test_product: Product):
         "id": test_product.id,
         "name": test_product.name,
         "description": test_product.description,
-        "price": test_product.price,
+        "price": float(test_product.price),  # como no JSON da API
         "stock": test_product.stock,
         "category": test_product.category
     }
@@ -97,4 +97,51 @@ async def test_get_current_active_superuser_not_superuser(db, test_user):
     with pytest.raises(HTTPException) as exc_info:
         await get_current_active_superuser(current_user=current_user)
     assert exc_info.value.status_code == 403
-    assert "O usuário não tem privilégios suficientes" in str(exc_info.value.detail) 
\ No newline at end of file
+    assert "O usuário não tem privilégios suficientes" in str(exc_info.value.detail) 
+
+def test_get_current_user_returns_cached_principal(db, test_user):
+    from app.db.profiler import QueryProfiler
+    from app.services.auth import deactivate_user_tokens
+    from app.services.principal import Principal
+
+    db.rollback()
+    db.query(Token).filter(Token.user_id == test_user.id).delete()
+    db.commit()
+    access_token = create_user_token(
+        db=db,
+        user=test_user,
+        expires_delta=timedelta(minutes=15)
+    ).token
+    user_id = test_user.id
+    db.expunge_all()
+
+    with QueryProfiler(db.get_bind()) as profiler:
+        first = get_current_user(db, access_token)
+        second = get_current_user(db, access_token)
+
+    # Token e usuário em uma consulta; a segunda chamada vem do cache
+    assert sum(stats.calls for stats in profiler.report()) == 1
+    assert isinstance(first, Principal) and first == second
+    assert first.id == user_id and first.is_superuser is False
+    assert not any(isinstance(obj, User) for obj in db.identity_map.values())
+
+    deactivate_user_tokens(db, user_id)
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user(db, access_token)
+    assert exc_info.value.status_code == 401
+
+def test_login_revokes_cached_principal(db, test_user):
+    db.query(Token).filter(Token.user_id == test_user.id).delete()
+    db.commit()
+    old_token = create_user_token(
+        db=db,
+        user=test_user,
+        expires_delta=timedelta(minutes=15)
+    ).token
+    assert get_current_user(db, old_token).id == test_user.id
+
+    # Um novo login desativa o token anterior, mesmo já em cache
+    create_user_token(db=db, user=test_user, expires_delta=timedelta(minutes=16))
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user(db, old_token)
+    assert exc_info.value.status_code == 401
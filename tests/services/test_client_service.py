@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
@@ -12,6 +14,7 @@ from app.services.client import (
     update_client,
     delete_client
 )
+from app.services.client_import import import_batch, import_clients
 
 def test_create_client(db):
     client_data = ClientCreate(
@@ -180,4 +183,46 @@ def test_delete_client(db, test_client):
 def test_delete_client_not_found(db):
     deleted_client = delete_client(db=db, client_id=999)
     db.rollback()  # Garante que a sessão está limpa para o próximo teste
-    assert deleted_client is None 
\ No newline at end of file
+    assert deleted_client is None
+
+def test_import_batch_deduplicates(db: Session):
+    created, errors = import_batch(db, [
+        (1, {"name": "A", "email": "a@example.com", "cpf": "11111111111"}),
+        (2, {"name": "B", "email": "b@example.com", "cpf": "111.111.111-11"}),
+        (3, {"name": "C", "email": "c@example.com", "cpf": "22222222222"}),
+    ])
+
+    assert created == 2
+    assert len(errors) == 1
+    assert errors[0].line == 2
+    assert "CPF duplicado" in errors[0].error
+    assert db.query(Client).filter(Client.email == "c@example.com").first() is not None
+
+def test_import_clients_reports_invalid_utf8_per_line(db: Session):
+    async def chunks():
+        yield "name,email,cpf\n".encode()
+        yield "Ana,ana@example.com,11111111111\n".encode()
+        yield "Jos\xe9,jose@example.com,22222222222\n".encode("latin-1")
+        yield "Bia,bia@example.com,33333333333\n".encode()
+
+    result = asyncio.run(import_clients(db, chunks(), "csv"))
+
+    assert result.received == 3
+    assert result.created == 2
+    assert [(e.line, e.error) for e in result.errors] == [
+        (3, "Linha com codificação inválida (esperado UTF-8)")
+    ]
+
+def test_import_batch_hides_database_errors(db: Session, monkeypatch):
+    def fail(*args, **kwargs):
+        raise IntegrityError("INSERT INTO clients ...", {}, Exception("driver"))
+
+    monkeypatch.setattr(db, "execute", fail)
+    created, errors = import_batch(db, [
+        (1, {"name": "A", "email": "a@example.com", "cpf": "11111111111"}),
+    ])
+
+    assert created == 0
+    assert [(e.line, e.error) for e in errors] == [
+        (1, "Erro ao gravar o cliente, tente novamente.")
+    ]
@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+from app.models.product import Product
+from app.services.idempotency import IdempotencyStore, request_hash
+
+
+def test_idempotency_store_replays_stored_response(db: Session):
+    store = IdempotencyStore(ttl=60)
+    calls = []
+
+    def operation():
+        calls.append(1)
+        return 201, {"id": len(calls)}
+
+    assert store.execute(db, 1, "key", "{}", operation) == (201, {"id": 1}, False)
+    assert store.execute(db, 1, "key", "{}", operation) == (201, {"id": 1}, True)
+
+    # Sem o cache em memória a resposta vem da tabela
+    store.clear()
+    assert store.execute(db, 1, "key", "{}", operation) == (201, {"id": 1}, True)
+    assert len(calls) == 1
+
+    # Chaves são isoladas por usuário
+    assert store.execute(db, 2, "key", "{}", operation) == (201, {"id": 2}, False)
+
+    with pytest.raises(HTTPException) as exc_info:
+        store.execute(db, 1, "key", '{"other": 1}', operation)
+    assert exc_info.value.status_code == 422
+
+
+def test_idempotency_store_coalesces_concurrent_requests(db: Session):
+    store = IdempotencyStore(ttl=60)
+    started = threading.Event()
+    calls = []
+    results = []
+
+    def operation():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return 200, {"ok": True}
+
+    def duplicate():
+        results.append(store.execute(db, 1, "concurrent", "{}", operation))
+
+    worker = threading.Thread(target=duplicate)
+    first = threading.Thread(target=lambda: results.append(
+        store.execute(db, 1, "concurrent", "{}", operation)
+    ))
+    first.start()
+    started.wait()
+    worker.start()
+    first.join()
+    worker.join()
+
+    assert len(calls) == 1
+    assert sorted(replayed for _, _, replayed in results) == [False, True]
+
+
+def test_idempotency_store_purges_expired_keys(db: Session):
+    store = IdempotencyStore(ttl=0)
+    store.execute(db, 1, "expired", "{}", lambda: (200, {}))
+
+    assert store.purge_expired(db) == 1
+    assert db.query(IdempotencyKey).count() == 0
+
+
+def test_idempotency_store_commits_operation_with_response(db: Session):
+    store = IdempotencyStore(ttl=60)
+
+    def operation():
+        # Sem commit: a loja confirma o produto junto com a resposta
+        product = Product(name="Idempotente", price=10, stock=1, category="test")
+        db.add(product)
+        db.flush()
+        return 201, {"id": product.id}
+
+    status_code, body, replayed = store.execute(db, 1, "atomic", "{}", operation)
+    db.rollback()
+
+    assert db.get(Product, body["id"]) is not None
+    row = db.get(IdempotencyKey, (1, "atomic"))
+    assert row.status_code == 201
+    assert row.expires_at > datetime.utcnow() + timedelta(seconds=30)
+
+
+def test_idempotency_store_takes_over_abandoned_claim(db: Session):
+    store = IdempotencyStore(ttl=60, claim_lease=60, wait_timeout=0.1)
+    # Reivindicação de um processo que morreu antes de gravar a resposta
+    now = datetime.utcnow()
+    db.add(IdempotencyKey(
+        user_id=1,
+        key="abandoned",
+        request_hash=request_hash("{}"),
+        created_at=now - timedelta(seconds=120),
+        expires_at=now - timedelta(seconds=60)
+    ))
+    db.commit()
+
+    assert store.execute(db, 1, "abandoned", "{}", lambda: (200, {"ok": True})) == (
+        200, {"ok": True}, False
+    )
+
+
+def test_idempotency_store_rolls_back_when_claim_is_lost(db: Session):
+    store = IdempotencyStore(ttl=60)
+
+    def operation():
+        db.add(Product(name="Perdido", price=10, stock=1, category="test"))
+        # Outra requisição assumiu a chave depois que a reivindicação expirou
+        db.query(IdempotencyKey).update(
+            {IdempotencyKey.created_at: datetime.utcnow() + timedelta(seconds=1)},
+            synchronize_session=False
+        )
+        return 200, {}
+
+    with pytest.raises(HTTPException) as exc_info:
+        store.execute(db, 1, "lost", "{}", operation)
+    assert exc_info.value.status_code == 409
+    assert db.query(Product).filter(Product.name == "Perdido").count() == 0
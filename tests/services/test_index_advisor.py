@@ -0,0 +1,74 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table
+
+from app.db.index_advisor import advise
+from app.db.profiler import QueryProfiler, QueryStats
+
+
+def build_metadata() -> MetaData:
+    metadata = MetaData()
+    Table(
+        "orders", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer),
+        Column("status", String),
+        Index("ix_orders_user_id_status", "user_id", "status"),
+    )
+    Table(
+        "order_items", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("order_id", Integer, ForeignKey("orders.id")),
+        Column("product_id", Integer),
+    )
+    return metadata
+
+
+def test_advise_detects_missing_and_covered_indexes():
+    stats = [
+        QueryStats(
+            statement="SELECT orders.id FROM orders WHERE orders.user_id = ? AND orders.status = ?",
+            calls=10,
+            total_ms=5.0
+        ),
+        QueryStats(
+            statement="SELECT order_items.id FROM order_items WHERE ? = order_items.order_id",
+            calls=20,
+            total_ms=8.0
+        ),
+        QueryStats(
+            statement="UPDATE orders SET status=? WHERE orders.id IN (?) AND orders.status IN (?)",
+            calls=5,
+            total_ms=2.0
+        ),
+        QueryStats(
+            statement="SELECT orders.id FROM orders WHERE lower(orders.status) LIKE lower(?)",
+            calls=1,
+            total_ms=1.0
+        ),
+    ]
+
+    suggestions = {(s.table, s.columns, s.kind): s for s in advise(stats, build_metadata())}
+
+    covered = suggestions[("orders", ("user_id", "status"), "btree")]
+    assert covered.covered_by == "ix_orders_user_id_status"
+
+    missing = suggestions[("order_items", ("order_id",), "btree")]
+    assert missing.covered_by is None
+    assert missing.calls == 20
+    assert "ON order_items (order_id)" in missing.ddl
+
+    # A chave primária no filtro já basta, mesmo com outras condições
+    assert suggestions[("orders", ("id", "status"), "btree")].covered_by == "pk"
+
+    assert ("orders", ("status",), "trigram") in suggestions
+
+
+def test_query_profiler_records_statements(db):
+    from sqlalchemy import text
+
+    with QueryProfiler(db.get_bind()) as profiler:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 1"))
+
+    report = profiler.report()
+    assert report[0].statement == "SELECT 1"
+    assert report[0].calls == 2
@@ -180,4 +180,180 @@ def test_delete_order(db: Session, test_user: User, test_product: Product):
     
     # Verifica se o estoque foi restaurado
     product = db.query(ProductModel).filter(ProductModel.id == test_product.id).first()
-    assert product.stock == test_product.stock 
\ No newline at end of file
+    assert product.stock == test_product.stock 
+def test_order_stats_are_maintained(db: Session, test_user: User, test_product: Product):
+    from app.services import order_stats
+
+    order_in = OrderCreate(
+        items=[
+            OrderItemCreate(
+                product_id=test_product.id,
+                quantity=2
+            )
+        ]
+    )
+    first = order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+    order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+
+    stats = order_stats.get_stats(db)
+    assert stats.daily[-1].order_count == 2
+    assert stats.daily[-1].revenue == pytest.approx(test_product.price * 4)
+    assert stats.top_products[0].product_id == test_product.id
+    assert stats.top_products[0].quantity == 4
+
+    # Cancelar remove o pedido das vendas e o move entre os status
+    order_service.update_order(
+        db=db,
+        order_id=first.id,
+        obj_in=OrderUpdate(status=OrderStatus.CANCELLED)
+    )
+    stats = order_stats.get_stats(db)
+    assert stats.daily[-1].order_count == 1
+    assert stats.top_products[0].quantity == 2
+    by_status = {s.status: s.order_count for s in stats.by_status}
+    assert by_status == {OrderStatus.PENDING: 1, OrderStatus.CANCELLED: 1}
+
+    # O recálculo a partir dos pedidos produz o mesmo resultado
+    order_stats.rebuild_stats(db)
+    rebuilt = order_stats.get_stats(db)
+    assert rebuilt.model_dump() == stats.model_dump()
+
+def test_create_order_reserves_stock_atomically(db: Session, test_user: User, test_product: Product):
+    from app.services import stock
+
+    initial_stock = test_product.stock
+    # A soma dos itens do mesmo produto excede o estoque
+    order_in = OrderCreate(
+        items=[
+            OrderItemCreate(product_id=test_product.id, quantity=initial_stock),
+            OrderItemCreate(product_id=test_product.id, quantity=1)
+        ]
+    )
+    with pytest.raises(ValueError) as exc_info:
+        order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+    assert "Estoque insuficiente" in str(exc_info.value)
+
+    product = db.query(ProductModel).filter(ProductModel.id == test_product.id).first()
+    assert product.stock == initial_stock
+    assert db.query(Order).count() == 0
+
+    # Um produto inexistente desfaz a reserva dos demais
+    with pytest.raises(ValueError) as exc_info:
+        stock.reserve_stock(db, {test_product.id: 1, 999999: 1})
+    assert "Produto 999999 não encontrado" in str(exc_info.value)
+    db.refresh(product)
+    assert product.stock == initial_stock
+
+    reserved = stock.reserve_stock(db, {test_product.id: 3})
+    assert reserved == {test_product.id: (product.name, product.price)}
+    assert product.stock == initial_stock - 3
+
+    assert stock.release_stock(db, {test_product.id: 3, 999999: 1}) == [test_product.id]
+    assert product.stock == initial_stock
+
+def test_order_status_transitions(db: Session, test_user: User, test_product: Product):
+    from app.models.client import Client
+    from app.services import order_notifications, order_stats, order_status
+
+    assert order_status.can_transition(OrderStatus.CONFIRMED, OrderStatus.READY)
+    assert not order_status.can_transition(OrderStatus.READY, OrderStatus.CONFIRMED)
+    assert not order_status.can_transition(OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+    assert not order_status.can_transition(OrderStatus.CANCELLED, OrderStatus.PENDING)
+
+    initial_stock = test_product.stock
+    order_in = OrderCreate(
+        items=[OrderItemCreate(product_id=test_product.id, quantity=3)]
+    )
+    order = order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+
+    cancelled = order_service.update_order(
+        db=db,
+        order_id=order.id,
+        obj_in=OrderUpdate(status=OrderStatus.CANCELLED)
+    )
+    assert cancelled.status == OrderStatus.CANCELLED
+    product = db.query(ProductModel).filter(ProductModel.id == test_product.id).first()
+    assert product.stock == initial_stock
+    stats = order_stats.get_stats(db)
+    assert [s.status for s in stats.by_status] == [OrderStatus.CANCELLED]
+    assert stats.top_products == []
+
+    with pytest.raises(ValueError):
+        order_service.update_order(
+            db=db,
+            order_id=order.id,
+            obj_in=OrderUpdate(status=OrderStatus.PENDING)
+        )
+
+    # Excluir um pedido cancelado não devolve o estoque outra vez
+    order_service.delete_order(db=db, order_id=order.id)
+    db.refresh(product)
+    assert product.stock == initial_stock
+
+    # O cliente do pedido é o cadastro com o email do usuário
+    other = order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+    db.add(Client(
+        name="Cliente", email=test_user.email, cpf="98765432100", phone="11988887777"
+    ))
+    db.commit()
+    notifications = order_notifications.resolve_notifications(
+        db, [other.id], OrderStatus.READY
+    )
+    assert [(n.order_id, n.phone) for n in notifications] == [(other.id, "11988887777")]
+
+def test_order_money_is_exact(db: Session, test_user: User):
+    from decimal import Decimal
+
+    from app.services import order_stats
+
+    cheap = ProductModel(name="Cheap", price=Decimal("0.10"), stock=100, category="test")
+    other = ProductModel(name="Other", price=0.2, stock=100, category="test")
+    db.add_all([cheap, other])
+    db.commit()
+
+    order = order_service.create_order(
+        db=db,
+        user_id=test_user.id,
+        obj_in=OrderCreate(items=[
+            OrderItemCreate(product_id=cheap.id, quantity=3),
+            OrderItemCreate(product_id=other.id, quantity=1)
+        ])
+    )
+
+    # 0.1 * 3 + 0.2 em float seria 0.5000000000000001
+    assert order.total_amount == Decimal("0.50")
+    assert order.items[0].total_price == Decimal("0.30")
+    assert order_stats.get_stats(db).daily[-1].revenue == Decimal("0.50")
+
+def test_order_summaries_use_a_single_query(db: Session, test_user: User, test_product: Product):
+    from app.db.profiler import QueryProfiler
+
+    order_in = OrderCreate(
+        items=[OrderItemCreate(product_id=test_product.id, quantity=1)] * 3
+    )
+    order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+    order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+
+    user_id = test_user.id
+    with QueryProfiler(db.get_bind()) as profiler:
+        rows, total = order_service.get_order_summaries(db, user_id=user_id)
+
+    assert sum(stats.calls for stats in profiler.report()) == 1
+    assert total == 2
+    assert [row.item_count for row in rows] == [3, 3]
+
+def test_transition_orders_without_commit(db: Session, test_user: User, test_product: Product):
+    from app.services import order_status
+
+    order_in = OrderCreate(
+        items=[OrderItemCreate(product_id=test_product.id, quantity=1)]
+    )
+    order = order_service.create_order(db=db, user_id=test_user.id, obj_in=order_in)
+
+    result, _ = order_status.transition_orders(
+        db, [(order.id, OrderStatus.CONFIRMED)], commit=False
+    )
+    assert result.updated == 1
+    # Quem chamou decide: o rollback desfaz a transição
+    db.rollback()
+    assert db.get(Order, order.id).status == OrderStatus.PENDING
@@ -0,0 +1,66 @@
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.core.read_after import READ_AFTER_COOKIE, ReadAfterCookieMiddleware
+from app.db.routing import ReadRouter
+
+
+def test_read_router_prefers_healthy_replicas():
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    router = ReadRouter(primary, [replica], window=60, check_ttl=60)
+
+    assert router.choose(user_id=1) is replica
+
+    # Quem acabou de escrever lê do primário; os demais continuam na réplica
+    router.mark_write(1)
+    assert router.choose(user_id=1) is primary
+    assert router.choose(user_id=2) is replica
+
+    assert router.choose(user_id=2, read_after=time.time() + 10) is primary
+    assert router.choose(user_id=2, read_after=time.time() - 10) is replica
+
+    router.report_failure(replica, RuntimeError("conexão perdida"))
+    assert router.choose(user_id=2) is primary
+    assert router.status()[0]["ok"] is False
+
+
+def test_read_router_falls_back_when_replica_is_down():
+    primary = create_engine("sqlite://")
+    broken = create_engine("sqlite:////diretorio/inexistente/replica.db")
+    healthy = create_engine("sqlite://")
+
+    assert ReadRouter(primary).choose() is primary
+    assert ReadRouter(primary, [broken]).choose() is primary
+
+    router = ReadRouter(primary, [broken, healthy])
+    assert {router.choose() for _ in range(4)} == {healthy}
+
+
+def test_read_router_requires_primary_after_write():
+    router = ReadRouter(create_engine("sqlite://"), window=60)
+    assert router.requires_primary(user_id=1) is False
+    router.mark_write(1)
+    assert router.requires_primary(user_id=1) is True
+    assert router.requires_primary(user_id=2, read_after=time.time() + 10) is True
+
+
+def test_read_after_cookie_is_set_after_writes():
+    app = FastAPI()
+    app.add_middleware(ReadAfterCookieMiddleware, window=5)
+
+    @app.post("/write")
+    def write(request: Request):
+        request.state.read_after = time.time() + 5
+        return {}
+
+    @app.get("/read")
+    def read():
+        return {}
+
+    with TestClient(app) as client:
+        assert READ_AFTER_COOKIE in client.post("/write").cookies
+        assert READ_AFTER_COOKIE not in client.get("/read").headers.get("set-cookie", "")
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.core.single_flight import SingleFlight
+from app.services import product as product_service
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = SingleFlight()
+    executions = []
+    release = threading.Event()
+
+    def load():
+        executions.append(1)
+        release.wait(1)
+        return {"id": 1}
+
+    def call():
+        return flight.do("product:1", load)
+
+    threading.Timer(0.2, release.set).start()
+    results, errors = run_concurrently(5, call)
+
+    assert errors == [None] * 5
+    assert len(executions) == 1
+    assert all(result is results[0][0] for result, _ in results)
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flight.calls == 5 and flight.shared == 4
+
+    # Terminada a chamada, nada fica guardado
+    flight.do("product:1", load)
+    assert len(executions) == 2
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+
+    def load():
+        time.sleep(0.2)
+        raise ValueError("falha no banco")
+
+    results, errors = run_concurrently(3, lambda: flight.do("k", load))
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert flight._inflight == {}
+
+
+def test_single_flight_timeout_runs_own_call():
+    flight = SingleFlight(timeout=0.05)
+    release = threading.Event()
+    leader = threading.Thread(
+        target=flight.do, args=("k", lambda: release.wait(1))
+    )
+    leader.start()
+    time.sleep(0.02)
+
+    assert flight.do("k", lambda: "próprio") == ("próprio", False)
+    release.set()
+    leader.join()
+
+
+def test_get_product_coalesced_detaches_shared_result(db: Session, test_product):
+    product_id = test_product.id
+    db.expunge_all()
+
+    db.info["coalesce_reads"] = True
+    try:
+        product = product_service.get_product_coalesced(db, product_id)
+        products, total = product_service.get_products_coalesced(
+            db, category="test"
+        )
+    finally:
+        db.info.pop("coalesce_reads")
+
+    assert product.id == product_id
+    assert inspect(product).detached
+    assert total == 1 and inspect(products[0]).detached
+
+
+def test_coalescing_requires_read_session(db: Session, test_product, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        product_service.product_reads, "do",
+        lambda key, load, timeout=None: calls.append(key) or (load(), False)
+    )
+
+    product = product_service.get_product_coalesced(db, test_product.id)
+    assert product is not None and calls == []
+
+    db.info["coalesce_reads"] = True
+    try:
+        product_service.get_product_coalesced(db, test_product.id, ["id", "name"])
+    finally:
+        db.info.pop("coalesce_reads")
+    assert calls == [(db.get_bind(), "product", test_product.id, ("id", "name"))]
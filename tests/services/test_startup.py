@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.importtime import parse_importtime, profile, total_ms
+
+# Orçamento de importação das rotas da API em um processo novo. Generoso para
+# máquinas de CI lentas; o objetivo é detectar regressões grandes, como uma
+# dependência pesada voltando a ser importada na inicialização.
+COLD_START_BUDGET_MS = 3000
+
+# Importados apenas quando usados (primeiro envio ou primeira senha)
+DEFERRED_MODULES = {"httpx", "passlib", "redis"}
+
+API_MODULES = ", ".join([
+    "app.core.lifespan",
+    "app.core.rate_limit",
+    "app.api.health",
+    "app.api.v1.endpoints.auth",
+    "app.api.v1.endpoints.clients",
+    "app.api.v1.endpoints.products",
+    "app.api.v1.endpoints.orders",
+    "app.api.v1.endpoints.whatsapp",
+])
+
+# Executado em um processo novo, sem módulos da aplicação já importados
+_IMPORT_MODELS = """
+import json
+import app.models.order, app.models.user, app.services.product
+from app.core.config import get_settings
+import app.db.base as base
+print(json.dumps({
+    "settings_loaded": get_settings.cache_info().currsize > 0,
+    "engine_created": base._engine is not None,
+}))
+"""
+
+
+def test_importing_models_has_no_side_effects():
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_MODELS],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert json.loads(output) == {"settings_loaded": False, "engine_created": False}
+
+
+def test_engine_is_created_on_first_use(monkeypatch):
+    from app.db import base
+
+    monkeypatch.setattr(base, "_engine", None)
+    monkeypatch.setattr(base, "_database_probe", None)
+    monkeypatch.setattr(base, "_read_router", None)
+
+    probe = base.get_database_probe()
+    assert base._engine is not None
+    assert probe.engine is base.get_engine()
+    assert base.get_read_router().primary is base.get_engine()
+    base.dispose_engines()
+    assert base._engine is None
+
+
+def test_parse_importtime_builds_tree():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:        10 |         10 |     b.leaf",
+        "import time:        20 |         30 |   b",
+        "import time:         5 |          5 |   c",
+        "import time:        40 |         75 | a",
+    ])
+    (root,) = parse_importtime(output)
+    assert root.name == "a" and root.cumulative_ms == 0.075
+    assert [child.name for child in root.children] == ["b", "c"]
+    assert [leaf.name for leaf in root.children[0].children] == ["b.leaf"]
+
+
+def test_api_cold_start_budget():
+    roots = profile(API_MODULES)
+    imported = {node.name.split(".")[0] for root in roots for node in root.walk()}
+
+    assert not imported & DEFERRED_MODULES
+    assert total_ms(roots) < COLD_START_BUDGET_MS
@@ -0,0 +1,200 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+from app.core.phone import normalize_phone
+from app.models.client import Client
+from app.schemas.client import ClientCreate, ClientUpdate
+from app.services.client import create_client, update_client
+from app.services.whatsapp import WhatsAppService, template_payload, text_payload
+
+
+class FakeResponse:
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return {"messages": [{"id": "wamid.1"}]}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = WhatsAppService()
+    sent = []
+
+    async def post(url, payload):
+        sent.append(json.loads(payload))
+        return FakeResponse()
+
+    monkeypatch.setattr(service, "_post", post)
+    service.sent = sent
+    return service
+
+
+def test_normalize_phone():
+    assert normalize_phone("(11) 99999-9999") == "5511999999999"
+    assert normalize_phone("+55 11 99999-9999") == "5511999999999"
+    assert normalize_phone("") is None
+    assert normalize_phone("sem telefone") is None
+    assert normalize_phone("1234567890123456789") is None
+
+
+def test_payloads_match_json_encoding():
+    message = 'Olá "cliente"!\nLinha 2 {chaves}'
+    assert json.loads(text_payload("5511999999999", message)) == {
+        "messaging_product": "whatsapp",
+        "to": "5511999999999",
+        "type": "text",
+        "text": {"body": message},
+    }
+    assert json.loads(template_payload("5511999999999", "pedido", {"1": "42"})) == {
+        "messaging_product": "whatsapp",
+        "to": "5511999999999",
+        "type": "template",
+        "template": {
+            "name": "pedido",
+            "language": {"code": "pt_BR"},
+            "components": [
+                {"type": "body", "parameters": [{"type": "text", "text": "42"}]}
+            ],
+        },
+    }
+    assert "components" not in json.loads(template_payload("5511999999999", "pedido"))["template"]
+
+
+def test_client_whatsapp_phone_is_filled_on_write(db: Session):
+    client = create_client(db=db, obj_in=ClientCreate(
+        name="Cliente",
+        email="cliente@example.com",
+        phone="(11) 99999-9999",
+        cpf="12345678901"
+    ))
+    assert client.whatsapp_phone == "5511999999999"
+
+    client = update_client(db=db, db_obj=client, obj_in=ClientUpdate(
+        name="Cliente", phone="21 98888-7777"
+    ))
+    assert db.get(Client, client.id).whatsapp_phone == "5521988887777"
+
+
+def test_notifications_use_templates_and_stored_phone(service):
+    client = Client(name="Ana", phone="(11) 99999-9999")
+    assert client.whatsapp_phone == "5511999999999"
+
+    async def run():
+        await service.send_order_notification(client, "42", "shipped")
+        await service.send_payment_notification(client, "42", Decimal("99.9"), "pix")
+
+    asyncio.run(run())
+    order, payment = service.sent
+    assert order["to"] == "5511999999999"
+    assert order["text"]["body"] == (
+        "Olá Ana! Seu pedido #42 foi atualizado.\n"
+        "Status atual: shipped\n"
+        f"Acompanhe seu pedido em: {settings.FRONTEND_URL}/orders/42"
+    )
+    assert "Valor: R$ 99.90\n" in payment["text"]["body"]
+
+
+def test_send_message_rejects_phone_without_digits(service):
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.send_message(to="sem telefone", message="Oi"))
+    assert exc_info.value.status_code == 400
+    assert service.sent == []
+
+
+def mock_service(handler, **options) -> WhatsAppService:
+    service = WhatsAppService(transport=httpx.MockTransport(handler))
+    service.token = "token"
+    service.phone_number_id = "123"
+    service.retry_backoff = 0
+    for name, value in options.items():
+        setattr(service, name, value)
+    return service
+
+
+def test_post_retries_retryable_status():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"messages": [{"id": "wamid.1"}]})
+
+    service = mock_service(handler, max_retries=2)
+    result = asyncio.run(service.send_message(to="11999999999", message="Oi"))
+    assert result == {"messages": [{"id": "wamid.1"}]}
+    assert len(calls) == 3
+    assert json.loads(calls[0].content)["to"] == "5511999999999"
+    assert service.status()["retries"] == 2
+    assert service.status()["circuit"]["state"] == "closed"
+
+
+def test_post_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"error": {"message": "invalid"}})
+
+    service = mock_service(handler)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.send_message(to="11999999999", message="Oi"))
+    assert exc_info.value.status_code == 500
+    assert len(calls) == 1
+    assert service.breaker.failures == 0
+
+
+def test_circuit_opens_and_fails_fast():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    service = mock_service(handler, max_retries=0)
+    service.breaker.failure_threshold = 2
+
+    async def run():
+        errors = []
+        for _ in range(3):
+            try:
+                await service.send_message(to="11999999999", message="Oi")
+            except HTTPException as e:
+                errors.append(e)
+        return errors
+
+    errors = asyncio.run(run())
+    assert [e.status_code for e in errors] == [500, 500, 503]
+    assert "Retry-After" in errors[-1].headers
+    assert len(calls) == 2
+    circuit = service.status()["circuit"]
+    assert circuit["state"] == "open"
+    assert circuit["opened"] == 1
+    assert circuit["rejected"] == 1
+
+
+def test_circuit_breaker_half_open_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] = 10.0
+    breaker.before_call()  # chamada de teste liberada
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # apenas uma por vez
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.status()["half_opened"] == 1
+    assert breaker.status()["closed"] == 1